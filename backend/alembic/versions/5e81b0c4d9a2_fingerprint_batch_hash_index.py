@@ -0,0 +1,48 @@
+"""composite (fingerprint, batch_hash) index for de-duplication
+
+Revision ID: 5e81b0c4d9a2
+Revises: 9c3e5a7d21f4
+Create Date: 2026-10-17 13:05:00.000000
+
+Building the index indexes all existing rows; it supersedes the single-column
+fingerprint index, which is dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e81b0c4d9a2'
+down_revision: Union[str, Sequence[str], None] = '9c3e5a7d21f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_names() -> set:
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('transactions')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _index_names()
+    if 'ix_transactions_fingerprint_batch_hash' not in existing:
+        op.create_index(
+            'ix_transactions_fingerprint_batch_hash',
+            'transactions',
+            ['fingerprint', 'batch_hash'],
+            unique=False,
+        )
+    if 'ix_transactions_fingerprint' in existing:
+        op.drop_index('ix_transactions_fingerprint', table_name='transactions')
+    op.execute('ANALYZE transactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _index_names()
+    if 'ix_transactions_fingerprint' not in existing:
+        op.create_index('ix_transactions_fingerprint', 'transactions', ['fingerprint'], unique=False)
+    if 'ix_transactions_fingerprint_batch_hash' in existing:
+        op.drop_index('ix_transactions_fingerprint_batch_hash', table_name='transactions')
@@ -0,0 +1,50 @@
+"""import ledger of imported statement files
+
+Revision ID: 7d2f6a1c3b85
+Revises: 5e81b0c4d9a2
+Create Date: 2026-10-17 14:20:00.000000
+
+Files imported before this revision are not in the ledger; re-uploading one
+of them is de-duplicated row by row as before.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f6a1c3b85'
+down_revision: Union[str, Sequence[str], None] = '5e81b0c4d9a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('import_ledger'):
+        return
+    op.create_table(
+        'import_ledger',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('head_hash', sa.String(length=64), nullable=True),
+        sa.Column('line_count', sa.Integer(), nullable=False),
+        sa.Column('line_hashes', sa.LargeBinary(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('rows_done', sa.Integer(), nullable=False),
+        sa.Column('rows_inserted', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash'),
+    )
+    op.create_index('ix_import_ledger_head_hash', 'import_ledger', ['head_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('import_ledger'):
+        return
+    op.drop_index('ix_import_ledger_head_hash', table_name='import_ledger')
+    op.drop_table('import_ledger')
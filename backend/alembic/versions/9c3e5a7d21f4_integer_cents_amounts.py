@@ -0,0 +1,64 @@
+"""store amounts as integer cents (AMOUNT_STORAGE=cents)
+
+Revision ID: 9c3e5a7d21f4
+Revises: 2a9f4c6e8b13
+Create Date: 2026-10-17 12:40:00.000000
+
+Opt-in: only converts when AMOUNT_STORAGE=cents is set for the migration run;
+otherwise this revision is a no-op and amounts stay NUMERIC(18, 2).
+To switch an already-migrated database, downgrade to 2a9f4c6e8b13 and
+upgrade again with the new setting.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.settings import AMOUNT_STORAGE
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5a7d21f4'
+down_revision: Union[str, Sequence[str], None] = '2a9f4c6e8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AMOUNT_COLUMNS = (('transactions', 'amount'), ('accounts', 'balance'))
+
+
+def _is_integer_column(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    col_type = next(c['type'] for c in columns if c['name'] == column)
+    return isinstance(col_type, sa.Integer)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if AMOUNT_STORAGE != 'cents':
+        return
+    for table, column in AMOUNT_COLUMNS:
+        if _is_integer_column(table, column):
+            continue
+        op.execute(f"UPDATE {table} SET {column} = CAST(ROUND({column} * 100) AS INTEGER)")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.Numeric(18, 2),
+                type_=sa.BigInteger(),
+                existing_nullable=False,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in AMOUNT_COLUMNS:
+        if not _is_integer_column(table, column):
+            continue
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.BigInteger(),
+                type_=sa.Numeric(18, 2),
+                existing_nullable=False,
+            )
+        op.execute(f"UPDATE {table} SET {column} = ROUND({column} / 100.0, 2)")
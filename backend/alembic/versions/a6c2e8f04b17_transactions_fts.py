@@ -0,0 +1,64 @@
+"""FTS5 word index over transaction entity/text/reference
+
+Revision ID: a6c2e8f04b17
+Revises: f3b9d1e7a524
+Create Date: 2026-10-17 20:15:00.000000
+
+Creates transactions_fts with its sync triggers and indexes existing rows.
+The trigram index is left to c8d4f2a6e391: the columns it indexes do not
+exist yet.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c2e8f04b17'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d1e7a524'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    exists = sa.inspect(op.get_bind()).has_table('transactions_fts')
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+            entity, text, reference,
+            content='transactions', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO transactions_fts(rowid, entity, text, reference)
+            VALUES (new.id, new.entity, new.text, new.reference);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+            INSERT INTO transactions_fts(transactions_fts, rowid, entity, text, reference)
+            VALUES ('delete', old.id, old.entity, old.text, old.reference);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_update
+        AFTER UPDATE OF entity, text, reference ON transactions BEGIN
+            INSERT INTO transactions_fts(transactions_fts, rowid, entity, text, reference)
+            VALUES ('delete', old.id, old.entity, old.text, old.reference);
+            INSERT INTO transactions_fts(rowid, entity, text, reference)
+            VALUES (new.id, new.entity, new.text, new.reference);
+        END
+    """)
+    if not exists:
+        op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS transactions_fts_update')
+    op.execute('DROP TRIGGER IF EXISTS transactions_fts_delete')
+    op.execute('DROP TRIGGER IF EXISTS transactions_fts_insert')
+    op.execute('DROP TABLE IF EXISTS transactions_fts')
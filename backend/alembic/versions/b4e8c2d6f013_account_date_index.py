@@ -0,0 +1,47 @@
+"""(account_id, date) index for the import high-water mark
+
+Revision ID: b4e8c2d6f013
+Revises: 7d2f6a1c3b85
+Create Date: 2026-10-17 15:10:00.000000
+
+Supersedes the single-column account_id index, which is dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8c2d6f013'
+down_revision: Union[str, Sequence[str], None] = '7d2f6a1c3b85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_names() -> set:
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('transactions')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _index_names()
+    if 'ix_transactions_account_id_date' not in existing:
+        op.create_index(
+            'ix_transactions_account_id_date',
+            'transactions',
+            ['account_id', 'date'],
+            unique=False,
+        )
+    if 'ix_transactions_account_id' in existing:
+        op.drop_index('ix_transactions_account_id', table_name='transactions')
+    op.execute('ANALYZE transactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _index_names()
+    if 'ix_transactions_account_id' not in existing:
+        op.create_index('ix_transactions_account_id', 'transactions', ['account_id'], unique=False)
+    if 'ix_transactions_account_id_date' in existing:
+        op.drop_index('ix_transactions_account_id_date', table_name='transactions')
@@ -0,0 +1,93 @@
+"""category_closure table of the category tree
+
+Revision ID: b7e3c9a1d458
+Revises: d5f1a9c7e362
+Create Date: 2026-10-18 11:45:00.000000
+
+Creates the closure table, fills it from categories.parent_id and installs
+the triggers that keep it in sync.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c9a1d458'
+down_revision: Union[str, Sequence[str], None] = 'd5f1a9c7e362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CLOSURE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_insert AFTER INSERT ON categories BEGIN
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, new.id, depth + 1 FROM category_closure
+        WHERE descendant_id = new.parent_id
+        UNION ALL
+        SELECT new.id, new.id, 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_move
+    AFTER UPDATE OF parent_id ON categories
+    WHEN new.parent_id IS NOT old.parent_id BEGIN
+        DELETE FROM category_closure
+        WHERE descendant_id IN (
+            SELECT descendant_id FROM category_closure WHERE ancestor_id = new.id
+        )
+        AND ancestor_id NOT IN (
+            SELECT descendant_id FROM category_closure WHERE ancestor_id = new.id
+        );
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+        FROM category_closure AS above, category_closure AS below
+        WHERE above.descendant_id = new.parent_id AND below.ancestor_id = new.id;
+    END
+    """,
+)
+
+CLOSURE_REBUILD = (
+    "DELETE FROM category_closure",
+    """
+    WITH RECURSIVE pairs(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM categories
+        UNION ALL
+        SELECT pairs.ancestor_id, categories.id, pairs.depth + 1
+        FROM pairs JOIN categories ON categories.parent_id = pairs.descendant_id
+    )
+    INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, depth FROM pairs
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'category_closure' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'category_closure',
+            sa.Column('ancestor_id', sa.Integer(), nullable=False),
+            sa.Column('descendant_id', sa.Integer(), nullable=False),
+            sa.Column('depth', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['ancestor_id'], ['categories.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['descendant_id'], ['categories.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+        )
+        op.create_index(
+            'ix_category_closure_descendant_id_depth',
+            'category_closure',
+            ['descendant_id', 'depth'],
+            unique=False,
+        )
+    for statement in CLOSURE_TRIGGERS + CLOSURE_REBUILD:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS category_closure_move')
+    op.execute('DROP TRIGGER IF EXISTS category_closure_insert')
+    op.drop_index('ix_category_closure_descendant_id_depth', table_name='category_closure')
+    op.drop_table('category_closure')
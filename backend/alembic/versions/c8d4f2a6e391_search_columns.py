@@ -0,0 +1,134 @@
+"""normalized search columns for entity/text/reference
+
+Revision ID: c8d4f2a6e391
+Revises: a6c2e8f04b17
+Create Date: 2026-10-17 21:05:00.000000
+
+Adds entity_norm/text_norm/reference_norm, fills them for existing rows and
+then moves an existing trigram index (databases run with SEARCH_TRIGRAM=1)
+onto them. Whether the index exists is read from the database, not from the
+environment the migration runs in.
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d4f2a6e391'
+down_revision: Union[str, Sequence[str], None] = 'a6c2e8f04b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 10_000
+
+TRIGRAM_INDEX_DROP = (
+    'DROP TRIGGER IF EXISTS transactions_trigram_update',
+    'DROP TRIGGER IF EXISTS transactions_trigram_delete',
+    'DROP TRIGGER IF EXISTS transactions_trigram_insert',
+    'DROP TABLE IF EXISTS transactions_trigram',
+)
+
+TRIGRAM_INDEX_DDL = (
+    """
+    CREATE VIRTUAL TABLE transactions_trigram USING fts5(
+        entity_norm, text_norm, reference_norm,
+        content='transactions', content_rowid='id',
+        tokenize='trigram case_sensitive 0'
+    )
+    """,
+    """
+    CREATE TRIGGER transactions_trigram_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_trigram(rowid, entity_norm, text_norm, reference_norm)
+        VALUES (new.id, new.entity_norm, new.text_norm, new.reference_norm);
+    END
+    """,
+    """
+    CREATE TRIGGER transactions_trigram_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_trigram(
+            transactions_trigram, rowid, entity_norm, text_norm, reference_norm
+        )
+        VALUES ('delete', old.id, old.entity_norm, old.text_norm, old.reference_norm);
+    END
+    """,
+    """
+    CREATE TRIGGER transactions_trigram_update
+    AFTER UPDATE OF entity_norm, text_norm, reference_norm ON transactions BEGIN
+        INSERT INTO transactions_trigram(
+            transactions_trigram, rowid, entity_norm, text_norm, reference_norm
+        )
+        VALUES ('delete', old.id, old.entity_norm, old.text_norm, old.reference_norm);
+        INSERT INTO transactions_trigram(rowid, entity_norm, text_norm, reference_norm)
+        VALUES (new.id, new.entity_norm, new.text_norm, new.reference_norm);
+    END
+    """,
+    "INSERT INTO transactions_trigram(transactions_trigram) VALUES ('rebuild')",
+)
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    """Search form as of this revision: casefolded, whitespace runs collapsed."""
+    if value is None:
+        return None
+    return " ".join(value.casefold().split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing = {c['name'] for c in inspector.get_columns('transactions')}
+    trigram_index = inspector.has_table('transactions_trigram')
+    # The old index covers entity/text/reference; rebuilt below
+    for statement in TRIGRAM_INDEX_DROP:
+        op.execute(statement)
+    if 'entity_norm' not in existing:
+        op.add_column(
+            'transactions',
+            sa.Column('entity_norm', sa.String(500), nullable=False, server_default=''),
+        )
+    if 'text_norm' not in existing:
+        op.add_column('transactions', sa.Column('text_norm', sa.String(1000), nullable=True))
+    if 'reference_norm' not in existing:
+        op.add_column('transactions', sa.Column('reference_norm', sa.String(1000), nullable=True))
+
+    after_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, entity, text, reference FROM transactions "
+                "WHERE id > :after ORDER BY id LIMIT :n"
+            ),
+            {"after": after_id, "n": BACKFILL_CHUNK},
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            sa.text(
+                "UPDATE transactions SET entity_norm = :e, text_norm = :t, "
+                "reference_norm = :r WHERE id = :id"
+            ),
+            [
+                {
+                    "id": id_,
+                    "e": _normalize(entity) or "",
+                    "t": _normalize(text),
+                    "r": _normalize(reference),
+                }
+                for id_, entity, text, reference in rows
+            ],
+        )
+        after_id = rows[-1][0]
+
+    if trigram_index:
+        for statement in TRIGRAM_INDEX_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in TRIGRAM_INDEX_DROP:
+        op.execute(statement)
+    for column in ('reference_norm', 'text_norm', 'entity_norm'):
+        op.execute(f'ALTER TABLE transactions DROP COLUMN {column}')
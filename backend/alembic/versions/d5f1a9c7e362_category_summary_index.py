@@ -0,0 +1,37 @@
+"""covering index for the per-category sums of the transaction summary
+
+Revision ID: d5f1a9c7e362
+Revises: c8d4f2a6e391
+Create Date: 2026-10-18 09:20:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1a9c7e362'
+down_revision: Union[str, Sequence[str], None] = 'c8d4f2a6e391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_transactions_category_id_date_amount'
+
+
+def _index_names() -> set:
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('transactions')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if INDEX not in _index_names():
+        op.create_index(
+            INDEX, 'transactions', ['category_id', 'date', 'amount'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if INDEX in _index_names():
+        op.drop_index(INDEX, table_name='transactions')
@@ -0,0 +1,33 @@
+"""amount index for keyset pages of the transaction list
+
+Revision ID: e1a7c3f59d20
+Revises: b4e8c2d6f013
+Create Date: 2026-10-17 18:40:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c3f59d20'
+down_revision: Union[str, Sequence[str], None] = 'b4e8c2d6f013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_names() -> set:
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('transactions')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'ix_transactions_amount' not in _index_names():
+        op.create_index('ix_transactions_amount', 'transactions', ['amount'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'ix_transactions_amount' in _index_names():
+        op.drop_index('ix_transactions_amount', table_name='transactions')
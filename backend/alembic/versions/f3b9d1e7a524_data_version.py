@@ -0,0 +1,34 @@
+"""data_version counter for read-side caches
+
+Revision ID: f3b9d1e7a524
+Revises: e1a7c3f59d20
+Create Date: 2026-10-17 19:30:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d1e7a524'
+down_revision: Union[str, Sequence[str], None] = 'e1a7c3f59d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'data_version' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'data_version',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_version')
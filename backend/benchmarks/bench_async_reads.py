@@ -0,0 +1,162 @@
+"""
+Benchmark: hot read endpoints on threads vs. the aiosqlite engine (ASYNC_READS).
+
+    cd backend && IBAN_HMAC_KEY=00 python -m benchmarks.bench_async_reads [rows] [requests]
+
+Seeds a temporary database with `rows` transactions, then runs the app once
+per mode (ASYNC_READS=0 and =1, each in its own process since the setting is
+read at import) and sends `requests` requests per endpoint through an
+in-process ASGI client, CONCURRENCY at a time:
+
+- list: /transactions pages (offset spread over the table)
+- series: /balances/series, monthly
+- sankey: /budget/sankey over the full history
+
+Reported: throughput and p50/p95 latency of the endpoint, plus the p95 of
+/accounts polled alongside (how much the load delays a light endpoint).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+CONCURRENCY = (4, 32)
+POLL_INTERVAL = 0.01
+
+ENDPOINTS = {
+    "list": lambda i, rows: f"/api/transactions/?limit=50&offset={(i * 997) % max(rows - 50, 1)}",
+    "series": lambda i, rows: "/api/balances/series?granularity=monthly",
+    "sankey": lambda i, rows: "/api/budget/sankey",
+}
+
+
+def _percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def seed(rows: int) -> None:
+    """Child process: create the database at DB_PATH with `rows` transactions."""
+    from src.database import SessionLocal, initialize_database
+    from src.services.bank import import_bank_stream
+    from src.services.bank_models import BankAccount, BankTransaction
+    from src.services.csv_parsers import StreamedBankData
+
+    account = BankAccount(
+        name="Bench", amount=Decimal("0"), iban="DE89370400440532013000", holder_name="BENCH"
+    )
+    start = dt.date(2015, 1, 1)
+    txs = (
+        BankTransaction(
+            text=f"Einkauf {i}",
+            peer=f"Shop {i % 500}",
+            amount=Decimal((i % 7 == 0) * 250_000 - (i % 10_000)) / 100,
+            date=(start + dt.timedelta(days=i // 25)).strftime("%d.%m.%Y"),
+            customerreference=None,
+        )
+        for i in range(rows)
+    )
+    initialize_database()
+    with SessionLocal() as db:
+        import_bank_stream(
+            db, [StreamedBankData(account=account, transactions=txs)], incremental=False
+        )
+        db.commit()
+
+
+async def serve(rows: int, requests: int) -> dict:
+    """Child process: load the endpoints of the app at DB_PATH, one mode."""
+    import httpx
+
+    from src.executor import configure_request_threadpool
+    from src.main import app
+
+    configure_request_threadpool()
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url in ENDPOINTS.items():
+            await client.get(url(0, rows))  # warm caches and pools
+            for concurrency in CONCURRENCY:
+                gate = asyncio.Semaphore(concurrency)
+                latencies, light = [], []
+                done = asyncio.Event()
+
+                async def one(i: int) -> None:
+                    async with gate:
+                        t0 = time.perf_counter()
+                        r = await client.get(url(i, rows))
+                        latencies.append(time.perf_counter() - t0)
+                        r.raise_for_status()
+
+                async def poll() -> None:
+                    while not done.is_set():
+                        t0 = time.perf_counter()
+                        await client.get("/api/accounts/")
+                        light.append(time.perf_counter() - t0)
+                        await asyncio.sleep(POLL_INTERVAL)
+
+                poller = asyncio.create_task(poll())
+                t0 = time.perf_counter()
+                await asyncio.gather(*(one(i) for i in range(requests)))
+                elapsed = time.perf_counter() - t0
+                done.set()
+                await poller
+                results[f"{name}/{concurrency}"] = {
+                    "rps": requests / elapsed,
+                    "p50": 1000 * statistics.median(latencies),
+                    "p95": 1000 * _percentile(latencies, 0.95),
+                    "light_p95": 1000 * _percentile(light, 0.95),
+                }
+    return results
+
+
+def _child(args, env) -> str:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_async_reads", *args],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return out.strip().splitlines()[-1] if out.strip() else ""
+
+
+def main(rows: int = 20_000, requests: int = 100) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DB_PATH=str(Path(tmp) / "bench.db"), ASYNC_READS="0")
+        _child(["--seed", str(rows)], env)
+        modes = {}
+        for mode in ("0", "1"):
+            env["ASYNC_READS"] = mode
+            modes[mode] = json.loads(_child(["--serve", str(rows), str(requests)], env))
+
+    print(f"{rows} transactions, {requests} requests per endpoint and concurrency")
+    print(
+        f"{'endpoint':<10} {'conc':>4} {'mode':<6} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'/accounts p95 ms':>17}"
+    )
+    for key in modes["0"]:
+        name, concurrency = key.split("/")
+        for mode, label in (("0", "thread"), ("1", "async")):
+            r = modes[mode][key]
+            print(
+                f"{name:<10} {concurrency:>4} {label:<6} {r['rps']:>8,.1f} {r['p50']:>8.1f} "
+                f"{r['p95']:>8.1f} {r['light_p95']:>17.1f}"
+            )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--seed"]:
+        seed(int(sys.argv[2]))
+    elif sys.argv[1:2] == ["--serve"]:
+        print(json.dumps(asyncio.run(serve(int(sys.argv[2]), int(sys.argv[3])))))
+    else:
+        main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,89 @@
+"""
+Benchmark: GET /transactions/summary (summarize_by_category_db) on a large table.
+
+    cd backend && IBAN_HMAC_KEY=00 python -m benchmarks.bench_category_summary [rows] [runs]
+
+Seeds a temporary database with `rows` transactions and a three-level category
+tree (4 roots, 5 children each, 3 grandchildren each), assigns every tenth
+transaction no category and the others a random node of the tree, then times
+the summary for a few scope/depth combinations, without and with items.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOTS, CHILDREN, GRANDCHILDREN = 4, 5, 3
+
+CASES = (
+    ("roots", dict(depth=1)),
+    ("depth 3", dict(depth=3)),
+    ("scope, depth 1", dict(scope_name="Root 0", depth=1)),
+    ("scope, depth 2", dict(scope_name="Root 0", depth=2)),
+    ("roots, 20 items", dict(depth=1, items=20)),
+)
+
+
+def _seed_categories(db) -> None:
+    from src.models import Category as CategoryORM, Transaction as TransactionORM
+
+    nodes = []
+    for r in range(ROOTS):
+        root = CategoryORM(name=f"Root {r}")
+        db.add(root)
+        db.flush()
+        nodes.append(root.id)
+        for c in range(CHILDREN):
+            child = CategoryORM(name=f"Child {r}.{c}", parent_id=root.id)
+            db.add(child)
+            db.flush()
+            nodes.append(child.id)
+            for g in range(GRANDCHILDREN):
+                leaf = CategoryORM(name=f"Leaf {r}.{c}.{g}", parent_id=child.id)
+                db.add(leaf)
+                db.flush()
+                nodes.append(leaf.id)
+
+    rng = random.Random(42)
+    ids = db.scalars(db.query(TransactionORM.id).statement).all()
+    db.bulk_update_mappings(
+        TransactionORM,
+        [{"id": i, "category_id": None if i % 10 == 0 else rng.choice(nodes)} for i in ids],
+    )
+
+
+def main(rows: int = 100_000, runs: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = str(Path(tmp) / "bench.db")
+        from benchmarks.bench_async_reads import seed
+        from src.database import SessionLocal
+        from src.services.transactions import summarize_by_category_db
+
+        seed(rows)
+        with SessionLocal() as db:
+            _seed_categories(db)
+            db.commit()
+
+        print(f"{rows} transactions, best / median of {runs} runs")
+        print(f"{'case':<18} {'groups':>6} {'best ms':>9} {'median ms':>10}")
+        with SessionLocal() as db:
+            for label, kwargs in CASES:
+                times = []
+                for _ in range(runs):
+                    t0 = time.perf_counter()
+                    groups = summarize_by_category_db(db, **kwargs)
+                    times.append(1000 * (time.perf_counter() - t0))
+                print(
+                    f"{label:<18} {len(groups):>6} {min(times):>9.1f} "
+                    f"{statistics.median(times):>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: columnar vs. per-row decoding of DKB amount/date columns.
+
+    cd backend && IBAN_HMAC_KEY=00 python -m benchmarks.bench_dkb_decoding [rows]
+
+Also checks that both paths produce identical values.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from src.services.csv_parsers.decoding import german_amounts_to_cents, german_dates_to_ordinals
+from src.services.csv_parsers.dkb_parser import DKBParser
+from src.utils import from_cents
+
+
+def _make_columns(n: int):
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    dates, amounts = [], []
+    for _ in range(n):
+        day = start + timedelta(days=rng.randrange(5 * 365))
+        dates.append(day.strftime("%d.%m.%y" if rng.random() < 0.5 else "%d.%m.%Y"))
+        cents = rng.randrange(-500_000, 500_000)
+        euros, rest = divmod(abs(cents), 100)
+        amounts.append(f"{'-' if cents < 0 else '+'}{euros:,}".replace(",", ".") + f",{rest:02d}")
+    return dates, amounts
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main(n: int = 100_000) -> None:
+    parser = DKBParser()
+    dates, amounts = _make_columns(n)
+
+    t_row, (row_dates, row_amounts) = _timed(lambda: (
+        [parser._parse_german_date(d) for d in dates],
+        [parser._parse_german_amount(a) for a in amounts],
+    ))
+    t_col, (col_dates, col_amounts) = _timed(lambda: (
+        [date.fromordinal(o) for o in german_dates_to_ordinals(dates, {})],
+        [from_cents(c) for c in german_amounts_to_cents(amounts)],
+    ))
+
+    assert col_dates == row_dates
+    assert [str(a) for a in col_amounts] == [str(a) for a in row_amounts]
+
+    print(f"{n} rows")
+    print(f"  per-row  : {t_row * 1000:8.1f} ms")
+    print(f"  columnar : {t_col * 1000:8.1f} ms  ({t_row / t_col:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
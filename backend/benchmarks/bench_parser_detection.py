@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: CSV format auto-detection with many registered parsers.
+
+    cd backend && IBAN_HMAC_KEY=00 python -m benchmarks.bench_parser_detection [parsers] [rows]
+
+Compares the signature index in ParserRegistry against probing every parser's
+`can_parse` with the whole decoded file (the previous behaviour). The DKB
+parser is registered last, so the probing loop has to try all others first.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from src.services.csv_parsers.base import CSVParser, ParserSignature
+from src.services.csv_parsers.dkb_parser import DKBParser
+from src.services.csv_parsers.registry import ParserRegistry
+
+HEADER = (
+    '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";'
+    '"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)";"Gläubiger-ID";"Mandatsreferenz";"Kundenreferenz"'
+)
+
+
+class _SyntheticParser(CSVParser):
+    """Stand-in for another bank's parser with a distinct header."""
+
+    def __init__(self, i: int):
+        self._name = f"bank_{i}"
+        self.signature = ParserSignature(header_tokens=(f"Datum{i}", f"Betrag{i}", "Text"))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def bank_name(self) -> str:
+        return self._name
+
+    def can_parse(self, file_content: str) -> bool:
+        # Typical hand-written check: split the whole file, look at a few lines
+        lines = file_content.strip().split("\n")
+        return any(all(t in line for t in self.signature.header_tokens) for line in lines[:10])
+
+    def parse(self, file, holder_name=None):
+        raise NotImplementedError
+
+
+def _make_file(rows: int) -> str:
+    head = [
+        '"Girokonto";"DE02120300000000202051"',
+        '"Zeitraum:";"01.01.2024 - 31.12.2024"',
+        '"Kontostand vom 31.12.2024:";"1.234,56 €"',
+        '""',
+        HEADER,
+    ]
+    row = '"10.01.24";"10.01.24";"Gebucht";"";"Edeka";"Einkauf";"Kartenzahlung";"";"-12,34";"";"";""'
+    return "\n".join(head + [row] * rows) + "\n"
+
+
+def _probe_all(parsers, content: str):
+    for parser in parsers:
+        if parser.can_parse(content):
+            return parser
+    return None
+
+
+def _timed(fn, repeat: int):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat, result
+
+
+def main(n_parsers: int = 200, rows: int = 20_000) -> None:
+    content = _make_file(rows)
+    parsers = [_SyntheticParser(i) for i in range(n_parsers)] + [DKBParser()]
+
+    registry = ParserRegistry()
+    for parser in parsers:
+        registry.register(parser)
+
+    t_probe, probed = _timed(lambda: _probe_all(parsers, content), repeat=3)
+    t_index, indexed = _timed(lambda: registry.auto_detect(content), repeat=200)
+
+    assert probed.name == indexed.name == "dkb"
+
+    print(f"{n_parsers + 1} parsers, {len(content) / 1e6:.1f} MB file")
+    print(f"  probe can_parse : {t_probe * 1000:9.3f} ms")
+    print(f"  signature index : {t_index * 1000:9.3f} ms  ({t_probe / t_index:.0f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,137 @@
+"""
+Benchmark: import and read throughput per SQLITE_PROFILE.
+
+    cd backend && IBAN_HMAC_KEY=00 python -m benchmarks.bench_sqlite_profiles [rows] [batch_size]
+
+Each profile gets a fresh database file and runs:
+
+- import: `rows` transactions through import_bank_stream, committed every
+  `batch_size` rows (the CSV upload path)
+- commits: 1000 one-row INSERT transactions (what synchronous= costs)
+- reads: transaction list pages on 4 threads, idle and while a second
+  import of `rows` rows is writing (where the journal mode matters)
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sys
+import tempfile
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from src.database import SQLITE_PROFILES, create_sqlite_engine
+from src.models import Base
+from src.services.bank import import_bank_stream
+from src.services.bank_models import BankAccount, BankTransaction
+from src.services.categories import ensure_root_categories_db
+from src.services.csv_parsers import StreamedBankData
+from src.services.transactions import list_transactions_db
+
+COMMITS = 1000
+READS = 200
+READ_THREADS = 4
+
+ACCOUNT = BankAccount(
+    name="Bench", amount=Decimal("0"), iban="DE89370400440532013000", holder_name="BENCH"
+)
+
+
+def _rows(n: int, offset: int = 0):
+    start = dt.date(2015, 1, 1)
+    for i in range(offset, offset + n):
+        yield BankTransaction(
+            text=f"Einkauf {i}",
+            peer=f"Shop {i % 500}",
+            amount=Decimal(-(i % 10_000)) / 100,
+            date=(start + dt.timedelta(days=i // 25)).strftime("%d.%m.%Y"),
+            customerreference=None,
+        )
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run_profile(profile: str, path: Path, rows: int, batch_size: int) -> dict:
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    Base.metadata.create_all(engine)
+    with Session() as db:
+        ensure_root_categories_db(db)
+        db.commit()
+        journal = db.scalar(text("PRAGMA journal_mode"))
+
+    def bulk_import(offset: int = 0):
+        with Session() as db:
+            import_bank_stream(
+                db,
+                [StreamedBankData(account=ACCOUNT, transactions=_rows(rows, offset))],
+                batch_size=batch_size,
+                incremental=False,
+            )
+            db.commit()
+
+    t_import = _timed(bulk_import)
+
+    def commits():
+        with Session() as db:
+            db.execute(text("CREATE TABLE bench_commits (x INTEGER)"))
+            db.commit()
+            for i in range(COMMITS):
+                db.execute(text("INSERT INTO bench_commits VALUES (:x)"), {"x": i})
+                db.commit()
+
+    t_commit = _timed(commits)
+
+    def read(i: int) -> None:
+        with Session() as db:
+            list_transactions_db(db, limit=50, offset=(i * 997) % max(rows - 50, 1))
+
+    def reads():
+        with ThreadPoolExecutor(max_workers=READ_THREADS) as pool:
+            list(pool.map(read, range(READS)))
+
+    t_read = _timed(reads)
+
+    writer = threading.Thread(target=bulk_import, args=(rows,))
+    writer.start()
+    t_read_busy = _timed(reads)
+    writer.join()
+
+    engine.dispose()
+    return {
+        "journal": journal,
+        "import": rows / t_import,
+        "commits": COMMITS / t_commit,
+        "read": READS / t_read,
+        "read_busy": READS / t_read_busy,
+    }
+
+
+def main(rows: int = 50_000, batch_size: int = 1000) -> None:
+    print(f"{rows} rows imported in batches of {batch_size}")
+    print(
+        f"{'profile':<9} {'journal':<8} {'import rows/s':>14} {'commits/s':>10} "
+        f"{'pages/s':>9} {'pages/s during import':>22}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in SQLITE_PROFILES:
+            r = run_profile(profile, Path(tmp) / f"{profile}.db", rows, batch_size)
+            print(
+                f"{profile:<9} {r['journal']:<8} {r['import']:>14,.0f} "
+                f"{r['commits']:>10,.0f} {r['read']:>9,.0f} {r['read_busy']:>22,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,100 @@
+"""
+Command line tools.
+
+    python -m src.cli import-csv ~/Downloads/dkb/ --holder "Jane Doe"
+
+Directories are expanded to their `*.csv` files in name order (DKB exports
+sort chronologically by name); files are parsed in parallel and imported by
+a single writer, see `services.bank.import_csv_files`.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .database import SessionLocal, initialize_database
+from .services.bank import ImportStats, import_csv_files
+from .services.fingerprint_filter import fingerprint_filter_stats_db
+from .settings import IMPORT_BATCH_SIZE
+from .utils import Conflict, ExternalServiceError
+
+
+def _expand_paths(inputs: Sequence[str]) -> List[str]:
+    paths: List[str] = []
+    for raw in inputs:
+        path = Path(raw).expanduser()
+        if path.is_dir():
+            paths.extend(str(p) for p in sorted(path.glob("*.csv")))
+        else:
+            paths.append(str(path))
+    return paths
+
+
+def _import_csv(args: argparse.Namespace) -> int:
+    paths = _expand_paths(args.paths)
+    if not paths:
+        print("No CSV files found.")
+        return 1
+
+    initialize_database()
+    db = SessionLocal()
+    stats = ImportStats()
+    try:
+        counts = import_csv_files(
+            db,
+            paths,
+            args.parser,
+            args.holder,
+            max_workers=args.workers,
+            batch_size=IMPORT_BATCH_SIZE,
+            stats=stats,
+        )
+        db.commit()
+        prefilter = fingerprint_filter_stats_db(db)
+    except (ExternalServiceError, Conflict) as e:
+        db.rollback()
+        print(f"Import failed: {e}")
+        return 1
+    finally:
+        db.close()
+
+    print(f"Imported {len(paths) - stats.skipped_files} file(s).")
+    if stats.skipped_files:
+        print(f"  {stats.skipped_files} file(s) were already imported and skipped.")
+    for name, n in sorted(counts.items()):
+        print(f"  {name}: {n} new transaction(s)")
+    if stats.failed:
+        print(f"{stats.failed} row(s) could not be imported:")
+        for err in stats.errors:
+            print(f"  {err.account} #{err.row}: {err.reason}")
+    if prefilter.enabled:
+        print(
+            f"Fingerprint prefilter: {prefilter.definitely_new}/{prefilter.lookups} "
+            f"lookups skipped the duplicate check ({prefilter.hit_rate:.0%})."
+        )
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import-csv", help="Import CSV bank statements.")
+    imp.add_argument("paths", nargs="+", help="CSV files or directories of CSV files.")
+    imp.add_argument("--holder", required=True, help="Account holder name.")
+    imp.add_argument(
+        "--parser", default=None, help="Parser type (e.g. 'dkb'); auto-detected if omitted."
+    )
+    imp.add_argument(
+        "--workers", type=int, default=None, help="Parser processes (default: CPU count)."
+    )
+    imp.set_defaults(func=_import_csv)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
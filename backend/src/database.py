@@ -1,27 +1,131 @@
+import os
+from typing import Dict, Union
+
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, URL, make_url
 from sqlalchemy.orm import sessionmaker
 from .models import Base
-from .settings import DB_PATH, SQLALCHEMY_DATABASE_URL
-
-
-# Engine (SQLite needs check_same_thread=False in threaded servers)
-engine = create_engine(
+from .services import data_version  # noqa: F401  (installs the write listeners)
+from .settings import (
+    ASYNC_READS,
+    DB_PATH,
+    SEARCH_TRIGRAM,
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    pool_pre_ping=True,  # avoid stale pooled connections
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_MB,
+    SQLITE_MMAP_SIZE_MB,
+    SQLITE_PROFILE,
+    SQLITE_WRITE_CONNECTIONS,
 )
 
 
-# Enforce SQLite foreign keys
-@event.listens_for(engine, "connect")
-def _set_sqlite_pragma(dbapi_connection, connection_record):
-    try:
+# PRAGMAs applied to every new connection, per SQLITE_PROFILE. WAL lets
+# readers run while an import writes; with synchronous=NORMAL a commit does
+# not wait for fsync, so a power loss may drop the last commits but cannot
+# corrupt the database (application crashes lose nothing).
+_WAL = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -SQLITE_CACHE_SIZE_MB * 1024,  # negative = KiB
+    "mmap_size": SQLITE_MMAP_SIZE_MB * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+}
+SQLITE_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    # SQLite's defaults: rollback journal, synchronous=FULL, 2 MiB cache
+    # (the journal mode is stored in the file, so it is switched back explicitly)
+    "default": {"journal_mode": "DELETE"},
+    "wal": _WAL,
+    # fsync on every commit
+    "durable": {**_WAL, "synchronous": "FULL"},
+    # one-off bulk loads only: an OS crash or power loss can corrupt the database
+    "bulk": {**_WAL, "synchronous": "OFF"},
+}
+
+
+def _read_only_url(url: Union[str, URL]) -> URL:
+    """The same SQLite file opened as a read-only URI (`mode=ro`)."""
+    url = make_url(url)
+    return url.set(database=f"file:{url.database}", query={"mode": "ro", "uri": "true"})
+
+
+def database_file(url: Union[str, URL]) -> str:
+    """Absolute path of the SQLite file behind a write or read-only URL."""
+    database = make_url(url).database or ""
+    return os.path.abspath(database.removeprefix("file:"))
+
+
+def _install_sqlite_listeners(
+    eng: Engine, pragmas: Dict[str, Union[str, int]], begin: str = "BEGIN"
+) -> None:
+    @event.listens_for(eng, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-    except Exception:
-        # Optional: log this if you have a logger configured
-        pass
+        try:
+            # Enforce SQLite foreign keys
+            cursor.execute("PRAGMA foreign_keys=ON")
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+        # Let SQLAlchemy (not pysqlite) emit BEGIN, so SAVEPOINTs nest inside the
+        # outer transaction instead of committing on release
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(eng, "begin")
+    def _begin_transaction(conn):
+        conn.exec_driver_sql(begin)
+
+
+def create_sqlite_engine(
+    url: Union[str, URL], profile: str = SQLITE_PROFILE, *, read_only: bool = False
+) -> Engine:
+    """Engine for a SQLite database with the given SQLITE_PROFILES entry.
+
+    The default is a write engine with SQLITE_WRITE_CONNECTIONS pooled
+    connections whose transactions start with BEGIN IMMEDIATE: SQLite has one
+    writer, and taking the lock up front lets the busy timeout queue writers
+    (a read-then-write transaction that loses the race would fail instead).
+    A writer that waits longer than the timeout gets "database is locked",
+    answered with 503 (see main.py). `read_only` engines open the file with
+    `mode=ro` and keep a normal pool; under WAL they read a consistent
+    snapshot while a write is in progress.
+    """
+    pragmas = dict(SQLITE_PROFILES[profile])
+
+    # SQLite needs check_same_thread=False in threaded servers. No pre-ping:
+    # a pooled file connection cannot go stale, the ping is only a round-trip.
+    if read_only:
+        pragmas.pop("journal_mode", None)  # set by the writer; needs write access
+        eng = create_engine(_read_only_url(url), connect_args={"check_same_thread": False})
+    else:
+        eng = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=SQLITE_WRITE_CONNECTIONS,
+            max_overflow=0,
+        )
+    _install_sqlite_listeners(eng, pragmas, begin="BEGIN" if read_only else "BEGIN IMMEDIATE")
+    return eng
+
+
+def create_async_sqlite_engine(url: Union[str, URL], profile: str = SQLITE_PROFILE):
+    """Read-only aiosqlite AsyncEngine for the same file (ASYNC_READS).
+
+    Needs the optional `async` dependencies (aiosqlite, greenlet).
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.pop("journal_mode", None)
+    eng = create_async_engine(_read_only_url(url).set(drivername="sqlite+aiosqlite"))
+    _install_sqlite_listeners(eng.sync_engine, pragmas)
+    return eng
+
+
+# Mutations go through `engine`; GET endpoints read through `read_engine`
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL, read_only=True)
 
 
 # Session factory: conservative, API-friendly defaults
@@ -33,6 +137,25 @@ SessionLocal = sessionmaker(
 )
 
 
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# Async read path for the hot dashboard endpoints (see executor.run_read)
+AsyncReadSessionLocal = None
+if ASYNC_READS:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_read_engine = create_async_sqlite_engine(SQLALCHEMY_DATABASE_URL)
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, autoflush=False, expire_on_commit=False
+    )
+
+
 # Typical FastAPI dependency (keep if you already have it elsewhere)
 def get_db():
     db = SessionLocal()
@@ -46,6 +169,15 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency for GET endpoints: read-only connection, nothing to commit."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def initialize_database() -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -54,6 +186,14 @@ def initialize_database() -> None:
     except Exception as create_all_err:
         raise RuntimeError(f"fallback create_all error: {create_all_err!r}")
 
+    # The full-text index and the closure table's triggers are not part of
+    # the ORM metadata
+    from .services.category_closure import ensure_category_closure
+    from .services.search import ensure_search_index
+    with engine.begin() as conn:
+        ensure_search_index(conn, trigram_index=SEARCH_TRIGRAM)
+        ensure_category_closure(conn)
+
     # Seed mandatory top-level category roots (Einnahmen / Ausgaben).
     # Idempotent: only inserts rows that aren't already present.
     from .services.categories import ensure_root_categories_db
@@ -0,0 +1,211 @@
+"""
+Execution model for request handlers.
+
+Light endpoints are plain `def` routes and run on Starlette's threadpool
+(sized by REQUEST_THREADPOOL_SIZE). Heavy ones (summaries, dashboards, CSV
+imports) are `async def` routes that hand their service call to
+`run_blocking(lane, fn, ...)`: it runs on a dedicated thread pool of
+HEAVY_EXECUTOR_WORKERS threads, and at most `limit` calls per lane run at
+once. Further calls wait on the event loop, so a burst of one heavy
+endpoint neither blocks the loop nor takes the threads that list calls
+need. `executor_stats()` reports the queue depths.
+
+The hot read endpoints go through `run_read(lane, fn, ...)`, which opens the
+read session itself: on a thread (as above) by default, or, with
+ASYNC_READS=1, on the event loop through the aiosqlite AsyncEngine. There the
+service runs via `AsyncSession.run_sync`, so database waits no longer hold a
+thread, but its Python work (row mapping, tree building) runs on the loop.
+`run_blocking_read` opens the read session on the heavy executor instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import anyio.to_thread
+
+from . import database
+from .schemas import ExecutorStats, LaneStats
+from .settings import (
+    ASYNC_READS,
+    ENDPOINT_CONCURRENCY,
+    HEAVY_EXECUTOR_WORKERS,
+    REQUEST_THREADPOOL_SIZE,
+)
+
+T = TypeVar("T")
+
+# Concurrent calls per lane unless ENDPOINT_CONCURRENCY overrides them
+DEFAULT_LANE_LIMITS: Dict[str, int] = {
+    "import_csv": 1,  # SQLite has one writer
+    "import_preview": 2,
+    "sankey": 2,
+    "category_series": 2,
+    "summary": 2,
+    "balances": 2,
+}
+
+
+class _Lane:
+    """Concurrency limit and counters of one endpoint."""
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.running = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def semaphore(self) -> asyncio.Semaphore:
+        # Bound to the running loop; a new loop (tests, reload) gets a new one
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore, self._loop = asyncio.Semaphore(self.limit), loop
+        return self._semaphore
+
+    def to_schema(self) -> LaneStats:
+        return LaneStats(
+            name=self.name,
+            limit=self.limit,
+            running=self.running,
+            waiting=self.waiting,
+            max_waiting=self.max_waiting,
+            completed=self.completed,
+            avg_wait_ms=1000 * self.wait_seconds / self.completed if self.completed else 0.0,
+        )
+
+
+_lanes: Dict[str, _Lane] = {}
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_busy = 0
+
+
+def _get_lane(name: str) -> _Lane:
+    lane = _lanes.get(name)
+    if lane is None:
+        limit = ENDPOINT_CONCURRENCY.get(name, DEFAULT_LANE_LIMITS.get(name, 1))
+        lane = _lanes[name] = _Lane(name, max(1, limit))
+    return lane
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=HEAVY_EXECUTOR_WORKERS, thread_name_prefix="heavy"
+            )
+        return _executor
+
+
+def _call(fn: Callable[..., T]) -> T:
+    global _busy
+    with _lock:
+        _busy += 1
+    try:
+        return fn()
+    finally:
+        with _lock:
+            _busy -= 1
+
+
+async def _in_lane(lane: str, call: Callable[[], Awaitable[T]]) -> T:
+    state = _get_lane(lane)
+    semaphore = state.semaphore()
+    queued_at = time.perf_counter()
+    state.waiting += 1
+    state.max_waiting = max(state.max_waiting, state.waiting)
+    try:
+        await semaphore.acquire()
+    finally:
+        state.waiting -= 1
+    state.wait_seconds += time.perf_counter() - queued_at
+    state.running += 1
+
+    def release(future: asyncio.Future) -> None:
+        if not future.cancelled():
+            future.exception()  # retrieved here if the caller has gone
+        state.running -= 1
+        state.completed += 1
+        semaphore.release()
+
+    # A cancelled caller (client disconnect) cannot stop an executor thread:
+    # the call keeps its slot in the lane until it has actually finished
+    future = asyncio.ensure_future(call())
+    future.add_done_callback(release)
+    return await asyncio.shield(future)
+
+
+async def run_blocking(lane: str, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking service call on the heavy executor within `lane`'s limit."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    return await _in_lane(lane, lambda: loop.run_in_executor(_get_executor(), _call, call))
+
+
+def _with_read_session(fn: Callable[..., T], *args, **kwargs) -> T:
+    with database.ReadSessionLocal() as db:
+        return fn(db, *args, **kwargs)
+
+
+async def _run_async_read(fn: Callable[..., T], *args, **kwargs) -> T:
+    async with database.AsyncReadSessionLocal() as db:
+        return await db.run_sync(fn, *args, **kwargs)
+
+
+async def run_read(lane: Optional[str], fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run the read-only service call `fn(db, *args, **kwargs)` on a fresh read
+    session, within `lane`'s limit (None: only the request threadpool's)."""
+    if ASYNC_READS:
+        call = functools.partial(_run_async_read, fn, *args, **kwargs)
+        return await (_in_lane(lane, call) if lane else call())
+    if lane:
+        return await run_blocking(lane, _with_read_session, fn, *args, **kwargs)
+    return await anyio.to_thread.run_sync(
+        functools.partial(_with_read_session, fn, *args, **kwargs)
+    )
+
+
+async def run_blocking_read(lane: str, fn: Callable[..., T], *args, **kwargs) -> T:
+    """`run_read` on the heavy executor even with ASYNC_READS: for read-only
+    calls whose Python work (e.g. CSV parsing) must not run on the loop."""
+    return await run_blocking(lane, _with_read_session, fn, *args, **kwargs)
+
+
+def executor_stats() -> ExecutorStats:
+    """Snapshot of the heavy executor and its lanes."""
+    with _lock:
+        queued = _executor._work_queue.qsize() if _executor is not None else 0
+        busy = _busy
+    for name in DEFAULT_LANE_LIMITS:
+        _get_lane(name)
+    return ExecutorStats(
+        workers=HEAVY_EXECUTOR_WORKERS,
+        busy=busy,
+        queued=queued,
+        request_threadpool_size=REQUEST_THREADPOOL_SIZE,
+        lanes=[lane.to_schema() for lane in sorted(_lanes.values(), key=lambda l: l.name)],
+    )
+
+
+def configure_request_threadpool() -> None:
+    """Size Starlette's threadpool for sync endpoints (call from the running loop)."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = REQUEST_THREADPOOL_SIZE
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -1,9 +1,12 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
+from sqlalchemy.exc import OperationalError
 from .database import initialize_database
-from .routers import accounts, balances, transactions, bank, categories, category_rules, budget
+from .executor import configure_request_threadpool, shutdown_executor
+from .routers import accounts, balances, transactions, bank, categories, category_rules, budget, system
+from .services.import_jobs import resume_import_jobs, shutdown_import_workers
 from .settings import cors_origins_from_env
 
 
@@ -13,7 +16,11 @@ PREFIX = "/api"
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     initialize_database()
-    yield  # teardown if needed
+    configure_request_threadpool()
+    resume_import_jobs()
+    yield
+    shutdown_import_workers()
+    shutdown_executor()
 
 
 # Initialize the FastAPI application
@@ -44,6 +51,19 @@ app.include_router(categories.router, prefix=PREFIX)
 app.include_router(category_rules.router, prefix=PREFIX)
 app.include_router(budget.router, prefix=PREFIX)
 app.include_router(bank.router, prefix=PREFIX)
+app.include_router(system.router, prefix=PREFIX)
+
+# A write that did not get SQLite's write lock within SQLITE_BUSY_TIMEOUT_MS
+# (e.g. behind a long import transaction) can simply be retried
+@app.exception_handler(OperationalError)
+async def database_locked(request: Request, exc: OperationalError):
+    if "database is locked" not in str(exc.orig):
+        raise exc
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The database is busy with another write, please retry."},
+        headers={"Retry-After": "1"},
+    )
 
 # Optional friendly root redirect
 @app.get("/api/", include_in_schema=False)
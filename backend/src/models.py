@@ -1,19 +1,69 @@
 from __future__ import annotations
 
 import uuid
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional
 
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     Date,
+    DateTime,
     ForeignKey,
+    Index,
     String,
     Integer,
+    LargeBinary,
     Numeric,
     UniqueConstraint,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, backref
+from sqlalchemy.types import TypeDecorator
+
+from .settings import AMOUNT_STORAGE
+from .utils import from_cents, to_cents
+
+AMOUNTS_IN_CENTS = AMOUNT_STORAGE == "cents"
+
+
+class Money(TypeDecorator):
+    """Monetary amount, always a Decimal in Python.
+
+    Stored as NUMERIC(18, 2), or as signed 64-bit integer cents when
+    AMOUNT_STORAGE=cents. Raw SQL sees the stored form; see
+    `storage_to_cents` / `cents_to_storage`.
+    """
+
+    impl = Numeric(18, 2)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if AMOUNTS_IN_CENTS:
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(Numeric(18, 2))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not AMOUNTS_IN_CENTS:
+            return value
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or not AMOUNTS_IN_CENTS:
+            return value
+        return from_cents(int(value))
+
+
+def storage_to_cents(value) -> int:
+    """Integer cents for an amount as returned by raw SQL (e.g. SUM(amount))."""
+    if value is None:
+        return 0
+    return int(value) if AMOUNTS_IN_CENTS else to_cents(value)
+
+
+def cents_to_storage(cents: int):
+    """Bind value for raw SQL comparing against stored amounts."""
+    return cents if AMOUNTS_IN_CENTS else str(from_cents(cents))
 
 
 class Base(DeclarativeBase):
@@ -40,7 +90,7 @@ class Account(Base):
     iban_last4: Mapped[str] = mapped_column(String(4), nullable=True)
 
     balance: Mapped[Decimal] = mapped_column(
-        Numeric(18, 2), default=Decimal("0"), nullable=False
+        Money(), default=Decimal("0"), nullable=False
     )
 
     transactions: Mapped[List["Transaction"]] = relationship(
@@ -77,6 +127,28 @@ class Category(Base):
     )
 
 
+class CategoryClosure(Base):
+    """Every (ancestor, descendant) pair of the category tree, each category
+    also paired with itself at depth 0. Kept in sync by triggers on
+    `categories`, see services.category_closure."""
+
+    __tablename__ = "category_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Edges from the ancestor down to the descendant
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Ancestors of a category, and its ancestor at a given distance
+        Index("ix_category_closure_descendant_id_depth", "descendant_id", "depth"),
+    )
+
+
 class CategoryRule(Base):
     __tablename__ = "category_rules"
 
@@ -120,7 +192,6 @@ class Transaction(Base):
         String(36),
         ForeignKey("accounts.public_id", ondelete="RESTRICT"),
         nullable=False,
-        index=True,
     )
     account: Mapped[Account] = relationship("Account", back_populates="transactions")
 
@@ -133,13 +204,96 @@ class Transaction(Base):
     category: Mapped[Optional[Category]] = relationship("Category", back_populates="transactions")
 
     date: Mapped[date] = mapped_column(Date, index=True, nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    # Indexed for the amount orders of the transaction list (keyset pages)
+    amount: Mapped[Decimal] = mapped_column(Money(), nullable=False, index=True)
 
     # Free-form transaction text and counterparty/payee
     text: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True, index=True)
     entity: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
     reference: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
 
+    # Search forms of entity/text/reference (casefolded, whitespace collapsed,
+    # see services.search.normalize_search_text), written with the originals
+    entity_norm: Mapped[str] = mapped_column(String(500), nullable=False, default="")
+    text_norm: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    reference_norm: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+
     # De-duplication
-    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
     batch_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True)
+
+    __table_args__ = (
+        # Covers the batch-aware duplicate probe (fingerprint IN ... AND batch_hash IS NOT ...)
+        # without touching the table. Not unique: identical rows within one batch are kept.
+        Index("ix_transactions_fingerprint_batch_hash", "fingerprint", "batch_hash"),
+        # Per-account newest booking day (import high-water mark); also serves
+        # plain account_id lookups
+        Index("ix_transactions_account_id_date", "account_id", "date"),
+        # Covers the per-category sums of the summary, also within a date range
+        Index("ix_transactions_category_id_date_amount", "category_id", "date", "amount"),
+    )
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # public, opaque identifier for API paths
+    public_id: Mapped[str] = mapped_column(
+        String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4())
+    )
+
+    # queued -> running -> completed | failed | cancelled
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    parser_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    holder_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # spooled upload on disk; removed once the job has finished
+    upload_path: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+
+    rows_parsed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_inserted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_duplicate: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class ImportLedger(Base):
+    """One imported statement file, identified by its content hash."""
+
+    __tablename__ = "import_ledger"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # SHA-256 of the normalized file content; also the import's batch_hash
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    # Hash of the first HEAD_LINES lines; finds files this one may be a prefix of
+    head_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    line_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 8-byte hash prefix of every line prefix of the file, concatenated
+    line_hashes: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    # running -> completed; a running entry is resumed after rows_done rows
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    rows_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_inserted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every write to transactions or categories
+    (see services.data_version); read-side caches are keyed by it."""
+
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
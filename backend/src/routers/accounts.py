@@ -4,7 +4,7 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query
 from sqlalchemy.orm import Session
 
 from ..schemas import Account, AccountCreate
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..services.accounts import (
     create_account_db,
     update_account_db,
@@ -59,7 +59,7 @@ def update_account(
 
 
 @router.get("/{public_id}", response_model=Account)
-def get_account(public_id: str, db: Session = Depends(get_db)) -> Account:
+def get_account(public_id: str, db: Session = Depends(get_read_db)) -> Account:
     """
     Retrieve a specific account by public ID.
     """
@@ -71,7 +71,7 @@ def get_account(public_id: str, db: Session = Depends(get_db)) -> Account:
 
 @router.get("/", response_model=List[Account])
 def get_all_accounts(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     name: Optional[str] = Query(None, description="Filter by account name (exact)."),
     holder: Optional[str] = Query(None, description="Filter by holder_name (exact)."),
 ) -> List[Account]:
@@ -1,9 +1,8 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Query, status
 
-from ..database import get_db
+from ..executor import run_read
 from ..schemas import BalancePoint, SurplusPoint
 from ..services.balances import Granularity, get_surplus_series_db, get_balance_series_db
 from ..utils import BadRequest, NotFound
@@ -16,8 +15,7 @@ router = APIRouter(
 
 
 @router.get("/series", response_model=List[BalancePoint])
-def get_balance_series(
-    db: Session = Depends(get_db),
+async def get_balance_series(
     account_id: Optional[str] = Query(None, description="Optional account filter."),
     date_from: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
     date_to: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
@@ -32,8 +30,9 @@ def get_balance_series(
     """Return a lightweight series with `date` + `balance` at the chosen granularity."""
 
     try:
-        return get_balance_series_db(
-            db,
+        return await run_read(
+            "balances",
+            get_balance_series_db,
             account_id=account_id,
             date_from=date_from,
             date_to=date_to,
@@ -46,8 +45,7 @@ def get_balance_series(
 
 
 @router.get("/surplus", response_model=List[SurplusPoint])
-def get_surplus_series(
-    db: Session = Depends(get_db),
+async def get_surplus_series(
     account_id: Optional[str] = Query(None, description="Optional account filter."),
     date_from: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
     date_to: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
@@ -62,8 +60,9 @@ def get_surplus_series(
     """Return aggregated deltas ("surplus") for the given range."""
 
     try:
-        return get_surplus_series_db(
-            db,
+        return await run_read(
+            "balances",
+            get_surplus_series_db,
             account_id=account_id,
             date_from=date_from,
             date_to=date_to,
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
-import io
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from dataclasses import asdict
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..services.bank import import_csv_data, ExternalServiceError
+from ..database import get_db, get_read_db
+from ..executor import run_blocking, run_blocking_read
+from ..schemas import FingerprintFilterStats, ImportJob
+from ..services.bank import (
+    PREVIEW_ROWS,
+    ImportStats,
+    import_csv_data,
+    preview_csv_data,
+    ExternalServiceError,
+)
+from ..services.fingerprint_filter import fingerprint_filter_stats_db
+from ..services.import_jobs import (
+    cancel_import_job_db,
+    enqueue_import_job_db,
+    get_import_job_db,
+    list_import_jobs_db,
+    spool_upload,
+)
+from ..settings import IMPORT_BATCH_SIZE
+from ..utils import BadRequest, Conflict, NotFound
 
 router = APIRouter(
     prefix="/bank",
@@ -20,6 +41,10 @@ async def import_csv(
     file: UploadFile = File(...),
     holder_name: str = Form(..., description="Account holder name"),
     parser_type: str = Form("dkb", description="CSV parser type (e.g., 'dkb')"),
+    dry_run: bool = Form(False, description="Only preview the import; nothing is written"),
+    preview_rows: int = Form(
+        PREVIEW_ROWS, ge=0, le=1000, description="New rows listed per account in a dry run"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -33,43 +58,167 @@ async def import_csv(
     - Duplicate detection using transaction fingerprints
     - Batch tracking for import runs
     - Balance updates from CSV metadata
+    - Streaming: the upload is parsed chunk by chunk and committed every
+      IMPORT_BATCH_SIZE rows; re-uploading after a failure resumes by
+      skipping the rows that were already committed
+    - Idempotent re-uploads: a file identical to (or a strict prefix of) an
+      already imported one is answered from the import ledger without
+      parsing it (`already_imported`)
     
-    Returns a mapping of account name -> number of inserted transactions.
+    Returns a mapping of account name -> number of inserted transactions,
+    the row counters, and the rows that could not be imported (first 100).
+    
+    With `dry_run=true` nothing is written; the response's `preview` lists,
+    per account, how many rows are new, duplicate or unparseable and the
+    category each new row would get.
     """
     try:
-        # Read file content
-        content = await file.read()
-        if not content:
+        # Only peek at the upload; the parser streams the rest from disk
+        if not await file.read(1):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Uploaded file is empty"
             )
+        await file.seek(0)
+
+        if dry_run:
+            # On a read session: a preview must not hold the single write
+            # connection (`db` only connects when the import path uses it)
+            preview = await run_blocking_read(
+                "import_preview",
+                preview_csv_data,
+                file_obj=file.file,
+                parser_type=parser_type,
+                holder_name=holder_name,
+                batch_size=IMPORT_BATCH_SIZE,
+                preview_rows=preview_rows,
+            )
+            return {
+                "message": "CSV import preview (nothing was written).",
+                "preview": preview,
+                "parser_used": parser_type,
+                "filename": file.filename
+            }
         
-        # Convert to file-like object for parser
-        file_obj = io.BytesIO(content)
-        
-        # Import using CSV parser
-        inserted_counts = import_csv_data(
+        # Import using CSV parser, off the event loop (parsing + DB work are blocking)
+        stats = ImportStats()
+        inserted_counts = await run_blocking(
+            "import_csv",
+            import_csv_data,
             db=db,
-            file_obj=file_obj,
+            file_obj=file.file,
             parser_type=parser_type,
-            holder_name=holder_name
+            holder_name=holder_name,
+            batch_size=IMPORT_BATCH_SIZE,
+            stats=stats,
         )
         
+        already_imported = stats.skipped_files > 0
         return {
-            "message": "CSV import completed.",
+            "message": (
+                "File was already imported; nothing to do."
+                if already_imported
+                else "CSV import completed."
+            ),
+            "already_imported": already_imported,
             "inserted": inserted_counts,
+            "rows": {
+                "parsed": stats.parsed,
+                "inserted": stats.inserted,
+                "duplicates": stats.duplicates,
+                "failed": stats.failed,
+            },
+            "errors": [asdict(e) for e in stats.errors],
             "parser_used": parser_type,
             "filename": file.filename
         }
         
+    except HTTPException:
+        raise
     except ExternalServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except Conflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error during CSV import: {str(e)}"
         )
+
+
+@router.post("/import_jobs", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_import_job(
+    file: UploadFile = File(...),
+    holder_name: str = Form(..., description="Account holder name"),
+    parser_type: str = Form("dkb", description="CSV parser type (e.g., 'dkb')"),
+    db: Session = Depends(get_db)
+) -> ImportJob:
+    """
+    Queue a CSV bank statement import as a background job.
+    
+    Same import pipeline as `/bank/import_csv`, but the request returns as soon
+    as the upload is stored. Poll `GET /bank/import_jobs/{job_id}` for the
+    status and the rows parsed / inserted / skipped as duplicates / failed.
+    """
+    if not await file.read(1):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file is empty"
+        )
+    await file.seek(0)
+
+    upload_path = await run_in_threadpool(spool_upload, file.file)
+    try:
+        return await run_in_threadpool(
+            enqueue_import_job_db,
+            db,
+            upload_path=upload_path,
+            filename=file.filename,
+            parser_type=parser_type,
+            holder_name=holder_name,
+        )
+    except BadRequest as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/import_jobs", response_model=List[ImportJob])
+def list_import_jobs(
+    limit: int = Query(50, gt=0, le=500, description="Maximum number of jobs (newest first)."),
+    db: Session = Depends(get_read_db),
+) -> List[ImportJob]:
+    """List recent import jobs, newest first."""
+    return list_import_jobs_db(db, limit=limit)
+
+
+@router.get("/import_jobs/{job_id}", response_model=ImportJob)
+def get_import_job(job_id: str, db: Session = Depends(get_read_db)) -> ImportJob:
+    """Retrieve an import job's status and progress counters."""
+    try:
+        return get_import_job_db(db, job_id)
+    except NotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/import_jobs/{job_id}/cancel", response_model=ImportJob)
+def cancel_import_job(job_id: str, db: Session = Depends(get_db)) -> ImportJob:
+    """
+    Cancel an import job.
+    
+    A queued job is cancelled immediately. A running job stops after its
+    current batch; batches committed before that are kept.
+    """
+    try:
+        return cancel_import_job_db(db, job_id)
+    except NotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Conflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/fingerprint_filter", response_model=FingerprintFilterStats)
+def get_fingerprint_filter_stats(db: Session = Depends(get_read_db)) -> FingerprintFilterStats:
+    """Hit-rate counters of the in-memory duplicate prefilter (this process only)."""
+    return fingerprint_filter_stats_db(db)
@@ -1,9 +1,8 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Query, status
 
-from ..database import get_db
+from ..executor import run_read
 from ..schemas import CategorySeriesPoint, SankeyResponse
 from ..services.budget import build_sankey_db, category_series_db
 from ..utils import BadRequest, NotFound
@@ -16,8 +15,7 @@ router = APIRouter(
 
 
 @router.get("/sankey", response_model=SankeyResponse)
-def get_budget_sankey(
-    db: Session = Depends(get_db),
+async def get_budget_sankey(
     date_from: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
     date_to: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
     account_id: Optional[str] = Query(None, description="Filter by account public_id."),
@@ -30,8 +28,9 @@ def get_budget_sankey(
     from this same payload. Savings is the synthetic delta income - expenses.
     """
     try:
-        return build_sankey_db(
-            db, date_from=date_from, date_to=date_to, account_id=account_id
+        return await run_read(
+            "sankey", build_sankey_db,
+            date_from=date_from, date_to=date_to, account_id=account_id,
         )
     except NotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -40,8 +39,7 @@ def get_budget_sankey(
 
 
 @router.get("/category-series", response_model=List[CategorySeriesPoint])
-def get_category_series(
-    db: Session = Depends(get_db),
+async def get_category_series(
     category_id: str = Query(
         ...,
         description="Category id whose subtree to sum, or 'uncategorized'.",
@@ -60,8 +58,9 @@ def get_category_series(
     (gaps filled with 0). Drives the budget page's "over time" panel.
     """
     try:
-        return category_series_db(
-            db,
+        return await run_read(
+            "category_series",
+            category_series_db,
             category_id=category_id,
             account_id=account_id,
             granularity=granularity,
@@ -3,7 +3,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..schemas import Category, CategoryCreate, CategoryUpdate
 from ..utils import NotFound, Conflict
 from ..services.categories import (
@@ -37,7 +37,7 @@ def create_category(
 
 
 @router.get("/", response_model=List[Category])
-def get_all_categories(db: Session = Depends(get_db)):
+def get_all_categories(db: Session = Depends(get_read_db)):
     """Retrieve all existing categories."""
     return get_all_categories_db(db)
 
@@ -48,7 +48,7 @@ def get_category_tree(
         None,
         description="If provided, return only the children (with subtrees) of this category id.",
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Return a nested category tree.
 
@@ -62,7 +62,7 @@ def get_category_tree(
 
 
 @router.get("/{id}", response_model=Category)
-def get_category(id: int, db: Session = Depends(get_db)):
+def get_category(id: int, db: Session = Depends(get_read_db)):
     """Retrieve a category by its id."""
     try:
         return get_category_by_id_db(db, id)
@@ -72,7 +72,7 @@ def get_category(id: int, db: Session = Depends(get_db)):
 
 @router.patch("/{id}", response_model=Category)
 def update_category(id: int, payload: CategoryUpdate, db: Session = Depends(get_db)):
-    """Rename a category by id."""
+    """Rename a category and/or move it (with its subtree) under another parent."""
     try:
         return update_category_db(db, id, payload)
     except NotFound as e:
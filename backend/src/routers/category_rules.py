@@ -3,7 +3,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Query, Depends, status, HTTPException
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..schemas import CategoryRule, CategoryRuleCreate
 from ..utils import NotFound, Ambiguous, Conflict
 from ..services.category_rules import (
@@ -58,7 +58,7 @@ def create_category_rule(
 
 
 @router.get("/", response_model=List[CategoryRule])
-def get_all_category_rules(db: Session = Depends(get_db)):
+def get_all_category_rules(db: Session = Depends(get_read_db)):
     """List all category rules."""
     return get_all_category_rules_db(db)
 
@@ -83,7 +83,7 @@ def delete_category_rule(rule_id: int, db: Session = Depends(get_db)):
 def resolve_rule(
     entity: str = Query(..., description="Transaction entity"),
     text: Optional[str] = Query(None, description="Transaction text/description"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Resolve a category name for a given (entity, text).
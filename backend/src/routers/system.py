@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from ..executor import executor_stats
+from ..schemas import ExecutorStats
+
+router = APIRouter(
+    prefix="/system",
+    tags=["System"],
+)
+
+
+@router.get("/executor", response_model=ExecutorStats)
+async def get_executor_stats() -> ExecutorStats:
+    """Heavy-endpoint executor of this process: busy threads, queued calls,
+    and per-endpoint concurrency limits with their current queue depth."""
+    return executor_stats()
@@ -3,7 +3,8 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..executor import run_read
 from ..schemas import (
     PaginatedTransactions,
     Transaction,
@@ -50,14 +51,21 @@ def create_transaction(
 
 
 @router.get("/", response_model=PaginatedTransactions)
-def get_all_transactions(
-    db: Session = Depends(get_db),
+async def get_all_transactions(
     limit: int = Query(50, gt=0, le=500, description="Page size."),
     offset: int = Query(0, ge=0, description="Zero-based start index."),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            "next_cursor of the previous page (same sort_by and filters); "
+            "replaces offset and stays fast on deep pages."
+        ),
+    ),
+    with_total: bool = Query(True, description="Count all matches; false leaves total null."),
     sort_by: str = Query(
         "date_desc",
         description="Sort order.",
-        pattern="^(date_desc|date_asc|amount_desc|amount_asc)$",
+        pattern="^(date_desc|date_asc|amount_desc|amount_asc|relevance)$",
     ),
     date_from: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
     date_to: Optional[str] = Query(None, description="Inclusive YYYY-MM-DD."),
@@ -71,27 +79,37 @@ def get_all_transactions(
     q: Optional[str] = Query(
         None, description="Case-insensitive search in entity/text/reference."
     ),
+    search: Optional[str] = Query(
+        None,
+        description=(
+            "Word search in entity/text/reference: every word must start a word "
+            "there ('rewe kart'). Indexed; allows sort_by=relevance."
+        ),
+    ),
 ) -> PaginatedTransactions:
     """List transactions with pagination, sorting, and filters."""
     try:
-        return list_transactions_db(
-            db,
+        return await run_read(
+            None,
+            list_transactions_db,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            with_total=with_total,
             sort_by=sort_by,
             date_from=date_from,
             date_to=date_to,
             account_id=account_id,
             category=category,
             q=q,
+            search=search,
         )
     except BadRequest as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/summary", response_model=List[TransactionSummary])
-def summarize_transactions_by_category(
-    db: Session = Depends(get_db),
+async def summarize_transactions_by_category(
     scope_name: Optional[str] = Query(
         None,
         description=(
@@ -112,6 +130,18 @@ def summarize_transactions_by_category(
     q: Optional[str] = Query(
         None, description="Case-insensitive search in entity/text/reference."
     ),
+    search: Optional[str] = Query(
+        None, description="Word search in entity/text/reference (see the list endpoint)."
+    ),
+    items: int = Query(
+        0,
+        ge=0,
+        le=500,
+        description="Transactions to return per group, newest first (0 = sums only).",
+    ),
+    items_offset: int = Query(
+        0, ge=0, description="Transactions to skip per group (next page: items_offset + items)."
+    ),
 ) -> List[TransactionSummary]:
     """
     Summarize transactions **by category nodes** at a given depth within an optional scope.
@@ -124,17 +154,23 @@ def summarize_transactions_by_category(
     Notes:
     - If a resolved transaction category is shallower than the requested depth within the scope,
       it is grouped under its deepest available ancestor (not dropped).
-    - You can filter via `account`, `date_from`, `date_to`, and `q`. There is **no** separate “group by account”.
+    - You can filter via `account`, `date_from`, `date_to`, `q` and `search`. There is **no** separate “group by account”.
+    - Groups carry their sum and count; their transactions are only listed with `items` > 0,
+      paged per group with `items_offset`.
     """
     try:
-        return summarize_by_category_db(
-            db,
+        return await run_read(
+            "summary",
+            summarize_by_category_db,
             scope_name=scope_name,
             depth=depth,
             date_from=date_from,
             date_to=date_to,
             account_id=account_id,
             q=q,
+            search=search,
+            items=items,
+            items_offset=items_offset,
         )
     except NotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -148,7 +184,7 @@ def summarize_transactions_by_category(
 @router.get("/{tx_id}", response_model=Transaction)
 def get_transaction(
     tx_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Transaction:
     """Retrieve a single transaction."""
     try:
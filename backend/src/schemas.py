@@ -5,7 +5,7 @@ Pydantic models for data validation
 from __future__ import annotations
 import datetime as dt
 from decimal import Decimal
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field, ConfigDict
 
 # ---- Base Config ------------------------------------------------------------
@@ -80,6 +80,117 @@ class SurplusPoint(AppBaseModel):
     delta: Decimal = Field(..., description="Net change during the bucket ending on `date`.")
 
 
+# ---- Bank import jobs ------------------------------------------------------
+
+
+class ImportJob(AppBaseModel):
+    """Background CSV import job with its progress counters."""
+
+    id: str = Field(..., description="Opaque job identifier.")
+    status: str = Field(
+        ..., description="'queued', 'running', 'completed', 'failed' or 'cancelled'."
+    )
+    cancel_requested: bool = Field(
+        False, description="Cancellation was requested; the job stops after its current batch."
+    )
+    filename: Optional[str] = Field(None, description="Name of the uploaded file.")
+    parser_type: str = Field(..., description="CSV parser used for the import.")
+    rows_parsed: int = Field(0, ge=0, description="Rows read from the file so far.")
+    rows_inserted: int = Field(0, ge=0, description="New transactions stored so far.")
+    rows_duplicate: int = Field(
+        0, ge=0, description="Rows skipped because the transaction already exists."
+    )
+    rows_failed: int = Field(
+        0, ge=0, description="Rows that could not be normalized (e.g. invalid date)."
+    )
+    error: Optional[str] = Field(None, description="Failure reason, if the job failed.")
+    created_at: dt.datetime = Field(..., description="When the job was queued.")
+    started_at: Optional[dt.datetime] = Field(None, description="When a worker picked it up.")
+    finished_at: Optional[dt.datetime] = Field(None, description="When the job ended.")
+
+
+class ImportPreviewRow(AppBaseModel):
+    """A row that an import would insert, with the category it would get."""
+
+    date: dt.date
+    amount: Decimal
+    entity: str
+    text: Optional[str] = None
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+
+
+class ImportPreviewAccount(AppBaseModel):
+    """Dry-run classification of one account's rows in an uploaded statement."""
+
+    account_name: str
+    account_exists: bool = Field(
+        ..., description="False if the import would create this account."
+    )
+    rows_parsed: int = Field(0, ge=0)
+    rows_new: int = Field(0, ge=0, description="Rows the import would insert.")
+    rows_duplicate: int = Field(0, ge=0, description="Rows already stored.")
+    rows_unparseable: int = Field(
+        0, ge=0, description="Rows that could not be normalized (e.g. invalid date)."
+    )
+    new_by_category: Dict[str, int] = Field(
+        default_factory=dict,
+        description="New rows per category name they would be assigned ('' = uncategorized).",
+    )
+    new_rows: List[ImportPreviewRow] = Field(
+        default_factory=list, description="The first new rows (see preview_rows)."
+    )
+
+
+class ImportPreview(AppBaseModel):
+    """Result of an import dry run; nothing is written."""
+
+    accounts: List[ImportPreviewAccount] = Field(default_factory=list)
+
+
+class FingerprintFilterStats(AppBaseModel):
+    """Counters of the in-memory fingerprint prefilter used by imports."""
+
+    enabled: bool = Field(..., description="Whether imports use the prefilter.")
+    lookups: int = Field(0, ge=0, description="Fingerprints checked against the filter.")
+    definitely_new: int = Field(
+        0, ge=0, description="Lookups answered without a database check."
+    )
+    maybe_stored: int = Field(0, ge=0, description="Lookups that needed the exact check.")
+    false_positives: int = Field(
+        0, ge=0, description="Exact checks that did not find a duplicate."
+    )
+    hit_rate: float = Field(0.0, ge=0, le=1, description="definitely_new / lookups.")
+    false_positive_rate: float = Field(
+        0.0, ge=0, le=1, description="false_positives / maybe_stored."
+    )
+    size: int = Field(0, ge=0, description="Distinct fingerprint prefixes held by the filter.")
+
+
+class LaneStats(AppBaseModel):
+    """Concurrency limit and queue of one heavy endpoint."""
+
+    name: str = Field(..., description="Endpoint lane name.")
+    limit: int = Field(..., ge=1, description="Calls allowed to run at once.")
+    running: int = Field(0, ge=0, description="Calls running now.")
+    waiting: int = Field(0, ge=0, description="Calls queued for the limit now.")
+    max_waiting: int = Field(0, ge=0, description="Largest queue seen.")
+    completed: int = Field(0, ge=0, description="Calls finished.")
+    avg_wait_ms: float = Field(0.0, ge=0, description="Mean time queued per call.")
+
+
+class ExecutorStats(AppBaseModel):
+    """Heavy-endpoint executor of this process."""
+
+    workers: int = Field(..., ge=1, description="Threads of the heavy executor.")
+    busy: int = Field(0, ge=0, description="Threads running a call.")
+    queued: int = Field(0, ge=0, description="Calls admitted but waiting for a thread.")
+    request_threadpool_size: int = Field(
+        ..., ge=1, description="Threads for the other (sync) endpoints."
+    )
+    lanes: List[LaneStats] = Field(default_factory=list)
+
+
 # ---- Budget ----------------------------------------------------------------
 
 
@@ -157,9 +268,16 @@ class CategoryCreate(AppBaseModel):
 
 
 class CategoryUpdate(AppBaseModel):
-    """Payload to rename a category."""
+    """Payload to rename and/or move a category."""
 
-    name: str = Field(..., max_length=255, description="New category name.")
+    name: Optional[str] = Field(None, max_length=255, description="New category name.")
+    parent_id: Optional[int] = Field(
+        None,
+        description=(
+            "New parent category's id; the category keeps its subtree. "
+            "Omit to keep the parent."
+        ),
+    )
 
 
 class Category(AppBaseModel):
@@ -326,12 +444,19 @@ class Transaction(AppBaseModel):
 class PaginatedTransactions(AppBaseModel):
     """Container for paginated transaction listings."""
 
-    total: int = Field(..., ge=0, description="Total number of matching transactions.")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of matching transactions (null if not counted)."
+    )
     limit: int = Field(..., gt=0, description="Page size (maximum number of items).")
-    offset: int = Field(..., ge=0, description="Zero-based index of the first item.")
+    offset: int = Field(
+        ..., ge=0, description="Zero-based index of the first item (0 for cursor pages)."
+    )
     items: List[Transaction] = Field(
         ..., description="Transactions within the current page."
     )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page; null on the last page."
+    )
 
 
 class TransactionSummary(AppBaseModel):
@@ -345,7 +470,11 @@ class TransactionSummary(AppBaseModel):
         ...,
         description="Sum of amounts in this group (negative = net outflow, positive = net inflow).",
     )
+    count: int = Field(..., ge=0, description="Number of transactions in this group.")
     transactions: List["Transaction"] = Field(
         default_factory=list,
-        description="All transactions that contributed to this group's amount.",
+        description=(
+            "A page of the group's transactions, newest first; only returned "
+            "when requested with `items`."
+        ),
     )
@@ -2,15 +2,14 @@ from __future__ import annotations
 
 import datetime as dt
 from enum import Enum
-from decimal import Decimal
 from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
 from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
-from ..models import Account as AccountORM
+from ..models import Account as AccountORM, cents_to_storage, storage_to_cents
 from ..schemas import BalancePoint, SurplusPoint
-from ..utils import BadRequest, NotFound
+from ..utils import BadRequest, NotFound, from_cents, to_cents
 
 DEFAULT_LOOKBACK_DAYS = 90
 FISCAL_MONTH_START_DAY = 15  # configurable anchor for fiscal months
@@ -37,7 +36,7 @@ def get_balance_series_db(
 
     rows = _load_rows(db, account_id, start_date, end_date)
     points: List[BalancePoint] = [
-        BalancePoint(date=date, balance=balance)
+        BalancePoint(date=date, balance=from_cents(balance))
         for date, balance in _collapse_balance(rows, granularity)
     ]
     return points
@@ -56,7 +55,7 @@ def get_surplus_series_db(
 
     rows = _load_rows(db, account_id, start_date, end_date)
     points: List[SurplusPoint] = [
-        SurplusPoint(date=date, delta=delta)
+        SurplusPoint(date=date, delta=from_cents(delta))
         for date, delta in _collapse_surplus(rows, granularity)
     ]
     return points
@@ -68,9 +67,11 @@ def get_surplus_series_db(
 
 
 class _DailyRow:
+    """One day of the series; amounts are integer cents."""
+
     __slots__ = ("date", "delta", "closing_balance")
 
-    def __init__(self, *, date: dt.date, delta: Decimal, closing_balance: Decimal) -> None:
+    def __init__(self, *, date: dt.date, delta: int, closing_balance: int) -> None:
         self.date = date
         self.delta = delta
         self.closing_balance = closing_balance
@@ -87,7 +88,7 @@ def _load_rows(
         return _fetch_daily_rows_for_account(
             db,
             account_id=account.public_id,
-            balance=account.balance,
+            balance=to_cents(account.balance),
             start_date=start_date,
             end_date=end_date,
         )
@@ -102,7 +103,7 @@ def _fetch_daily_rows_for_account(
     db: Session,
     *,
     account_id: str,
-    balance: Decimal,
+    balance: int,
     start_date: dt.date,
     end_date: dt.date,
 ) -> List[_DailyRow]:
@@ -151,7 +152,7 @@ def _fetch_daily_rows_for_account(
         query,
         {
             "account_id": account_id,
-            "balance": str(balance),
+            "balance": cents_to_storage(balance),
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
         },
@@ -160,8 +161,8 @@ def _fetch_daily_rows_for_account(
     return [
         _DailyRow(
             date=_ensure_date(r["date"]),
-            delta=_to_decimal(r["delta"]),
-            closing_balance=_to_decimal(r["closing_balance"]),
+            delta=storage_to_cents(r["delta"]),
+            closing_balance=storage_to_cents(r["closing_balance"]),
         )
         for r in rows
     ]
@@ -230,8 +231,8 @@ def _fetch_daily_rows_combined(
     return [
         _DailyRow(
             date=_ensure_date(r["date"]),
-            delta=_to_decimal(r["delta"]),
-            closing_balance=_to_decimal(r["closing_balance"]),
+            delta=storage_to_cents(r["delta"]),
+            closing_balance=storage_to_cents(r["closing_balance"]),
         )
         for r in rows
     ]
@@ -244,7 +245,7 @@ def _fetch_daily_rows_combined(
 
 def _collapse_balance(
     rows: Sequence[_DailyRow], granularity: Granularity
-) -> Iterable[Tuple[dt.date, Decimal]]:
+) -> Iterable[Tuple[dt.date, int]]:
     if granularity is Granularity.daily:
         for row in rows:
             yield row.date, row.closing_balance
@@ -266,14 +267,14 @@ def _collapse_balance(
 
 def _collapse_surplus(
     rows: Sequence[_DailyRow], granularity: Granularity
-) -> Iterable[Tuple[dt.date, Decimal]]:
+) -> Iterable[Tuple[dt.date, int]]:
     if granularity is Granularity.daily:
         for row in rows:
             yield row.date, row.delta
         return
 
     current_bucket = None
-    bucket_delta = Decimal("0")
+    bucket_delta = 0
     last_date: Optional[dt.date] = None
     for row in rows:
         bucket = _bucket_id(row.date, granularity)
@@ -282,7 +283,7 @@ def _collapse_surplus(
         elif bucket != current_bucket and last_date is not None:
             yield last_date, bucket_delta
             current_bucket = bucket
-            bucket_delta = Decimal("0")
+            bucket_delta = 0
         bucket_delta += row.delta
         last_date = row.date
     if last_date is not None:
@@ -368,17 +369,3 @@ def _ensure_date(value) -> dt.date:
         return dt.date.fromisoformat(value)
     raise TypeError(f"Unsupported date value: {value!r}")
 
-
-TWOPLACES = Decimal("0.01")
-
-
-def _to_decimal(value) -> Decimal:
-    if isinstance(value, Decimal):
-        quantized = value.quantize(TWOPLACES)
-    else:
-        if value is None:
-            quantized = Decimal("0")
-        else:
-            quantized = Decimal(str(value))
-        quantized = quantized.quantize(TWOPLACES)
-    return quantized
@@ -3,23 +3,48 @@
 from __future__ import annotations
 
 import datetime as dt
+import multiprocessing
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from hashlib import sha256
-from typing import Dict, List, BinaryIO
+from itertools import islice, repeat
+from typing import Callable, Dict, Iterable, Iterator, List, BinaryIO, Optional, Sequence, Set, Tuple
 
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from ..schemas import AccountCreate, TransactionCreate
+from ..schemas import (
+    Account,
+    AccountCreate,
+    ImportPreview,
+    ImportPreviewAccount,
+    ImportPreviewRow,
+    TransactionCreate,
+)
 from ..services.accounts import (
     create_account_db,
     update_account_db,
     get_account_by_iban_hmac_db,
 )
-from ..services.transactions import create_transaction_db
-from ..settings import IBAN_HMAC_KEY
-from ..utils import hmac_iban, ExternalServiceError, Conflict, NotFound
+from ..services.category_rules import RulesIndex
+from ..services.import_ledger import (
+    FileDigest,
+    digest_file,
+    find_imported_db,
+    finish_import_db,
+    start_import_db,
+)
+from ..services.transactions import (
+    classify_transactions_db,
+    create_transactions_bulk_db,
+    high_water_mark_db,
+)
+from ..settings import IBAN_HMAC_KEY, INCREMENTAL_IMPORT
+from ..utils import hmac_iban, ExternalServiceError, NotFound
 from .bank_models import BankAccount, BankTransaction
-from .csv_parsers import parse_csv_file
+from .csv_parsers import ParsedBankData, StreamedBankData, iter_csv_file, parse_csv_file
 
 
 def _parse_date(value) -> dt.date:
@@ -42,6 +67,223 @@ def _parse_date(value) -> dt.date:
 # ----- CSV Import Functions ---------------------------------------------------
 
 
+def _upsert_account(db: Session, account: BankAccount) -> Account:
+    """Create the bank account, or update name/holder/balance if its IBAN is known."""
+    balance_value = account.amount if account.amount is not None else 0
+    payload = AccountCreate(
+        name=account.name,
+        holder_name=account.holder_name,
+        iban_plain=account.iban,
+        balance=balance_value,
+    )
+
+    iban_h = hmac_iban(IBAN_HMAC_KEY, account.iban)
+    try:
+        # Account exists → update balance
+        existing_account = get_account_by_iban_hmac_db(db, iban_hmac=iban_h)
+        return update_account_db(
+            db, public_id=existing_account.public_id, payload=payload
+        )
+    except NotFound:
+        # Account doesn't exist → create new
+        return create_account_db(db, payload)
+
+
+def _to_payloads(
+    transactions: Iterable[BankTransaction],
+    account_id: str,
+    batch_hash: str,
+    *,
+    first_row: int = 1,
+    errors: Optional[List[Tuple[int, str]]] = None,
+) -> Tuple[List[TransactionCreate], List[int]]:
+    """Build TransactionCreate payloads and their row numbers (counted from
+    `first_row`). Rows that cannot be normalized are skipped and, if `errors`
+    is given, reported there as (row number, reason)."""
+    payloads: List[TransactionCreate] = []
+    row_numbers: List[int] = []
+    for row, t in enumerate(transactions, start=first_row):
+        try:
+            payload = TransactionCreate(
+                text=t.text,
+                entity=t.peer,
+                account_id=account_id,
+                amount=t.amount,
+                date=_parse_date(t.date),
+                reference=t.customerreference,
+                batch_hash=batch_hash,
+            )
+        except (ExternalServiceError, ValidationError) as e:
+            if errors is not None:
+                errors.append((row, _error_reason(e)))
+            continue
+        payloads.append(payload)
+        row_numbers.append(row)
+    return payloads, row_numbers
+
+
+def _error_reason(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        err = e.errors()[0]
+        field = ".".join(str(part) for part in err["loc"])
+        return f"{field}: {err['msg']}" if field else err["msg"]
+    return str(e)
+
+
+# Row errors kept per import run (all of them are counted in `failed`)
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    """A row that could not be imported; `row` counts the account's transactions from 1."""
+
+    account: str
+    row: int
+    reason: str
+
+
+@dataclass
+class ImportStats:
+    """Running row counters of an import run."""
+
+    parsed: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    # files answered from the import ledger without being parsed
+    skipped_files: int = 0
+    errors: List[ImportRowError] = field(default_factory=list)
+
+    def add_errors(self, account: str, errors: Iterable[Tuple[int, str]]) -> None:
+        for row, reason in errors:
+            self.failed += 1
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(ImportRowError(account=account, row=row, reason=reason))
+
+
+def import_bank_stream(
+    db: Session,
+    streamed_accounts: Iterable[StreamedBankData],
+    *,
+    batch_size: Optional[int] = None,
+    stats: Optional[ImportStats] = None,
+    on_batch: Optional[Callable[[ImportStats], None]] = None,
+    batch_hash: Optional[str] = None,
+    skip_rows: int = 0,
+    incremental: Optional[bool] = None,
+) -> Dict[str, int]:
+    """Import accounts whose transactions arrive as (possibly lazy) iterators.
+
+    Transactions are consumed in chunks of `batch_size` rows; each chunk is
+    de-duplicated and inserted in bulk and then committed, so memory stays
+    bounded and an interrupted import keeps its finished chunks. With
+    `batch_size=None` everything is inserted in one chunk and nothing is
+    committed here (the caller owns the transaction).
+
+    Rows that cannot be normalized or are rejected by the database are
+    skipped and reported in `stats.errors`; each chunk is written inside a
+    SAVEPOINT, so a bad row never rolls back the rest of the import.
+
+    `stats` is updated after every chunk, and `on_batch(stats)` is then
+    called before the chunk is committed (it may write progress in the same
+    transaction, or raise to abort the import).
+
+    `batch_hash` identifies the import run for de-duplication; a fresh one
+    is derived when omitted. The first `skip_rows` transactions of the stream
+    (over all accounts, in order) are passed over: rows an interrupted run of
+    the same batch has already committed. Accounts are still updated.
+
+    With `incremental` (default: INCREMENTAL_IMPORT), each account's
+    high-water mark (its newest stored booking day and that day's
+    fingerprints) decides rows on or after that day in memory. Once the
+    stream has repeated a stored row of that day, i.e. the export overlaps
+    what was imported before, rows dated before it are counted as duplicates
+    without being hashed or looked up; exports that do not reach the mark
+    are de-duplicated row by row.
+
+    Returns:
+        Dict mapping account names to number of inserted transactions
+    """
+    # One batch hash for this whole import run (64-char hex; matches DB size)
+    if batch_hash is None:
+        batch_hash = sha256(str(dt.datetime.now().isoformat()).encode("utf-8")).hexdigest()
+
+    if incremental is None:
+        incremental = INCREMENTAL_IMPORT
+
+    # Rules are loaded once for the whole run instead of once per row
+    rules_index = RulesIndex(db)
+
+    stats = stats if stats is not None else ImportStats()
+    inserted_counts: Dict[str, int] = defaultdict(int)
+    for streamed in streamed_accounts:
+        account = streamed.account
+        if not account.iban:
+            # Skip accounts without IBAN
+            continue
+
+        # Create or update account
+        new_or_updated_account = _upsert_account(db, account)
+        mark = (
+            high_water_mark_db(db, new_or_updated_account.public_id, batch_hash)
+            if incremental
+            else None
+        )
+        overlaps_mark = False
+
+        transactions = iter(streamed.transactions)
+        next_row = 1
+        if skip_rows:
+            skipped = sum(1 for _ in islice(transactions, skip_rows))
+            skip_rows -= skipped
+            next_row += skipped
+        while True:
+            chunk = list(islice(transactions, batch_size))
+            if not chunk:
+                break
+            row_errors: List[Tuple[int, str]] = []
+            payloads, row_numbers = _to_payloads(
+                chunk,
+                new_or_updated_account.public_id,
+                batch_hash,
+                first_row=next_row,
+                errors=row_errors,
+            )
+            next_row += len(chunk)
+            n_valid = len(payloads)
+            if overlaps_mark:
+                # Older than the last imported day of an overlapping export
+                kept = [i for i, p in enumerate(payloads) if p.date >= mark.date]
+                payloads = [payloads[i] for i in kept]
+                row_numbers = [row_numbers[i] for i in kept]
+
+            # Insert transactions in bulk; cross-batch duplicates are skipped
+            rejected: List[Tuple[int, str]] = []
+            inserted = create_transactions_bulk_db(
+                db, payloads, rules_index=rules_index, errors=rejected, high_water=mark
+            )
+            row_errors.extend((row_numbers[i], reason) for i, reason in rejected)
+            if mark is not None and not overlaps_mark:
+                overlaps_mark = any(mark.matches(p) for p in payloads)
+            n_inserted = sum(inserted)
+            if n_inserted:
+                inserted_counts[account.name] += n_inserted
+
+            stats.parsed += len(chunk)
+            stats.add_errors(account.name, sorted(row_errors))
+            stats.inserted += n_inserted
+            stats.duplicates += n_valid - len(rejected) - n_inserted
+            if on_batch is not None:
+                on_batch(stats)
+
+            if batch_size is None:
+                break
+            db.commit()
+
+    return dict(inserted_counts)
+
+
 def import_bank_payload(
     db: Session,
     accounts: List[BankAccount],
@@ -65,105 +307,336 @@ def import_bank_payload(
             "Mismatched number of accounts and transaction lists"
         )
 
-    # One batch hash for this whole import run (64-char hex; matches DB size)
-    batch_hash = sha256(str(dt.datetime.now().isoformat()).encode("utf-8")).hexdigest()
-
-    inserted_counts: Dict[str, int] = defaultdict(int)
-    for account, transactions in zip(accounts, account_transactions):
-        if not account.iban:
-            # Skip accounts without IBAN
-            continue
-
-        # Create or update account
-        balance_value = account.amount if account.amount is not None else 0
-
-        iban_h = hmac_iban(IBAN_HMAC_KEY, account.iban)
-        try:
-            # Account exists → update balance
-            existing_account = get_account_by_iban_hmac_db(db, iban_hmac=iban_h)
-            new_or_updated_account = update_account_db(
-                db,
-                public_id=existing_account.public_id,
-                payload=AccountCreate(
-                    name=account.name,
-                    holder_name=account.holder_name,
-                    iban_plain=account.iban,
-                    balance=balance_value,
-                ),
-            )
-        except NotFound:
-            # Account doesn't exist → create new
-            new_or_updated_account = create_account_db(
-                db,
-                AccountCreate(
-                    name=account.name,
-                    holder_name=account.holder_name,
-                    iban_plain=account.iban,
-                    balance=balance_value,
-                ),
-            )
+    return import_bank_stream(
+        db,
+        [
+            StreamedBankData(account=account, transactions=iter(transactions))
+            for account, transactions in zip(accounts, account_transactions)
+        ],
+    )
 
-        # Insert transactions
-        for t in transactions:
-            try:
-                payload = TransactionCreate(
-                    text=t.text,
-                    entity=t.peer,
-                    account_id=new_or_updated_account.public_id,
-                    amount=t.amount,
-                    date=_parse_date(t.date),
-                    reference=t.customerreference,
-                    batch_hash=batch_hash,
-                )
-                create_transaction_db(db, payload)
-                inserted_counts[account.name] += 1
-            except Conflict:
-                # Cross-batch duplicate → skip silently
-                continue
-            except ExternalServiceError:
-                # Parse error on date or similar normalization issue
-                continue
 
-    return dict(inserted_counts)
+def _import_file(
+    db: Session,
+    digest: FileDigest,
+    streamed_accounts: Iterable[StreamedBankData],
+    *,
+    batch_size: Optional[int],
+    stats: ImportStats,
+    on_batch: Optional[Callable[[ImportStats], None]] = None,
+) -> Dict[str, int]:
+    """Import one file as the batch named by its content hash and record it in
+    the import ledger; an earlier, interrupted import of it is resumed."""
+    entry = start_import_db(db, digest)
+    rows_done, rows_inserted = entry.rows_done, entry.rows_inserted
+    parsed_before, inserted_before = stats.parsed, stats.inserted
 
+    def progress(stats: ImportStats) -> None:
+        # Written in the same transaction as the batch's rows
+        entry.rows_done = rows_done + stats.parsed - parsed_before
+        entry.rows_inserted = rows_inserted + stats.inserted - inserted_before
+        if on_batch is not None:
+            on_batch(stats)
 
+    counts = import_bank_stream(
+        db,
+        streamed_accounts,
+        batch_size=batch_size,
+        stats=stats,
+        on_batch=progress,
+        batch_hash=digest.content_hash,
+        skip_rows=rows_done,
+    )
+    finish_import_db(db, entry)
+    return counts
 
 
 def import_csv_data(
     db: Session,
     file_obj: BinaryIO, 
     parser_type: str,
-    holder_name: str
+    holder_name: str,
+    batch_size: Optional[int] = None,
+    stats: Optional[ImportStats] = None,
+    on_batch: Optional[Callable[[ImportStats], None]] = None,
 ) -> Dict[str, int]:
     """Import transactions from a CSV file using the specified parser.
     
     This function integrates CSV parsing with the existing duplicate detection
     and import pipeline, reusing the same logic as get_new_transactions().
+    The file is parsed incrementally and never held in memory as a whole.
+    
+    The file's content hash is its batch hash. A file that is identical to,
+    or a strict prefix of, a completed import is answered from the import
+    ledger without being parsed (`stats.skipped_files`); re-importing a file
+    whose import was interrupted resumes after its committed rows.
     
     Args:
         db: Database session
-        file_obj: File object containing CSV data
+        file_obj: Seekable binary file object containing CSV data
         parser_type: Parser identifier (e.g., 'dkb')
         holder_name: Account holder name
+        batch_size: Commit every this many rows (None: single transaction)
+        stats: Optional counters updated while importing
+        on_batch: Optional progress hook, see import_bank_stream
         
     Returns:
         Dict mapping account names to number of inserted transactions
         
     Raises:
         ExternalServiceError: If parsing fails or CSV format is invalid
+        Conflict: If the same file is being imported concurrently
     """
+    stats = stats if stats is not None else ImportStats()
+    digest = digest_file(file_obj)
+    if find_imported_db(db, digest) is not None:
+        stats.skipped_files += 1
+        return {}
+
     try:
-        # Parse CSV file into BankAccount and BankTransaction objects
-        parsed_data = parse_csv_file(file_obj, parser_type, holder_name)
+        # Parse CSV file into BankAccount and lazily decoded BankTransactions
+        streamed_accounts = iter_csv_file(file_obj, parser_type, holder_name)
         
         # Use existing import pipeline - this handles all duplicate detection,
         # account creation/update, and transaction insertion
-        return import_bank_payload(
-            db=db,
-            accounts=parsed_data.accounts,
-            account_transactions=parsed_data.transactions_per_account
+        return _import_file(
+            db,
+            digest,
+            streamed_accounts,
+            batch_size=batch_size,
+            stats=stats,
+            on_batch=on_batch,
         )
         
     except ValueError as e:
         # Parser errors become ExternalServiceError for consistent error handling
         raise ExternalServiceError(f"CSV parsing error: {str(e)}") from e
+
+
+# ----- Dry run -----------------------------------------------------------------
+
+# New rows listed per account in a preview (counts always cover all rows)
+PREVIEW_ROWS = 100
+
+
+def preview_bank_stream(
+    db: Session,
+    streamed_accounts: Iterable[StreamedBankData],
+    *,
+    batch_size: Optional[int] = None,
+    preview_rows: int = PREVIEW_ROWS,
+    incremental: Optional[bool] = None,
+) -> ImportPreview:
+    """Classify rows as an import would, without writing anything.
+    
+    Accounts are looked up but not created or updated; each chunk of
+    `batch_size` rows costs one indexed fingerprint lookup, and new rows are
+    categorized from a single RulesIndex. `incremental` (default:
+    INCREMENTAL_IMPORT) applies the same high-water mark rule as
+    `import_bank_stream`.
+    """
+    if incremental is None:
+        incremental = INCREMENTAL_IMPORT
+    # A batch hash no stored row has, exactly like a fresh import run
+    batch_hash = sha256(f"preview|{dt.datetime.now().isoformat()}".encode("utf-8")).hexdigest()
+    rules_index = RulesIndex(db)
+
+    previews: List[ImportPreviewAccount] = []
+    for streamed in streamed_accounts:
+        account = streamed.account
+        if not account.iban:
+            continue
+        try:
+            account_id = get_account_by_iban_hmac_db(
+                db, iban_hmac=hmac_iban(IBAN_HMAC_KEY, account.iban)
+            ).public_id
+            account_exists = True
+        except NotFound:
+            account_id, account_exists = "", False
+        mark = (
+            high_water_mark_db(db, account_id, batch_hash)
+            if incremental and account_exists
+            else None
+        )
+        overlaps_mark = False
+
+        parsed = new = unparseable = 0
+        by_category: Dict[str, int] = defaultdict(int)
+        new_rows: List[ImportPreviewRow] = []
+        transactions = iter(streamed.transactions)
+        while True:
+            chunk = list(islice(transactions, batch_size))
+            if not chunk:
+                break
+            payloads, _ = _to_payloads(chunk, account_id, batch_hash)
+            parsed += len(chunk)
+            unparseable += len(chunk) - len(payloads)
+            if overlaps_mark:
+                payloads = [p for p in payloads if p.date >= mark.date]
+            # Fingerprints include the account, so a new account has no duplicates
+            flags = (
+                classify_transactions_db(db, payloads, high_water=mark)
+                if account_exists
+                else [True] * len(payloads)
+            )
+            if mark is not None and not overlaps_mark:
+                overlaps_mark = any(mark.matches(p) for p in payloads)
+            for p, is_new in zip(payloads, flags):
+                if not is_new:
+                    continue
+                new += 1
+                match = rules_index.resolve(entity=p.entity, text=p.text)
+                by_category[match.category_name if match else ""] += 1
+                if len(new_rows) < preview_rows:
+                    new_rows.append(
+                        ImportPreviewRow(
+                            date=p.date,
+                            amount=p.amount,
+                            entity=p.entity,
+                            text=p.text,
+                            category_id=match.category_id if match else None,
+                            category_name=match.category_name if match else None,
+                        )
+                    )
+            if batch_size is None:
+                break
+
+        previews.append(
+            ImportPreviewAccount(
+                account_name=account.name,
+                account_exists=account_exists,
+                rows_parsed=parsed,
+                rows_new=new,
+                rows_duplicate=parsed - unparseable - new,
+                rows_unparseable=unparseable,
+                new_by_category=dict(by_category),
+                new_rows=new_rows,
+            )
+        )
+
+    return ImportPreview(accounts=previews)
+
+
+def preview_csv_data(
+    db: Session,
+    file_obj: BinaryIO,
+    parser_type: str,
+    holder_name: str,
+    batch_size: Optional[int] = None,
+    preview_rows: int = PREVIEW_ROWS,
+) -> ImportPreview:
+    """Dry run of `import_csv_data`: classify the file's rows per account as
+    new, duplicate or unparseable, without writing.
+    
+    Raises:
+        ExternalServiceError: If parsing fails or CSV format is invalid
+    """
+    try:
+        streamed_accounts = iter_csv_file(file_obj, parser_type, holder_name)
+        return preview_bank_stream(
+            db, streamed_accounts, batch_size=batch_size, preview_rows=preview_rows
+        )
+    except ValueError as e:
+        raise ExternalServiceError(f"CSV parsing error: {str(e)}") from e
+
+
+def _parse_csv_path(path: str, parser_type: Optional[str], holder_name: str) -> ParsedBankData:
+    """Parse one statement file (runs in a worker process)."""
+    with open(path, "rb") as fh:
+        return parse_csv_file(fh, parser_type, holder_name)
+
+
+def import_csv_files(
+    db: Session,
+    paths: Sequence[str],
+    parser_type: Optional[str],
+    holder_name: str,
+    *,
+    max_workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    stats: Optional[ImportStats] = None,
+) -> Dict[str, int]:
+    """Import several CSV statement files, parsing them in parallel.
+    
+    Parsing (csv decoding, date and amount conversion) is pure CPU work, so
+    the files are fanned out to a process pool. The parsed results are
+    consumed in the given order by this process, which is the only writer:
+    each file is imported as its own batch, exactly as if the files had been
+    uploaded one after another (rows repeated across overlapping exports are
+    skipped as duplicates, account balances end up from the last file).
+    Files the import ledger already knows (see `import_csv_data`) are
+    skipped before parsing.
+    
+    Args:
+        db: Database session
+        paths: Statement files, oldest first
+        parser_type: Parser identifier, or None to auto-detect per file
+        holder_name: Account holder name
+        max_workers: Parser processes (default: CPU count, at most one per file)
+        batch_size: Commit every this many rows (None: single transaction)
+        stats: Optional counters (and row errors) accumulated over all files
+        
+    Returns:
+        Dict mapping account names to number of inserted transactions
+        
+    Raises:
+        ExternalServiceError: If any file cannot be parsed
+    """
+    stats = stats if stats is not None else ImportStats()
+    pending: List[Tuple[str, FileDigest]] = []
+    seen: Set[str] = set()
+    for path in paths:
+        with open(path, "rb") as fh:
+            digest = digest_file(fh)
+        if digest.content_hash in seen or find_imported_db(db, digest) is not None:
+            stats.skipped_files += 1
+            continue
+        seen.add(digest.content_hash)
+        pending.append((path, digest))
+    if not pending:
+        return {}
+    paths = [path for path, _ in pending]
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+
+    def parse_all() -> Iterator[ParsedBankData]:
+        if workers == 1:
+            for path in paths:
+                yield _parse_csv_path(path, parser_type, holder_name)
+            return
+        # spawn: forking a multi-threaded server process can deadlock the child
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            yield from pool.map(
+                _parse_csv_path,
+                paths,
+                repeat(parser_type),
+                repeat(holder_name),
+            )
+
+    inserted_counts: Dict[str, int] = defaultdict(int)
+    parsed_files = parse_all()
+    for path, digest in pending:
+        try:
+            parsed = next(parsed_files)
+        except ValueError as e:
+            raise ExternalServiceError(f"CSV parsing error in {path}: {str(e)}") from e
+        except ExternalServiceError as e:
+            raise ExternalServiceError(f"{path}: {str(e)}") from e
+
+        counts = _import_file(
+            db,
+            digest,
+            [
+                StreamedBankData(account=account, transactions=iter(transactions))
+                for account, transactions in zip(
+                    parsed.accounts, parsed.transactions_per_account
+                )
+            ],
+            batch_size=batch_size,
+            stats=stats,
+        )
+        for name, n in counts.items():
+            inserted_counts[name] += n
+
+    return dict(inserted_counts)
@@ -20,15 +20,16 @@ Savings is NOT a category: it is the synthetic delta `income - expenses`.
 from __future__ import annotations
 
 import datetime as dt
-from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
-from sqlalchemy import case, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, and_, case, func, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
 
 from ..models import (
     Account as AccountORM,
     Category as CategoryORM,
+    CategoryClosure as CategoryClosureORM,
     Transaction as TransactionORM,
 )
 from ..schemas import (
@@ -39,10 +40,9 @@ from ..schemas import (
     SankeyResponse,
     SankeyTotals,
 )
-from ..utils import BadRequest, NotFound
+from ..utils import BadRequest, NotFound, from_cents, to_cents
 from .categories import ROOT_CATEGORY_NAMES
 
-ZERO = Decimal("0")
 INCOME_ROOT, EXPENSE_ROOT = ROOT_CATEGORY_NAMES  # ("Einnahmen", "Ausgaben")
 
 
@@ -86,43 +86,40 @@ def _tx_conditions(
     return conds
 
 
-def _load_category_tree(
-    db: Session,
-) -> Tuple[Dict[int, Optional[int]], Dict[int, str], Dict[int, List[int]]]:
-    rows = db.execute(
-        select(CategoryORM.id, CategoryORM.parent_id, CategoryORM.name)
+def _category_nodes(db: Session) -> List[Row]:
+    """Every category as (id, parent_id, name, root_id, depth, top_id), in id
+    order: the root above it and its distance to it (roots have depth 0), and
+    its ancestor at depth 1 (itself at depth 1, None for a root).
+
+    Read from the category closure, without walking parents.
+    """
+    to_root = aliased(CategoryClosureORM)
+    to_top = aliased(CategoryClosureORM)
+    root = aliased(CategoryORM)
+    return db.execute(
+        select(
+            CategoryORM.id,
+            CategoryORM.parent_id,
+            CategoryORM.name,
+            to_root.ancestor_id,
+            to_root.depth,
+            to_top.ancestor_id,
+        )
+        .join(to_root, to_root.descendant_id == CategoryORM.id)
+        .join(root, and_(root.id == to_root.ancestor_id, root.parent_id.is_(None)))
+        .outerjoin(
+            to_top,
+            and_(to_top.descendant_id == CategoryORM.id, to_top.depth == to_root.depth - 1),
+        )
+        .order_by(CategoryORM.id)
     ).all()
-    parent_by_id: Dict[int, Optional[int]] = {}
-    name_by_id: Dict[int, str] = {}
-    children_by_id: Dict[int, List[int]] = {}
-    for cid, parent_id, name in rows:
-        parent_by_id[cid] = parent_id
-        name_by_id[cid] = name
-        children_by_id.setdefault(cid, [])
-        if parent_id is not None:
-            children_by_id.setdefault(parent_id, []).append(cid)
-    return parent_by_id, name_by_id, children_by_id
-
-
-def _root_and_depth(cid: int, parent_by_id: Dict[int, Optional[int]]) -> Tuple[int, int]:
-    """Return (root_id, depth) where the root has depth 0 and its direct child depth 1."""
-    depth = 0
-    cur = cid
-    while parent_by_id.get(cur) is not None:
-        cur = parent_by_id[cur]
-        depth += 1
-    return cur, depth
-
-
-def _subtree_ids(start: int, children_by_id: Dict[int, List[int]]) -> List[int]:
-    """All category ids in the subtree rooted at `start` (inclusive)."""
-    out: List[int] = []
-    stack = [start]
-    while stack:
-        node = stack.pop()
-        out.append(node)
-        stack.extend(children_by_id.get(node, []))
-    return out
+
+
+def _subtree_ids(start: int) -> Select:
+    """Ids of the categories in the subtree rooted at `start` (inclusive)."""
+    return select(CategoryClosureORM.descendant_id).where(
+        CategoryClosureORM.ancestor_id == start
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -144,26 +141,37 @@ def build_sankey_db(
     account = _resolve_account(db, account_id)
     conds = _tx_conditions(account_id=account, date_from=start, date_to=end)
 
-    parent_by_id, name_by_id, children_by_id = _load_category_tree(db)
+    categories = _category_nodes(db)
 
     # Locate the two protected roots.
     root_id_by_name = {
-        name_by_id[cid]: cid
-        for cid, pid in parent_by_id.items()
-        if pid is None and name_by_id[cid] in (INCOME_ROOT, EXPENSE_ROOT)
+        name: cid
+        for cid, pid, name, *_ in categories
+        if pid is None and name in (INCOME_ROOT, EXPENSE_ROOT)
     }
     income_root = root_id_by_name.get(INCOME_ROOT)
     expense_root = root_id_by_name.get(EXPENSE_ROOT)
 
-    # Per-category direct sums (categorized only).
-    direct: Dict[int, Decimal] = {}
-    cat_rows = db.execute(
-        select(TransactionORM.category_id, func.sum(TransactionORM.amount))
+    # Subtree sums: per-category direct sums (categorized only), added up
+    # for every ancestor through the closure.
+    # Amounts are aggregated as integer cents and converted when building the response.
+    direct = (
+        select(
+            TransactionORM.category_id,
+            func.sum(TransactionORM.amount).label("amount_sum"),
+        )
         .where(TransactionORM.category_id.is_not(None), *conds)
         .group_by(TransactionORM.category_id)
-    ).all()
-    for cid, total in cat_rows:
-        direct[cid] = Decimal(total or 0)
+        .subquery()
+    )
+    subtree: Dict[int, int] = {
+        cid: to_cents(total)
+        for cid, total in db.execute(
+            select(CategoryClosureORM.ancestor_id, func.sum(direct.c.amount_sum))
+            .join(direct, direct.c.category_id == CategoryClosureORM.descendant_id)
+            .group_by(CategoryClosureORM.ancestor_id)
+        ).all()
+    }
 
     # Uncategorized split by sign.
     unc_pos, unc_neg = db.execute(
@@ -178,65 +186,42 @@ def build_sankey_db(
             ),
         ).where(TransactionORM.category_id.is_(None), *conds)
     ).one()
-    unc_pos = Decimal(unc_pos or 0)
-    unc_neg = Decimal(unc_neg or 0)
-
-    # Subtree sums (post-order, memoized).
-    subtree: Dict[int, Decimal] = {}
-
-    def calc(cid: int) -> Decimal:
-        if cid in subtree:
-            return subtree[cid]
-        total = direct.get(cid, ZERO)
-        for child in children_by_id.get(cid, []):
-            total += calc(child)
-        subtree[cid] = total
-        return total
-
-    for cid in parent_by_id:
-        calc(cid)
+    unc_pos = to_cents(unc_pos)
+    unc_neg = to_cents(unc_neg)
 
     # Totals.
-    income_total = (subtree.get(income_root, ZERO) if income_root else ZERO) + unc_pos
-    expense_total = abs(subtree.get(expense_root, ZERO) if expense_root else ZERO) + abs(unc_neg)
+    income_total = (subtree.get(income_root, 0) if income_root else 0) + unc_pos
+    expense_total = abs(subtree.get(expense_root, 0) if expense_root else 0) + abs(unc_neg)
     savings = income_total - expense_total
 
     nodes: List[SankeyNode] = []
     links: List[SankeyLink] = []
 
-    def group_of(cid: int, depth: int) -> str:
-        cur = cid
-        d = depth
-        while d > 1:
-            cur = parent_by_id[cur]
-            d -= 1
-        return f"cat:{cur}"
-
     # Category nodes + links (skip empty subtrees and the roots themselves).
-    for cid in parent_by_id:
+    for cid, parent_id, name, root, depth, top in categories:
         if cid in (income_root, expense_root):
             continue
-        value = abs(subtree.get(cid, ZERO))
+        value = abs(subtree.get(cid, 0))
         if value == 0:
             continue
-        root, depth = _root_and_depth(cid, parent_by_id)
+        value = from_cents(value)
         if root == income_root:
             side = "income"
-            parent_node = "income" if depth == 1 else f"cat:{parent_by_id[cid]}"
+            parent_node = "income" if depth == 1 else f"cat:{parent_id}"
             links.append(SankeyLink(source=f"cat:{cid}", target=parent_node, value=value))
         elif root == expense_root:
             side = "expense"
-            parent_node = "expenses" if depth == 1 else f"cat:{parent_by_id[cid]}"
+            parent_node = "expenses" if depth == 1 else f"cat:{parent_id}"
             links.append(SankeyLink(source=parent_node, target=f"cat:{cid}", value=value))
         else:
             continue  # category not under a known root
         nodes.append(
             SankeyNode(
                 id=f"cat:{cid}",
-                label=name_by_id[cid],
+                label=name,
                 side=side,
                 depth=depth,
-                group=group_of(cid, depth),
+                group=f"cat:{top}",
             )
         )
 
@@ -247,20 +232,20 @@ def build_sankey_db(
         nodes.append(SankeyNode(id="expenses", label="Expenses", side="expense", depth=0, group=None))
 
     if income_total > 0 and expense_total > 0:
-        links.append(SankeyLink(source="income", target="expenses", value=expense_total))
+        links.append(SankeyLink(source="income", target="expenses", value=from_cents(expense_total)))
 
     # Savings only when income covers expenses (deficit handling deferred).
     if savings > 0:
         nodes.append(SankeyNode(id="savings", label="Savings", side="income", depth=0, group=None))
-        links.append(SankeyLink(source="income", target="savings", value=savings))
+        links.append(SankeyLink(source="income", target="savings", value=from_cents(savings)))
 
     # Uncategorized buckets.
     if unc_pos > 0:
         nodes.append(SankeyNode(id="other_in", label="Other income", side="income", depth=1, group=None))
-        links.append(SankeyLink(source="other_in", target="income", value=unc_pos))
+        links.append(SankeyLink(source="other_in", target="income", value=from_cents(unc_pos)))
     if unc_neg < 0:
         nodes.append(SankeyNode(id="other_out", label="Other", side="expense", depth=1, group=None))
-        links.append(SankeyLink(source="expenses", target="other_out", value=abs(unc_neg)))
+        links.append(SankeyLink(source="expenses", target="other_out", value=from_cents(abs(unc_neg))))
 
     # months_with_data
     month_expr = func.strftime("%Y-%m", TransactionORM.date)
@@ -271,7 +256,11 @@ def build_sankey_db(
     return SankeyResponse(
         nodes=nodes,
         links=links,
-        totals=SankeyTotals(income=income_total, expenses=expense_total, savings=savings),
+        totals=SankeyTotals(
+            income=from_cents(income_total),
+            expenses=from_cents(expense_total),
+            savings=from_cents(savings),
+        ),
         meta=SankeyMeta(months_with_data=months_with_data),
     )
 
@@ -304,8 +293,7 @@ def category_series_db(
             raise BadRequest("category_id must be an integer or 'uncategorized'.") from exc
         if db.get(CategoryORM, cid) is None:
             raise NotFound(f"Category with id {cid} was not found.")
-        _, _, children_by_id = _load_category_tree(db)
-        cat_cond = TransactionORM.category_id.in_(_subtree_ids(cid, children_by_id))
+        cat_cond = TransactionORM.category_id.in_(_subtree_ids(cid))
 
     account_conds = _tx_conditions(account_id=account, date_from=None, date_to=None)
 
@@ -330,13 +318,13 @@ def category_series_db(
         .where(cat_cond, *account_conds, TransactionORM.date >= start, TransactionORM.date <= end)
         .group_by(bucket_expr)
     ).all()
-    sums = {key: Decimal(val or 0) for key, val in rows}
+    sums = {key: to_cents(val) for key, val in rows}
 
     points: List[CategorySeriesPoint] = []
     for bucket_start in _iter_buckets(start, end, granularity):
         key = bucket_start.strftime(fmt)
         points.append(
-            CategorySeriesPoint(date=bucket_start, value=abs(sums.get(key, ZERO)))
+            CategorySeriesPoint(date=bucket_start, value=from_cents(abs(sums.get(key, 0))))
         )
     return points
 
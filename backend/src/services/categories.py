@@ -5,7 +5,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from ..utils import NotFound, Ambiguous, Conflict
-from ..models import Category as CategoryORM
+from ..models import Category as CategoryORM, CategoryClosure as CategoryClosureORM
 from ..schemas import (
     Category,
     CategoryCreate,
@@ -93,15 +93,32 @@ def get_category_by_id_db(db: Session, id: int) -> Category:
 def update_category_db(db: Session, id: int, update: CategoryUpdate) -> Category:
     row = _get_or_404(db, id)
     if _is_protected_root(row):
-        raise Conflict(f"Root category '{row.name}' cannot be renamed.")
+        raise Conflict(f"Root category '{row.name}' cannot be renamed or moved.")
 
-    row.name = update.name
+    if update.name is not None:
+        row.name = update.name
+    if update.parent_id is not None and update.parent_id != row.parent_id:
+        parent_obj = db.get(CategoryORM, update.parent_id)
+        if parent_obj is None:
+            raise NotFound(f"Parent category with id {update.parent_id} does not exist.")
+        in_subtree = db.scalar(
+            select(CategoryClosureORM.depth).where(
+                CategoryClosureORM.ancestor_id == row.id,
+                CategoryClosureORM.descendant_id == parent_obj.id,
+            )
+        )
+        if in_subtree is not None:
+            raise Conflict(
+                f"Category '{row.name}' cannot be moved into its own subtree."
+            )
+        # The closure rows of the subtree follow via trigger, see services.category_closure
+        row.parent = parent_obj
     try:
         db.flush()
     except IntegrityError as ie:
         db.rollback()
         raise Conflict(
-            f"Category '{update.name}' already exists under the same parent."
+            f"Category '{row.name}' already exists under the same parent."
         ) from ie
 
     return _to_schema(row)
@@ -130,7 +147,13 @@ def build_category_tree_db(
     if parent_id is not None and db.get(CategoryORM, parent_id) is None:
         raise NotFound(f"Parent category with id {parent_id} does not exist.")
 
-    rows: List[CategoryORM] = db.scalars(select(CategoryORM)).all()
+    stmt = select(CategoryORM).order_by(CategoryORM.id)
+    if parent_id is not None:
+        # Only the parent's subtree, from the closure table
+        stmt = stmt.join(
+            CategoryClosureORM, CategoryClosureORM.descendant_id == CategoryORM.id
+        ).where(CategoryClosureORM.ancestor_id == parent_id, CategoryClosureORM.depth > 0)
+    rows: List[CategoryORM] = db.scalars(stmt).all()
 
     by_id: Dict[int, Dict] = {
         r.id: {"id": r.id, "name": r.name, "children": []} for r in rows
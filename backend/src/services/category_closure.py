@@ -0,0 +1,92 @@
+"""
+Closure table of the category tree.
+
+`category_closure` holds one row per (ancestor, descendant) pair with the
+number of edges between them, every category also paired with itself at
+depth 0. Subtrees, ancestors and "the ancestor n levels up" become indexed
+lookups instead of walks over the whole `categories` table:
+
+- subtree of c:        ancestor_id = c
+- ancestors of c:      descendant_id = c
+- level of c:          depth of its row whose ancestor is a root
+- ancestor n levels up: descendant_id = c AND depth = n
+
+Triggers on `categories` maintain it inside the writing transaction, for every
+write path (create_category_db, the root seeding, moves in
+update_category_db):
+
+- insert: the new category's row to itself, plus its parent's ancestors
+- parent_id update: the moved subtree loses its old ancestors above the
+  moved category and gains the new parent's
+
+Rows of a deleted category go with it (ON DELETE CASCADE).
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.engine import Connection
+
+CLOSURE_TABLE = "category_closure"
+
+CLOSURE_TRIGGERS_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_insert AFTER INSERT ON categories BEGIN
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, new.id, depth + 1 FROM category_closure
+        WHERE descendant_id = new.parent_id
+        UNION ALL
+        SELECT new.id, new.id, 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_move
+    AFTER UPDATE OF parent_id ON categories
+    WHEN new.parent_id IS NOT old.parent_id BEGIN
+        DELETE FROM category_closure
+        WHERE descendant_id IN (
+            SELECT descendant_id FROM category_closure WHERE ancestor_id = new.id
+        )
+        AND ancestor_id NOT IN (
+            SELECT descendant_id FROM category_closure WHERE ancestor_id = new.id
+        );
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+        FROM category_closure AS above, category_closure AS below
+        WHERE above.descendant_id = new.parent_id AND below.ancestor_id = new.id;
+    END
+    """,
+)
+
+CLOSURE_TRIGGERS_DROP = (
+    "DROP TRIGGER IF EXISTS category_closure_move",
+    "DROP TRIGGER IF EXISTS category_closure_insert",
+)
+
+# Rebuilds the table from `categories.parent_id`
+CLOSURE_REBUILD = (
+    "DELETE FROM category_closure",
+    """
+    WITH RECURSIVE pairs(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM categories
+        UNION ALL
+        SELECT pairs.ancestor_id, categories.id, pairs.depth + 1
+        FROM pairs JOIN categories ON categories.parent_id = pairs.descendant_id
+    )
+    INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, depth FROM pairs
+    """,
+)
+
+
+def ensure_category_closure(conn: Connection) -> None:
+    """Create the maintenance triggers if missing, and fill the (existing)
+    closure table if it does not cover every category."""
+    for statement in CLOSURE_TRIGGERS_DDL:
+        conn.exec_driver_sql(statement)
+    categories = conn.exec_driver_sql("SELECT count(*) FROM categories").scalar()
+    covered = conn.exec_driver_sql(
+        f"SELECT count(*) FROM {CLOSURE_TABLE} WHERE depth = 0"
+    ).scalar()
+    if categories != covered:
+        for statement in CLOSURE_REBUILD:
+            conn.exec_driver_sql(statement)
@@ -1,6 +1,14 @@
 """CSV parser module for importing bank statements from various financial institutions."""
 
-from .registry import get_parser, list_parsers, parse_csv_file
-from .base import CSVParser, ParsedBankData
+from .registry import get_parser, list_parsers, parse_csv_file, iter_csv_file
+from .base import CSVParser, ParsedBankData, StreamedBankData
 
-__all__ = ["get_parser", "list_parsers", "parse_csv_file", "CSVParser", "ParsedBankData"]
\ No newline at end of file
+__all__ = [
+    "get_parser",
+    "list_parsers",
+    "parse_csv_file",
+    "iter_csv_file",
+    "CSVParser",
+    "ParsedBankData",
+    "StreamedBankData",
+]
\ No newline at end of file
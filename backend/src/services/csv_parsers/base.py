@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import io
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import BinaryIO, List, Union
+from typing import BinaryIO, FrozenSet, Iterator, List, Optional, TextIO, Tuple, Union
 
 # Import existing bank data models
 from ..bank_models import BankAccount, BankTransaction
@@ -22,8 +24,124 @@ class ParsedBankData:
             raise ValueError("Mismatched number of accounts and transaction lists")
 
 
+@dataclass(frozen=True)
+class StreamedBankData:
+    """Account metadata plus a lazily parsed transaction stream."""
+
+    account: BankAccount
+    transactions: Iterator[BankTransaction]
+
+
+# Bytes read from the start of a file for format detection and header parsing
+SNIFF_SIZE = 8192
+
+
+class _DetachingTextIOWrapper(io.TextIOWrapper):
+    """Text view over a binary file that leaves the underlying file open."""
+
+    def close(self):
+        try:
+            self.detach()
+        except ValueError:
+            pass  # already detached
+
+
+def open_text_stream(file: Union[BinaryIO, TextIO, str]) -> TextIO:
+    """Return a text stream over string content or a (binary or text) file object.
+
+    Binary files are wrapped (decoded as UTF-8, BOM stripped) instead of read
+    into memory. Closing the returned stream never closes the caller's file.
+    """
+    if isinstance(file, str):
+        return io.StringIO(file)
+    if not hasattr(file, 'read'):
+        raise ValueError("File input must be string or file-like object")
+    if hasattr(file, 'seek'):
+        file.seek(0)  # Reset file pointer
+    if isinstance(file.read(0), bytes):
+        return _DetachingTextIOWrapper(file, encoding='utf-8-sig', newline='')
+    return file
+
+
+def read_prefix(file: Union[BinaryIO, TextIO, str], size: int = SNIFF_SIZE) -> str:
+    """Return (at most) the first `size` bytes/chars of the input as text.
+
+    File objects are rewound afterwards so they can be parsed from the start.
+    """
+    if isinstance(file, str):
+        return file[:size]
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    prefix = file.read(size)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    if isinstance(prefix, bytes):
+        # A multi-byte character may be cut at the boundary; drop it
+        return prefix.decode('utf-8-sig', errors='ignore')
+    return prefix
+
+
+# Cell separators recognised when tokenizing lines for format detection
+_CELL_SPLIT = re.compile(r'[;,\t]')
+
+
+def head_lines(content: str, max_lines: int) -> List[str]:
+    """First `max_lines` lines of `content`, looking at no more than SNIFF_SIZE chars."""
+    return content[:SNIFF_SIZE].splitlines()[:max_lines]
+
+
+def line_tokens(line: str) -> FrozenSet[str]:
+    """Non-empty, unquoted cells of a delimited line (delimiter-agnostic)."""
+    tokens = (cell.strip().strip('"').strip() for cell in _CELL_SPLIT.split(line))
+    return frozenset(t for t in tokens if t)
+
+
+@dataclass(frozen=True)
+class ParserSignature:
+    """Cheap format fingerprint matched against the first lines of a file.
+
+    A file matches when one of its first `max_lines` lines contains all
+    `header_tokens` as cells and, if set, its first line matches the
+    `first_line` regex.
+    """
+
+    header_tokens: Tuple[str, ...]
+    first_line: Optional[str] = None
+    max_lines: int = 10
+
+    def __post_init__(self):
+        if not self.header_tokens:
+            raise ValueError("ParserSignature needs at least one header token")
+
+    @property
+    def anchor(self) -> str:
+        """Token the registry indexes this signature under."""
+        return self.header_tokens[0]
+
+    def matches_first_line(self, line: str) -> bool:
+        return self.first_line is None or re.match(self.first_line, line) is not None
+
+    def matches_header(self, line_no: int, tokens: FrozenSet[str]) -> bool:
+        return line_no < self.max_lines and all(t in tokens for t in self.header_tokens)
+
+    def matches(self, content: str) -> bool:
+        lines = head_lines(content, self.max_lines)
+        if not lines or not self.matches_first_line(lines[0]):
+            return False
+        return any(
+            self.matches_header(i, line_tokens(line)) for i, line in enumerate(lines)
+        )
+
+
 class CSVParser(ABC):
-    """Abstract base class for CSV bank statement parsers."""
+    """Abstract base class for CSV bank statement parsers.
+
+    Parsers should declare a `signature` so the registry can auto-detect them
+    from a bounded file prefix; `can_parse` is only consulted for parsers
+    without one.
+    """
+
+    signature: Optional[ParserSignature] = None
     
     @property
     @abstractmethod
@@ -57,6 +175,18 @@ class CSVParser(ABC):
             ValueError: If CSV format is invalid or unsupported
         """
         pass
+
+    def iter_parse(
+        self, file: Union[BinaryIO, str], holder_name: str = None
+    ) -> Iterator[StreamedBankData]:
+        """Parse CSV file incrementally, one StreamedBankData per account.
+
+        The default falls back to `parse`; parsers that can decode row by row
+        override this so large files are never held in memory as a whole.
+        """
+        parsed = self.parse(file, holder_name)
+        for account, transactions in zip(parsed.accounts, parsed.transactions_per_account):
+            yield StreamedBankData(account=account, transactions=iter(transactions))
     
     def _normalize_file_input(self, file: Union[BinaryIO, str]) -> str:
         """Convert file input to string content."""
@@ -0,0 +1,81 @@
+"""Columnar decoding of German-formatted amount and date columns.
+
+Bank CSV exports repeat the same few hundred booking dates across thousands of
+rows, and amounts almost always use the canonical `-1.234,56` form. Decoding a
+whole column at once lets us memoize dates per file and turn amounts into
+integer cents with a single regex match, instead of up to two `strptime`
+calls and several string rewrites per row.
+
+The fast paths only accept the unambiguous canonical formats. Anything else
+decodes to None, and callers fall back to their scalar parser for that row,
+so results (and errors) are exactly the same as with the scalar parsers.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from typing import Dict, List, Optional, Sequence
+
+# [+-] digits with optional '.' thousands separators, ',' and exactly two decimals.
+# Bounded length keeps Decimal arithmetic exact under the default context.
+_AMOUNT_RE = re.compile(r"([+-]?)(\d{1,3}(?:\.\d{3}){0,4}|\d{1,15}),(\d\d)")
+# DD.MM.YY or DD.MM.YYYY (day/month may have one digit, as strptime allows)
+_DATE_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4}|\d{2})")
+
+
+def german_amounts_to_cents(column: Sequence[str]) -> List[Optional[int]]:
+    """Decode a column of amounts like '-1.234,56' / '+45,67' to signed integer cents.
+
+    Values that are not in canonical two-decimal form decode to None. '-0,00'
+    decodes to 0, like the scalar parser (`-Decimal('0.00')` is `0.00`), so both
+    paths give the same `str()` and fingerprint.
+    """
+    match = _AMOUNT_RE.fullmatch
+    out: List[Optional[int]] = []
+    append = out.append
+    for raw in column:
+        m = match(raw.strip())
+        if m is None:
+            append(None)
+            continue
+        sign, integer, cents = m.groups()
+        value = int(integer.replace(".", "")) * 100 + int(cents)
+        append(-value if sign == "-" and value else value)
+    return out
+
+
+def _date_to_ordinal(raw: str) -> Optional[int]:
+    m = _DATE_RE.fullmatch(raw)
+    if m is None:
+        return None
+    day, month, year = m.groups()
+    y = int(year)
+    if len(year) == 2:
+        # Same pivot as strptime's %y: 69-99 -> 19xx, 00-68 -> 20xx
+        y += 1900 if y >= 69 else 2000
+    try:
+        return dt.date(y, int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+
+
+def german_dates_to_ordinals(
+    column: Sequence[str], memo: Optional[Dict[str, Optional[int]]] = None
+) -> List[Optional[int]]:
+    """Decode a column of dates like '10.01.25' / '10.01.2025' to proleptic ordinals.
+
+    `memo` caches decoded strings across calls (pass one dict per file);
+    invalid or non-canonical dates decode to None.
+    """
+    if memo is None:
+        memo = {}
+    out: List[Optional[int]] = []
+    append = out.append
+    for raw in column:
+        try:
+            append(memo[raw])
+        except KeyError:
+            ordinal = memo[raw] = _date_to_ordinal(raw.strip())
+            append(ordinal)
+    return out
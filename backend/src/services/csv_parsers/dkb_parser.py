@@ -3,13 +3,22 @@
 from __future__ import annotations
 
 import csv
+import logging
 from decimal import Decimal, InvalidOperation
-from datetime import datetime
-from typing import BinaryIO, Union, List, Optional
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, TextIO, Union, List, Optional
 
-from .base import CSVParser, ParsedBankData
+from .base import CSVParser, ParsedBankData, ParserSignature, StreamedBankData, open_text_stream
+from .decoding import german_amounts_to_cents, german_dates_to_ordinals
 from ..bank_models import BankAccount, BankTransaction
-from ...utils import ExternalServiceError
+from ...utils import ExternalServiceError, from_cents
+
+logger = logging.getLogger(__name__)
+
+
+# Rows decoded together in one columnar pass
+DECODE_BLOCK_SIZE = 1024
 
 
 class DKBParser(CSVParser):
@@ -23,25 +32,16 @@ class DKBParser(CSVParser):
     def bank_name(self) -> str:
         return "Deutsche Kreditbank (DKB)"
     
+    # DKB files start with account name and IBAN in quotes, e.g.
+    # "Girokonto";"DEXXXXXXXX", followed by the column headers a few lines later
+    signature = ParserSignature(
+        header_tokens=("Buchungsdatum", "Zahlungsempfänger*in", "Betrag (€)"),
+        first_line=r'\s*".*;"DE',
+    )
+
     def can_parse(self, file_content: str) -> bool:
         """Check if this looks like a DKB CSV file."""
-        # DKB files start with account name and IBAN in quotes
-        lines = file_content.strip().split('\n')
-        if len(lines) < 5:
-            return False
-            
-        # Look for DKB-specific patterns
-        first_line = lines[0].strip()
-        # Should be like: "Girokonto";"DEXXXXXXXX" or "Tagesgeld";"DEXXXXXXXX"
-        if not (first_line.startswith('"') and ';"DE' in first_line):
-            return False
-            
-        # Look for the expected column headers
-        for line in lines[:10]:  # Check first 10 lines for headers
-            if 'Buchungsdatum' in line and 'Zahlungsempfänger*in' in line and 'Betrag (€)' in line:
-                return True
-                
-        return False
+        return self.signature.matches(file_content)
     
     def parse(self, file: Union[BinaryIO, str], holder_name: str = None) -> ParsedBankData:
         """Parse DKB CSV file.
@@ -54,42 +54,48 @@ class DKBParser(CSVParser):
         Line 5: Column headers
         Line 6+: Transaction data
         """
-        content = self._normalize_file_input(file)
-        lines = content.strip().split('\n')
+        accounts = []
+        transactions_per_account = []
+        for streamed in self.iter_parse(file, holder_name):
+            accounts.append(streamed.account)
+            transactions_per_account.append(list(streamed.transactions))
         
-        if len(lines) < 6:
-            raise ExternalServiceError("DKB CSV file too short - invalid format")
-            
-        # Parse account metadata from header
-        account_name, iban = self._parse_account_header(lines[0])
-        balance = self._parse_balance_line(lines[2])
+        return ParsedBankData(
+            accounts=accounts,
+            transactions_per_account=transactions_per_account
+        )
+    
+    def iter_parse(
+        self, file: Union[BinaryIO, str], holder_name: str = None
+    ) -> Iterator[StreamedBankData]:
+        """Parse DKB CSV file incrementally.
         
-        # Find and parse column headers
-        header_line_idx = self._find_header_line(lines)
-        if header_line_idx == -1:
-            raise ExternalServiceError("Could not find transaction header line in CSV")
+        The account metadata and column headers are read eagerly; transactions
+        are decoded lazily from a single csv.reader over the (text-wrapped)
+        input, so memory stays flat regardless of file size.
+        """
+        stream = open_text_stream(file)
+        try:
+            reader = csv.reader(stream, delimiter=';', quotechar='"')
+            head = list(islice(reader, 3))
+            if len(head) < 3:
+                raise ExternalServiceError("DKB CSV file too short - invalid format")
             
-        headers = self._parse_csv_line(lines[header_line_idx])
-        column_map = self._build_column_map(headers)
-        
-        # Parse transactions
-        transactions = []
-        for line_idx in range(header_line_idx + 1, len(lines)):
-            line = lines[line_idx].strip()
-            if not line:
-                continue
-                
-            try:
-                transaction = self._parse_transaction_line(line, column_map)
-                if transaction:
-                    transactions.append(transaction)
-            except Exception as e:
-                # Log warning but continue with other transactions
-                print(f"Warning: Could not parse transaction line {line_idx + 1}: {e}")
-                continue
-        
-        if not transactions:
-            raise ExternalServiceError("No valid transactions found in CSV file")
+            # Parse account metadata from header
+            account_name, iban = self._parse_account_header(head[0])
+            balance = self._parse_balance_line(head[2])
+            
+            # Find and parse column headers
+            column_map = None
+            for row in reader:
+                if self._is_header_row(row):
+                    column_map = self._build_column_map(row)
+                    break
+            if column_map is None:
+                raise ExternalServiceError("Could not find transaction header line in CSV")
+        except BaseException:
+            stream.close()
+            raise
         
         # Create account object
         account = BankAccount(
@@ -99,14 +105,74 @@ class DKBParser(CSVParser):
             holder_name=holder_name or "Unknown"
         )
         
-        return ParsedBankData(
-            accounts=[account],
-            transactions_per_account=[transactions]
-        )
+        return iter([
+            StreamedBankData(
+                account=account,
+                transactions=self._iter_transactions(stream, reader, column_map),
+            )
+        ])
+    
+    def _iter_transactions(
+        self, stream: TextIO, reader, column_map: dict[str, int]
+    ) -> Iterator[BankTransaction]:
+        """Yield transactions from the remaining rows of `reader`.
+        
+        Rows are read in blocks so the date and amount columns of each block
+        can be decoded in one columnar pass (see `decoding`).
+        """
+        date_memo: Dict[str, Optional[int]] = {}
+        found = False
+        try:
+            while True:
+                block = [
+                    (reader.line_num, row)
+                    for row in islice(reader, DECODE_BLOCK_SIZE)
+                ]
+                if not block:
+                    break
+                for line_num, transaction in self._decode_block(block, column_map, date_memo):
+                    if isinstance(transaction, Exception):
+                        # Log warning but continue with other transactions
+                        logger.warning(
+                            "Could not parse transaction line %d: %s", line_num, transaction
+                        )
+                        continue
+                    found = True
+                    yield transaction
+        finally:
+            stream.close()
+        
+        if not found:
+            raise ExternalServiceError("No valid transactions found in CSV file")
+    
+    def _decode_block(
+        self,
+        block: List[tuple[int, List[str]]],
+        column_map: dict[str, int],
+        date_memo: Dict[str, Optional[int]],
+    ) -> Iterator[tuple[int, Union[BankTransaction, Exception]]]:
+        """Decode a block of raw rows into (line number, transaction or error)."""
+        max_idx = max(idx for idx in column_map.values() if idx is not None)
+        date_idx, amount_idx = column_map['date'], column_map['amount']
+        
+        # Check if we have enough columns; short and empty rows are skipped
+        rows = [(line_num, row) for line_num, row in block if len(row) > max_idx]
+        ordinals = german_dates_to_ordinals([row[date_idx] for _, row in rows], date_memo)
+        cents = german_amounts_to_cents([row[amount_idx] for _, row in rows])
+        
+        for (line_num, row), ordinal, amount_cents in zip(rows, ordinals, cents):
+            try:
+                yield line_num, self._parse_transaction_row(
+                    row,
+                    column_map,
+                    date_obj=date.fromordinal(ordinal) if ordinal is not None else None,
+                    amount=from_cents(amount_cents) if amount_cents is not None else None,
+                )
+            except Exception as e:
+                yield line_num, e
     
-    def _parse_account_header(self, line: str) -> tuple[str, str]:
+    def _parse_account_header(self, parts: List[str]) -> tuple[str, str]:
         """Parse first line: "Account Name";"IBAN" """
-        parts = self._parse_csv_line(line)
         if len(parts) < 2:
             raise ExternalServiceError("Invalid account header line")
             
@@ -118,9 +184,8 @@ class DKBParser(CSVParser):
             
         return account_name, iban
     
-    def _parse_balance_line(self, line: str) -> Decimal:
+    def _parse_balance_line(self, parts: List[str]) -> Decimal:
         """Parse balance line: "Kontostand vom date:";"amount €" """
-        parts = self._parse_csv_line(line)
         if len(parts) < 2:
             raise ExternalServiceError("Invalid balance line")
             
@@ -133,12 +198,9 @@ class DKBParser(CSVParser):
         except (InvalidOperation, ValueError) as e:
             raise ExternalServiceError(f"Could not parse balance amount: {balance_str}") from e
     
-    def _find_header_line(self, lines: List[str]) -> int:
-        """Find the line containing transaction column headers."""
-        for idx, line in enumerate(lines):
-            if 'Buchungsdatum' in line and 'Betrag (€)' in line:
-                return idx
-        return -1
+    def _is_header_row(self, row: List[str]) -> bool:
+        """Check whether a row holds the transaction column headers."""
+        return 'Buchungsdatum' in row and 'Betrag (€)' in row
     
     def _build_column_map(self, headers: List[str]) -> dict[str, int]:
         """Map column names to indices."""
@@ -174,10 +236,17 @@ class DKBParser(CSVParser):
                 
         return column_map
     
-    def _parse_transaction_line(self, line: str, column_map: dict[str, int]) -> Optional[BankTransaction]:
-        """Parse a single transaction line."""
-        parts = self._parse_csv_line(line)
+    def _parse_transaction_row(
+        self,
+        parts: List[str],
+        column_map: dict[str, int],
+        date_obj: Optional[date] = None,
+        amount: Optional[Decimal] = None,
+    ) -> Optional[BankTransaction]:
+        """Parse a single transaction row.
         
+        `date_obj` / `amount` may be passed in when already decoded columnwise.
+        """
         # Check if we have enough columns
         max_idx = max(idx for idx in column_map.values() if idx is not None)
         if len(parts) <= max_idx:
@@ -196,10 +265,12 @@ class DKBParser(CSVParser):
                 reference = parts[column_map['reference']].strip() or None
             
             # Parse date (DD.MM.YY format)
-            date_obj = self._parse_german_date(date_str)
+            if date_obj is None:
+                date_obj = self._parse_german_date(date_str)
             
             # Parse amount (German format: -1.234,56)
-            amount = self._parse_german_amount(amount_str)
+            if amount is None:
+                amount = self._parse_german_amount(amount_str)
             
             # Combine purpose and peer for transaction text
             text = purpose if purpose else f"Transaction with {peer}"
@@ -215,15 +286,6 @@ class DKBParser(CSVParser):
         except Exception as e:
             raise ExternalServiceError(f"Error parsing transaction: {e}")
     
-    def _parse_csv_line(self, line: str) -> List[str]:
-        """Parse a semicolon-delimited CSV line with proper quote handling."""
-        # Use csv module to handle quoted fields properly
-        reader = csv.reader([line], delimiter=';', quotechar='"')
-        try:
-            return next(reader)
-        except StopIteration:
-            return []
-    
     def _parse_german_date(self, date_str: str) -> datetime:
         """Parse German date format DD.MM.YY or DD.MM.YYYY."""
         date_str = date_str.strip()
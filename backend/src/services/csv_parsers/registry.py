@@ -2,27 +2,54 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Union, BinaryIO, Optional
+from typing import Dict, Iterator, List, Union, BinaryIO, Optional
 
-from .base import CSVParser, ParsedBankData
+from .base import (
+    CSVParser,
+    ParsedBankData,
+    StreamedBankData,
+    head_lines,
+    line_tokens,
+    read_prefix,
+)
 from .dkb_parser import DKBParser
 
 
 class ParserRegistry:
-    """Registry for managing CSV parsers."""
+    """Registry for managing CSV parsers.
+
+    Auto-detection indexes parser signatures by their anchor header token, so
+    detection tokenizes the first lines of a file once and only checks the
+    parsers whose anchor occurs there, however many parsers are registered.
+    """
     
     def __init__(self):
         self._parsers: Dict[str, CSVParser] = {}
+        self._by_anchor: Dict[str, List[CSVParser]] = {}
+        self._unsigned: List[CSVParser] = []
+        self._max_lines = 0
         self._register_built_in_parsers()
     
     def _register_built_in_parsers(self):
         """Register all built-in parsers."""
-        dkb = DKBParser()
-        self._parsers[dkb.name] = dkb
+        self.register(DKBParser())
     
     def register(self, parser: CSVParser):
-        """Register a new parser."""
+        """Register a new parser (replacing any parser with the same name)."""
         self._parsers[parser.name] = parser
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        self._by_anchor = {}
+        self._unsigned = []
+        self._max_lines = 0
+        for parser in self._parsers.values():
+            signature = parser.signature
+            if signature is None:
+                self._unsigned.append(parser)
+                continue
+            self._by_anchor.setdefault(signature.anchor, []).append(parser)
+            self._max_lines = max(self._max_lines, signature.max_lines)
     
     def get_parser(self, name: str) -> CSVParser:
         """Get parser by name."""
@@ -36,8 +63,23 @@ class ParserRegistry:
         return list(self._parsers.keys())
     
     def auto_detect(self, file_content: str) -> Optional[CSVParser]:
-        """Auto-detect which parser can handle the given content."""
-        for parser in self._parsers.values():
+        """Auto-detect which parser can handle the given content.
+
+        Only the first few KB of `file_content` are inspected. Parsers without
+        a signature fall back to `can_parse`, after all signatures missed.
+        """
+        lines = head_lines(file_content, self._max_lines)
+        if lines:
+            first_line = lines[0]
+            for line_no, line in enumerate(lines):
+                tokens = line_tokens(line)
+                for token in tokens:
+                    for parser in self._by_anchor.get(token, ()):
+                        signature = parser.signature
+                        if signature.matches_header(line_no, tokens) and signature.matches_first_line(first_line):
+                            return parser
+
+        for parser in self._unsigned:
             if parser.can_parse(file_content):
                 return parser
         return None
@@ -57,6 +99,16 @@ def list_parsers() -> List[str]:
     return _registry.list_parsers()
 
 
+def _resolve_parser(file: Union[BinaryIO, str], parser_name: Optional[str]) -> CSVParser:
+    """Return the named parser, or auto-detect one from the file's first few KB."""
+    if parser_name:
+        return get_parser(parser_name)
+    parser = _registry.auto_detect(read_prefix(file))
+    if not parser:
+        raise ValueError("Could not auto-detect CSV format. Please specify parser explicitly.")
+    return parser
+
+
 def parse_csv_file(
     file: Union[BinaryIO, str], 
     parser_name: Optional[str] = None,
@@ -75,23 +127,22 @@ def parse_csv_file(
     Raises:
         ValueError: If no suitable parser found or parsing fails
     """
-    # Convert to string for auto-detection
-    if hasattr(file, 'read'):
-        content = file.read()
-        if hasattr(file, 'seek'):
-            file.seek(0)  # Reset for actual parsing
-        if isinstance(content, bytes):
-            content = content.decode('utf-8-sig')
-    else:
-        content = file
+    parser = _resolve_parser(file, parser_name)
+    return parser.parse(file, holder_name)
+
+
+def iter_csv_file(
+    file: Union[BinaryIO, str],
+    parser_name: Optional[str] = None,
+    holder_name: Optional[str] = None
+) -> Iterator[StreamedBankData]:
+    """Incremental variant of `parse_csv_file`.
     
-    # Get parser
-    if parser_name:
-        parser = get_parser(parser_name)
-    else:
-        parser = _registry.auto_detect(content)
-        if not parser:
-            raise ValueError("Could not auto-detect CSV format. Please specify parser explicitly.")
+    Yields one StreamedBankData per account whose transactions are decoded
+    lazily, so the file is never materialized as a whole.
     
-    # Parse the file
-    return parser.parse(file, holder_name)
\ No newline at end of file
+    Raises:
+        ValueError: If no suitable parser found or parsing fails
+    """
+    parser = _resolve_parser(file, parser_name)
+    return parser.iter_parse(file, holder_name)
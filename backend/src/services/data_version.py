@@ -0,0 +1,74 @@
+"""
+Data version: a counter that changes with every write that can change a
+transaction listing.
+
+Every flush or ORM bulk statement that touches `transactions` or
+`categories` (inserts, edits, recategorization, imports, category renames
+and deletes) increments the single row of `data_version` in the same
+database transaction. The listeners are installed on all sessions when this
+module is imported. Because the counter lives in the database, it also
+changes for writes made by other processes (e.g. the CLI import), and it
+commits or rolls back together with the data.
+
+A session that has written but not committed yet sees its own, uncommitted
+version; `has_uncommitted_writes` tells caches not to use or store entries
+for it.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction, UOWTransaction
+
+from ..models import Category as CategoryORM
+from ..models import DataVersion as DataVersionORM
+from ..models import Transaction as TransactionORM
+
+_WATCHED = (TransactionORM, CategoryORM)
+
+# Session.info key set while the session holds an uncommitted bump
+_PENDING = "data_version_pending"
+
+
+def current_data_version_db(db: Session) -> int:
+    """The data version as seen by `db`'s current transaction."""
+    return db.scalar(select(DataVersionORM.version).where(DataVersionORM.id == 1)) or 0
+
+
+def has_uncommitted_writes(db: Session) -> bool:
+    return bool(db.info.get(_PENDING))
+
+
+def _bump(db: Session) -> None:
+    conn = db.connection()
+    bumped = conn.execute(
+        update(DataVersionORM)
+        .where(DataVersionORM.id == 1)
+        .values(version=DataVersionORM.version + 1)
+    )
+    if not bumped.rowcount:
+        conn.execute(insert(DataVersionORM).values(id=1, version=1))
+    db.info[_PENDING] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(db: Session, flush_context: UOWTransaction) -> None:
+    # new/dirty/deleted still hold the flushed objects here
+    for obj in (*db.new, *db.dirty, *db.deleted):
+        if isinstance(obj, _WATCHED):
+            _bump(db)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(state: ORMExecuteState) -> None:
+    if state.is_select or state.bind_mapper is None:
+        return
+    if state.bind_mapper.class_ in _WATCHED:
+        _bump(state.session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _transaction_ended(db: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:  # not a savepoint: committed or rolled back
+        db.info.pop(_PENDING, None)
@@ -0,0 +1,172 @@
+"""
+Per-process prefilter of stored transaction fingerprints.
+
+Imports probe the database for every fingerprint they are about to insert.
+The filter answers "definitely not stored" for new rows, so only fingerprints
+it reports as possibly stored need the exact (indexed) check. It keeps the
+first 64 bits of every stored fingerprint (a SHA-256 hex digest) in a set:
+about 70 bytes per transaction, C-speed lookups, and practically no false
+positives. A Bloom filter would be smaller but needs several Python-level
+bit operations per lookup, which cost more than the probes they save.
+
+The filter is built lazily from `transactions.fingerprint`. Before each
+check it catches up on rows committed since its last sync (`id` above its
+high-water mark), reading through its own read-only engine so it only ever
+sees committed data (and never waits for the single write connection). Rows inserted by the current, uncommitted session are added
+explicitly with `add`; if that session rolls back they only leave stale
+entries, i.e. false positives that the exact check resolves. Transactions
+are never deleted, so ids only grow and the catch-up never misses a row.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..database import create_sqlite_engine, database_file
+from ..models import Transaction as TransactionORM
+from ..schemas import FingerprintFilterStats
+from ..settings import FINGERPRINT_PREFILTER
+
+SYNC_CHUNK = 50_000
+
+# Hex digits of the fingerprint kept per entry (64 bits)
+PREFIX_HEX_DIGITS = 16
+
+
+def _prefix(fingerprint: str) -> int:
+    return int(fingerprint[:PREFIX_HEX_DIGITS], 16)
+
+
+@dataclass
+class FilterStats:
+    """Counters since the filter was created."""
+
+    lookups: int = 0
+    definitely_new: int = 0
+    maybe_stored: int = 0
+    false_positives: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups that skipped the exact database check."""
+        return self.definitely_new / self.lookups if self.lookups else 0.0
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Share of "maybe stored" answers the exact check did not confirm as duplicates."""
+        return self.false_positives / self.maybe_stored if self.maybe_stored else 0.0
+
+
+class FingerprintFilter:
+    """Fingerprint-prefix set for one database."""
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+        self._reader = create_sqlite_engine(
+            f"sqlite:///{database_file(engine.url)}", read_only=True
+        )
+        self._lock = threading.Lock()
+        self._known: Optional[Set[int]] = None
+        self._high_id = 0
+        self.stats = FilterStats()
+
+    def _sync(self) -> None:
+        with self._reader.connect() as conn:
+            max_id = conn.scalar(select(func.max(TransactionORM.id))) or 0
+            if self._known is None:
+                self._known = set()
+            after_id = self._high_id
+            while after_id < max_id:
+                rows = conn.execute(
+                    select(TransactionORM.id, TransactionORM.fingerprint)
+                    .where(TransactionORM.id > after_id)
+                    .order_by(TransactionORM.id)
+                    .limit(SYNC_CHUNK)
+                ).all()
+                if not rows:
+                    break
+                self._known.update(_prefix(fp) for _, fp in rows)
+                after_id = rows[-1][0]
+            self._high_id = after_id
+
+    # ---- Public API ---------------------------------------------------------
+
+    def maybe_stored(self, fingerprints: Sequence[str]) -> List[bool]:
+        """One flag per fingerprint: False = definitely not stored (committed or
+        added to this filter), True = needs the exact check."""
+        with self._lock:
+            self._sync()
+            known = self._known
+            flags = [_prefix(fp) in known for fp in fingerprints]
+            hits = flags.count(False)
+            self.stats.lookups += len(flags)
+            self.stats.definitely_new += hits
+            self.stats.maybe_stored += len(flags) - hits
+        return flags
+
+    def add(self, fingerprints: Iterable[str]) -> None:
+        """Record fingerprints written by the caller's (possibly uncommitted) session."""
+        with self._lock:
+            if self._known is None:
+                return  # the lazy build will read them once committed
+            self._known.update(_prefix(fp) for fp in fingerprints)
+
+    def record_false_positives(self, count: int) -> None:
+        with self._lock:
+            self.stats.false_positives += count
+
+    @property
+    def size(self) -> int:
+        return len(self._known) if self._known is not None else 0
+
+    def to_schema(self) -> FingerprintFilterStats:
+        with self._lock:
+            stats = self.stats
+            return FingerprintFilterStats(
+                enabled=True,
+                lookups=stats.lookups,
+                definitely_new=stats.definitely_new,
+                maybe_stored=stats.maybe_stored,
+                false_positives=stats.false_positives,
+                hit_rate=stats.hit_rate,
+                false_positive_rate=stats.false_positive_rate,
+                size=len(self._known) if self._known is not None else 0,
+            )
+
+
+# Keyed by database file: imports (write engine) and the stats endpoint
+# (read-only engine) must find the same filter
+_filters: Dict[str, FingerprintFilter] = {}
+_filters_lock = threading.Lock()
+
+
+def get_fingerprint_filter(db: Session) -> FingerprintFilter:
+    """The process-wide filter for the database `db` is bound to (through
+    either engine; import previews read through the read-only one)."""
+    engine = db.get_bind()
+    key = database_file(engine.url)
+    with _filters_lock:
+        flt = _filters.get(key)
+        # A new engine for the same URL (reloaded database module) may see a
+        # recreated file: start over
+        if flt is None or (flt._engine is not engine and flt._engine.url == engine.url):
+            flt = _filters[key] = FingerprintFilter(engine)
+        return flt
+
+
+def fingerprint_filter_stats_db(db: Session) -> FingerprintFilterStats:
+    """Hit-rate counters of this process's filter for the database `db` is
+    bound to (through either engine)."""
+    if not FINGERPRINT_PREFILTER:
+        return FingerprintFilterStats(enabled=False)
+    with _filters_lock:
+        flt = _filters.get(database_file(db.get_bind().url))
+    if flt is None:
+        return FingerprintFilterStats(enabled=True)  # no import in this process yet
+    return flt.to_schema()
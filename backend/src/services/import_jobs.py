@@ -0,0 +1,288 @@
+"""
+Background CSV import jobs.
+
+An upload is spooled to disk and recorded as a row in `import_jobs`; a
+bounded in-process thread pool then runs it through `import_csv_data`,
+writing the row counters in the same transaction as each committed batch,
+so clients can poll progress. Keep IMPORT_WORKERS small: SQLite has a single
+writer and more workers only queue up behind its lock.
+
+Jobs survive restarts: queued jobs (and jobs interrupted while running) are
+resubmitted on startup; rows committed before the interruption are skipped
+as duplicates when the job runs again.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import ImportJob as ImportJobORM
+from ..schemas import ImportJob
+from ..settings import IMPORT_BATCH_SIZE, IMPORT_UPLOAD_DIR, IMPORT_WORKERS
+from ..utils import BadRequest, Conflict, NotFound
+from .bank import ImportStats, import_csv_data
+from .csv_parsers import get_parser
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_cancel_events: Dict[str, threading.Event] = {}
+_stopping = threading.Event()
+
+
+class _JobCancelled(Exception):
+    """Raised from the batch hook to abort a cancelled job."""
+
+
+class _JobInterrupted(Exception):
+    """Raised from the batch hook when the worker pool shuts down."""
+
+
+# ---- Helpers ----------------------------------------------------------------
+
+
+def _now() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc).replace(tzinfo=None)
+
+
+def _to_schema(row: ImportJobORM) -> ImportJob:
+    return ImportJob(
+        id=row.public_id,
+        status=row.status,
+        cancel_requested=row.cancel_requested,
+        filename=row.filename,
+        parser_type=row.parser_type,
+        rows_parsed=row.rows_parsed,
+        rows_inserted=row.rows_inserted,
+        rows_duplicate=row.rows_duplicate,
+        rows_failed=row.rows_failed,
+        error=row.error,
+        created_at=row.created_at,
+        started_at=row.started_at,
+        finished_at=row.finished_at,
+    )
+
+
+def _get_or_404(db: Session, job_id: str) -> ImportJobORM:
+    row = db.scalar(select(ImportJobORM).where(ImportJobORM.public_id == job_id))
+    if row is None:
+        raise NotFound(f"Import job '{job_id}' was not found.")
+    return row
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _stopping.clear()
+            _executor = ThreadPoolExecutor(
+                max_workers=IMPORT_WORKERS, thread_name_prefix="import-job"
+            )
+        return _executor
+
+
+def _submit(job_id: str) -> None:
+    _cancel_events.setdefault(job_id, threading.Event())
+    _get_executor().submit(run_import_job, job_id)
+
+
+def _remove_upload(path: Optional[str]) -> None:
+    if path:
+        Path(path).unlink(missing_ok=True)
+
+
+def spool_upload(file_obj: BinaryIO) -> str:
+    """Copy an upload to IMPORT_UPLOAD_DIR in chunks and return its path."""
+    IMPORT_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    path = IMPORT_UPLOAD_DIR / f"{uuid.uuid4()}.csv"
+    with path.open("wb") as out:
+        shutil.copyfileobj(file_obj, out, UPLOAD_CHUNK_SIZE)
+    return str(path)
+
+
+# ---- Create / read ----------------------------------------------------------
+
+
+def enqueue_import_job_db(
+    db: Session,
+    *,
+    upload_path: str,
+    filename: Optional[str],
+    parser_type: str,
+    holder_name: str,
+) -> ImportJob:
+    """Record a queued job for a spooled upload and hand it to the worker pool.
+
+    Commits, so the worker can see the job as soon as it is submitted.
+    """
+    try:
+        get_parser(parser_type)
+    except ValueError as e:
+        _remove_upload(upload_path)
+        raise BadRequest(str(e)) from e
+
+    row = ImportJobORM(
+        status=JOB_QUEUED,
+        filename=filename,
+        parser_type=parser_type,
+        holder_name=holder_name,
+        upload_path=upload_path,
+        created_at=_now(),
+    )
+    db.add(row)
+    db.commit()
+
+    _submit(row.public_id)
+    return _to_schema(row)
+
+
+def get_import_job_db(db: Session, job_id: str) -> ImportJob:
+    return _to_schema(_get_or_404(db, job_id))
+
+
+def list_import_jobs_db(db: Session, *, limit: int = 50) -> List[ImportJob]:
+    rows = db.scalars(
+        select(ImportJobORM).order_by(ImportJobORM.id.desc()).limit(limit)
+    ).all()
+    return [_to_schema(r) for r in rows]
+
+
+# ---- Cancel -----------------------------------------------------------------
+
+
+def cancel_import_job_db(db: Session, job_id: str) -> ImportJob:
+    """Cancel a job. Queued jobs stop immediately; running jobs after their
+    current batch (that batch is rolled back, earlier batches stay committed)."""
+    row = _get_or_404(db, job_id)
+    if row.status in FINISHED_STATES:
+        raise Conflict(f"Import job '{job_id}' has already {row.status}.")
+
+    _cancel_events.setdefault(job_id, threading.Event()).set()
+    row.cancel_requested = True
+    if row.status == JOB_QUEUED:
+        row.status = JOB_CANCELLED
+        row.finished_at = _now()
+    db.flush()
+    return _to_schema(row)
+
+
+# ---- Worker -----------------------------------------------------------------
+
+
+def run_import_job(job_id: str) -> None:
+    """Execute one queued job in the calling (worker) thread."""
+    from .. import database  # resolved at call time; tests rebind the engine
+
+    cancel_event = _cancel_events.setdefault(job_id, threading.Event())
+    db = database.SessionLocal()
+    try:
+        job = db.scalar(select(ImportJobORM).where(ImportJobORM.public_id == job_id))
+        if job is None or job.status != JOB_QUEUED:
+            return
+        job.status = JOB_RUNNING
+        job.started_at = _now()
+        db.commit()
+
+        def on_batch(stats: ImportStats) -> None:
+            # Written in the same transaction as the batch's rows
+            job.rows_parsed = stats.parsed
+            job.rows_inserted = stats.inserted
+            job.rows_duplicate = stats.duplicates
+            job.rows_failed = stats.failed
+            if cancel_event.is_set():
+                raise _JobCancelled()
+            if _stopping.is_set():
+                raise _JobInterrupted()
+
+        try:
+            with open(job.upload_path, "rb") as fh:
+                import_csv_data(
+                    db,
+                    fh,
+                    job.parser_type,
+                    job.holder_name,
+                    batch_size=IMPORT_BATCH_SIZE,
+                    on_batch=on_batch,
+                )
+            job.status = JOB_COMPLETED
+        except _JobCancelled:
+            db.rollback()
+            job.status = JOB_CANCELLED
+        except _JobInterrupted:
+            db.rollback()
+            job.status = JOB_QUEUED  # resumed on next startup
+            db.commit()
+            return
+        except Exception as e:
+            db.rollback()
+            job.status = JOB_FAILED
+            job.error = str(e)[:1000]
+
+        job.finished_at = _now()
+        upload_path, job.upload_path = job.upload_path, None
+        db.commit()
+        _remove_upload(upload_path)
+    finally:
+        _cancel_events.pop(job_id, None)
+        db.close()
+
+
+def resume_import_jobs() -> int:
+    """Requeue jobs left behind by a previous process; returns how many were submitted.
+
+    Jobs whose spooled upload is gone are marked failed instead.
+    """
+    from .. import database
+
+    db = database.SessionLocal()
+    try:
+        rows = db.scalars(
+            select(ImportJobORM)
+            .where(ImportJobORM.status.in_((JOB_QUEUED, JOB_RUNNING)))
+            .order_by(ImportJobORM.id.asc())
+        ).all()
+        resumable: List[str] = []
+        for row in rows:
+            if row.upload_path and Path(row.upload_path).exists():
+                row.status = JOB_QUEUED
+                resumable.append(row.public_id)
+            else:
+                row.status = JOB_FAILED
+                row.error = "Upload was lost before the job could run."
+                row.finished_at = _now()
+        db.commit()
+    finally:
+        db.close()
+
+    for job_id in resumable:
+        _submit(job_id)
+    return len(resumable)
+
+
+def shutdown_import_workers() -> None:
+    """Stop the worker pool. Running jobs stop after their current batch and
+    are left queued; pending ones stay queued in the table."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            return
+        _stopping.set()
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
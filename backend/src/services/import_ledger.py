@@ -0,0 +1,168 @@
+"""
+Ledger of imported statement files.
+
+Every file imported through `services.bank` is recorded by the SHA-256 of its
+content, which is also the batch_hash of its rows. Before parsing, the ledger
+answers two questions with one indexed lookup each, without reading the
+transactions table:
+
+- was exactly this file imported already?
+- is this file a strict prefix of an imported one (the same export, cut off
+  after some rows)?
+
+Content is hashed line by line with line endings normalized to "\\n" and
+trailing newlines dropped, so CRLF/LF copies of an export are the same file
+and "prefix" means "the first n lines". For the prefix check each entry keeps
+the first 8 bytes of the hash of every line prefix (`line_hashes`, 8 bytes
+per line); entries are narrowed down by the hash of the first HEAD_LINES
+lines, which for bank exports covers the account, period and balance
+header. A file cut off in the middle of a line is not recognized as a prefix
+and is imported normally.
+
+Rows sharing a batch_hash are not de-duplicated against each other, so
+re-running an interrupted import of the same file must not insert its
+committed rows again: the entry stays `running` and counts the rows already
+committed (`rows_done`, written in the same transaction as the rows), and
+the next import of that file skips them.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import BinaryIO, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import ImportLedger as ImportLedgerORM
+from ..utils import Conflict
+
+LEDGER_RUNNING = "running"
+LEDGER_COMPLETED = "completed"
+
+# Lines hashed into head_hash (bank exports: account, period, balance, header)
+HEAD_LINES = 5
+
+# Bytes of each line-prefix hash kept in line_hashes
+LINE_HASH_BYTES = 8
+
+
+def _now() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
+class FileDigest:
+    """Content identity of a statement file, see the module docstring."""
+
+    content_hash: str
+    head_hash: Optional[str]
+    line_count: int
+    line_hashes: bytes
+
+    @property
+    def content_key(self) -> bytes:
+        """This file's entry in `line_hashes` of a file it is a prefix of."""
+        return bytes.fromhex(self.content_hash)[:LINE_HASH_BYTES]
+
+
+def digest_file(file_obj: BinaryIO) -> FileDigest:
+    """Hash a binary file in one streaming pass and rewind it."""
+    h = sha256()
+    line_hashes = bytearray()
+    head_hash: Optional[str] = None
+    line_count = 0
+
+    def push(line: bytes) -> None:
+        nonlocal head_hash, line_count
+        if line_count:
+            h.update(b"\n")
+        h.update(line)
+        line_count += 1
+        line_hashes.extend(h.digest()[:LINE_HASH_BYTES])
+        if line_count == HEAD_LINES:
+            head_hash = h.hexdigest()
+
+    blank_run = 0  # empty lines are only hashed once a non-empty line follows
+    for raw in file_obj:
+        line = raw.rstrip(b"\n").rstrip(b"\r")
+        if not line:
+            blank_run += 1
+            continue
+        for _ in range(blank_run):
+            push(b"")
+        blank_run = 0
+        push(line)
+    file_obj.seek(0)
+    return FileDigest(
+        content_hash=h.hexdigest(),
+        head_hash=head_hash,
+        line_count=line_count,
+        line_hashes=bytes(line_hashes),
+    )
+
+
+def find_imported_db(db: Session, digest: FileDigest) -> Optional[ImportLedgerORM]:
+    """The completed import this file is identical to or a strict prefix of."""
+    entry = db.scalar(
+        select(ImportLedgerORM).where(ImportLedgerORM.content_hash == digest.content_hash)
+    )
+    if entry is not None:
+        return entry if entry.status == LEDGER_COMPLETED else None
+    if digest.head_hash is None:
+        return None
+    offset = (digest.line_count - 1) * LINE_HASH_BYTES + 1
+    return db.scalar(
+        select(ImportLedgerORM)
+        .where(
+            ImportLedgerORM.head_hash == digest.head_hash,
+            ImportLedgerORM.status == LEDGER_COMPLETED,
+            ImportLedgerORM.line_count > digest.line_count,
+            func.substr(ImportLedgerORM.line_hashes, offset, LINE_HASH_BYTES)
+            == digest.content_key,
+        )
+        .limit(1)
+    )
+
+
+def start_import_db(db: Session, digest: FileDigest) -> ImportLedgerORM:
+    """The ledger entry to import this file under: a new one, or the running
+    entry of an earlier, interrupted import (resume after `rows_done` rows).
+
+    Raises:
+        Conflict: If another session is recording the same file right now
+    """
+    entry = db.scalar(
+        select(ImportLedgerORM).where(ImportLedgerORM.content_hash == digest.content_hash)
+    )
+    if entry is not None:
+        if entry.status == LEDGER_COMPLETED:
+            raise Conflict("This file has already been imported.")
+        return entry
+
+    entry = ImportLedgerORM(
+        content_hash=digest.content_hash,
+        head_hash=digest.head_hash,
+        line_count=digest.line_count,
+        line_hashes=digest.line_hashes,
+        status=LEDGER_RUNNING,
+        rows_done=0,
+        rows_inserted=0,
+        created_at=_now(),
+    )
+    try:
+        with db.begin_nested():
+            db.add(entry)
+    except IntegrityError as e:
+        raise Conflict("This file is being imported by another request.") from e
+    return entry
+
+
+def finish_import_db(db: Session, entry: ImportLedgerORM) -> None:
+    """Mark the file as fully imported (committed with the caller's transaction)."""
+    entry.status = LEDGER_COMPLETED
+    entry.finished_at = _now()
+    db.flush()
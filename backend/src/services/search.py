@@ -0,0 +1,192 @@
+"""
+Full-text indexes of transactions (SQLite FTS5).
+
+`transactions_fts` indexes entity, text and reference of every transaction as
+words (unicode61 tokenizer, case- and diacritic-insensitive, so "koln" finds
+"Köln"). It is an external-content table: it stores only the index and reads
+the text from `transactions`, and triggers on `transactions` keep it in sync
+for every write path (single inserts, imports, edits).
+
+The `search` filter of the transaction list and summary matches whole words
+or word beginnings: every word of the search must start a word in one of the
+three fields ("rewe kart" finds "REWE ... Kartenzahlung"). Unlike the `q`
+substring filter it is answered from the index and can rank the matches
+(bm25, sort_by=relevance).
+
+The `q` substring filter runs on the search forms of the three fields
+(`entity_norm`, `text_norm`, `reference_norm`): casefolded and with runs of
+whitespace collapsed by `normalize_search_text`, computed in Python when a
+row is written. The search string is normalized the same way, so "STRASSE"
+finds "Straße" and "rewe  markt" finds "REWE Markt", and no row needs a
+function call at query time.
+
+With SEARCH_TRIGRAM=1 a second index, `transactions_trigram`, holds every
+three-character sequence of the search forms (trigram tokenizer). It speeds
+up `q` without changing its results: the index narrows the rows down to
+those containing the search string, and the `LIKE` predicate decides on
+those candidates. This only
+pays off for selective searches: one that occurs in more than
+TRIGRAM_MAX_CANDIDATES rows (found out by a LIMITed index probe) is answered
+faster by the scan, which stops after the first page of matches. Searches
+shorter than three characters or containing LIKE wildcards (`%`, `_`) cannot
+use the index either.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, select, table
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Select
+
+from ..settings import SEARCH_TRIGRAM
+
+FTS_TABLE = "transactions_fts"
+TRIGRAM_TABLE = "transactions_trigram"
+
+# Shortest substring the trigram index can look up
+TRIGRAM_MIN_CHARS = 3
+
+# More candidate rows than this and the LIKE scan is faster
+TRIGRAM_MAX_CANDIDATES = 2000
+
+
+def _index_ddl(name: str, tokenize: str, columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """An external-content index of `columns` of transactions and its sync
+    triggers; idempotent, see ensure_search_index."""
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return (
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            {cols},
+            content='transactions', content_rowid='id',
+            tokenize='{tokenize}'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON transactions BEGIN
+            INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_update
+        AFTER UPDATE OF {cols} ON transactions BEGIN
+            INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new});
+        END
+        """,
+    )
+
+
+def _index_drop(name: str) -> Tuple[str, ...]:
+    return (
+        f"DROP TRIGGER IF EXISTS {name}_update",
+        f"DROP TRIGGER IF EXISTS {name}_delete",
+        f"DROP TRIGGER IF EXISTS {name}_insert",
+        f"DROP TABLE IF EXISTS {name}",
+    )
+
+
+FTS_COLUMNS = ("entity", "text", "reference")
+TRIGRAM_COLUMNS = ("entity_norm", "text_norm", "reference_norm")
+
+SEARCH_INDEX_DDL = _index_ddl(FTS_TABLE, "unicode61 remove_diacritics 2", FTS_COLUMNS)
+SEARCH_INDEX_DROP = _index_drop(FTS_TABLE)
+# The search forms are casefolded already; case_sensitive 0 also folds what
+# LIKE folds, so the index stays a superset of the LIKE matches
+TRIGRAM_INDEX_DDL = _index_ddl(TRIGRAM_TABLE, "trigram case_sensitive 0", TRIGRAM_COLUMNS)
+TRIGRAM_INDEX_DROP = _index_drop(TRIGRAM_TABLE)
+
+# The FTS table as seen by queries: rowid = transactions.id, rank = bm25 score
+# (lower is better), and the hidden column named like the table for MATCH
+fts = table(FTS_TABLE, column("rowid"), column("rank"), column(FTS_TABLE))
+trigram = table(TRIGRAM_TABLE, column("rowid"), column(TRIGRAM_TABLE))
+
+
+def _create_index(
+    conn: Connection,
+    name: str,
+    ddl: Tuple[str, ...],
+    drop: Tuple[str, ...],
+    columns: Tuple[str, ...],
+) -> None:
+    indexed = tuple(row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({name})"))
+    exists = bool(indexed)
+    if exists and indexed != columns:  # an index of other columns: rebuild it
+        for statement in drop:
+            conn.exec_driver_sql(statement)
+        exists = False
+    for statement in ddl:
+        conn.exec_driver_sql(statement)
+    if not exists:
+        conn.exec_driver_sql(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+
+def ensure_search_index(conn: Connection, *, trigram_index: bool) -> None:
+    """Create the word index (and, with `trigram_index`, the trigram index) with
+    their triggers if missing, indexing existing rows; drop a disabled trigram
+    index. The app passes SEARCH_TRIGRAM, migrations a fixed value."""
+    _create_index(conn, FTS_TABLE, SEARCH_INDEX_DDL, SEARCH_INDEX_DROP, FTS_COLUMNS)
+    if trigram_index:
+        _create_index(
+            conn, TRIGRAM_TABLE, TRIGRAM_INDEX_DDL, TRIGRAM_INDEX_DROP, TRIGRAM_COLUMNS
+        )
+    else:
+        for statement in TRIGRAM_INDEX_DROP:
+            conn.exec_driver_sql(statement)
+
+
+def normalize_search_text(value: Optional[str]) -> Optional[str]:
+    """Search form of a field or a `q` search: casefolded, whitespace runs
+    collapsed to one space, trimmed."""
+    if value is None:
+        return None
+    return " ".join(value.casefold().split())
+
+
+def fts_query(search: str) -> Optional[str]:
+    """FTS5 query for a user search: every word as a quoted prefix term.
+
+    Quoting makes operators and punctuation plain text; None for a search
+    without words.
+    """
+    terms = ['"' + word.replace('"', '""') + '"*' for word in search.split()]
+    return " ".join(terms) if terms else None
+
+
+def fts_match(query: str) -> ColumnElement[bool]:
+    return fts.c[FTS_TABLE].op("MATCH")(query)
+
+
+def fts_matching_ids(query: str) -> Select:
+    """Ids of the transactions matching an `fts_query`."""
+    return select(fts.c.rowid).where(fts_match(query))
+
+
+def substring_candidate_ids(db: Session, pattern_text: str) -> Optional[List[int]]:
+    """Ids of the transactions whose search forms may contain `pattern_text`
+    (the text of a `%...%` LIKE pattern), from the trigram index; None if it
+    cannot help."""
+    if (
+        not SEARCH_TRIGRAM
+        or len(pattern_text) < TRIGRAM_MIN_CHARS
+        or "%" in pattern_text
+        or "_" in pattern_text
+    ):
+        return None
+    phrase = '"' + pattern_text.replace('"', '""') + '"'
+    ids = db.scalars(
+        select(trigram.c.rowid)
+        .where(trigram.c[TRIGRAM_TABLE].op("MATCH")(phrase))
+        .limit(TRIGRAM_MAX_CANDIDATES + 1)
+    ).all()
+    return list(ids) if len(ids) <= TRIGRAM_MAX_CANDIDATES else None
@@ -1,16 +1,22 @@
-from typing import List, Optional, Tuple, Dict
-from decimal import Decimal
-from collections import defaultdict
-
-from sqlalchemy import select, or_, and_, func
+from typing import Any, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Dict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from collections import OrderedDict, defaultdict
+import base64
+import json
+import threading
+
+from sqlalchemy import insert, select, or_, and_, func
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, aliased, joinedload
 from sqlalchemy.sql import Select
 
 from ..models import (
     Transaction as TransactionORM,
     Account as AccountORM,
     Category as CategoryORM,
+    CategoryClosure as CategoryClosureORM,
 )
 from ..schemas import (
     Transaction,
@@ -19,9 +25,20 @@ from ..schemas import (
     TransactionSummary,
     PaginatedTransactions,
 )
+from ..settings import FINGERPRINT_PREFILTER, TRANSACTION_COUNT_CACHE_SIZE
 from ..utils import make_fingerprint, Conflict, NotFound, BadRequest
 from .category_rules import RulesIndex
+from .fingerprint_filter import get_fingerprint_filter
 from .categories import _find_unique_category_by_name
+from .data_version import current_data_version_db, has_uncommitted_writes
+from .search import (
+    fts,
+    fts_match,
+    fts_matching_ids,
+    fts_query,
+    normalize_search_text,
+    substring_candidate_ids,
+)
 
 
 # ---- Helpers ----------------------------------------------------------------
@@ -54,56 +71,46 @@ def _tx_to_schema(
     )
 
 
-def _build_category_indexes(db: Session) -> Tuple[Dict[int, int], Dict[int, str]]:
-    """Return (parent_by_id, name_by_id)."""
-    rows = db.scalars(select(CategoryORM)).all()
-    parent_by_id = {r.id: r.parent_id for r in rows}
-    name_by_id = {r.id: r.name for r in rows}
-    return parent_by_id, name_by_id
+def _search_columns(
+    entity: Optional[str], text: Optional[str], reference: Optional[str]
+) -> Dict[str, Optional[str]]:
+    """The `*_norm` search columns for these field values."""
+    return {
+        "entity_norm": normalize_search_text(entity) or "",
+        "text_norm": normalize_search_text(text),
+        "reference_norm": normalize_search_text(reference),
+    }
 
 
-def _ancestor_at_scope_depth(
-    node_id: int,
-    parent_by_id: Dict[int, Optional[int]],
-    scope_id: Optional[int],
-    depth: int,
-) -> Optional[int]:
-    """
-    Return the ancestor category id at 'depth' below 'scope_id'.
+def _summary_groups(scope_id: Optional[int], depth: int) -> Select:
+    """(category_id, group_id) of every category within the scope: its
+    ancestor at `depth` below the scope, or itself if it is shallower.
 
-    - scope_id=None means a virtual root whose children are the DB root categories.
-    - depth=1 means direct children of the scope.
-    - If the node is not within the scope subtree, returns None.
-    - If the node doesn't reach the requested depth, returns the deepest available ancestor
-      within the scope chain (so shallow categories still get counted).
+    From the category closure: a category n levels below the scope is grouped
+    under its ancestor max(n - depth, 0) levels up. scope_id=None is a virtual
+    root one level above the roots.
     """
-    # Build full chain from node up to real root: [node, parent, ..., None]
-    chain: List[int] = []
-    cur = node_id
-    while cur is not None:
-        chain.append(cur)
-        cur = parent_by_id.get(cur)
-
-    # Reverse to get path from real root -> node
-    path_root_to_node = list(reversed(chain))  # [root, ..., node]
-
+    below_scope = aliased(CategoryClosureORM)
+    group = aliased(CategoryClosureORM)
+    stmt = select(
+        below_scope.descendant_id.label("category_id"), group.ancestor_id.label("group_id")
+    ).select_from(below_scope)
     if scope_id is None:
-        # virtual root: scope lies before first real root
-        scope_index = -1  # virtual
+        root = aliased(CategoryORM)
+        levels = below_scope.depth + 1
+        stmt = stmt.join(root, root.id == below_scope.ancestor_id).where(
+            root.parent_id.is_(None)
+        )
     else:
-        try:
-            scope_index = path_root_to_node.index(scope_id)
-        except ValueError:
-            return None  # node not in scope subtree
-
-    target_index = scope_index + depth  # index in path_root_to_node
-    # If too deep, clamp to last existing
-    if target_index >= len(path_root_to_node):
-        target_index = len(path_root_to_node) - 1
-    if target_index < 0:
-        return None
-
-    return path_root_to_node[target_index]
+        levels = below_scope.depth
+        stmt = stmt.where(below_scope.ancestor_id == scope_id)
+    return stmt.join(
+        group,
+        and_(
+            group.descendant_id == below_scope.descendant_id,
+            group.depth == func.max(levels - depth, 0),
+        ),
+    )
 
 
 def _get_transaction_select(
@@ -115,9 +122,18 @@ def _get_transaction_select(
     account_id: Optional[str] = None,
     category: Optional[str] = None,
     q: Optional[str] = None,  # substring search across entity/text/reference
+    search: Optional[str] = None,  # word search, see services.search
 ) -> Select:
+    """Transactions matching the filters, in `sort_by` order.
+
+    `q` matches substrings of the search forms of entity/text/reference, see
+    services.search.
+    """
     if sort_by not in SortBy:
         raise BadRequest(f"Unsupported sort_by '{sort_by}'.")
+    match = fts_query(search) if search else None
+    if sort_by == "relevance" and match is None:
+        raise BadRequest("sort_by 'relevance' needs a search.")
 
     tx = TransactionORM
     q_stmt = select(tx).options(joinedload(tx.account), joinedload(tx.category))
@@ -141,13 +157,25 @@ def _get_transaction_select(
         if acc is None:
             raise NotFound(f"Couldn't find account with ID {account_id}")
         conds.append(tx.account_id == acc.public_id)
-    if q:
-        pattern = f"%{q.lower()}%"
-        entity_ci = func.lower(tx.entity).like(pattern)
-        clauses = [entity_ci]
-        clauses.append(func.lower(tx.text).like(pattern))
-        clauses.append(func.lower(tx.reference).like(pattern))
+    q_norm = normalize_search_text(q) if q else None
+    if q_norm:
+        pattern = f"%{q_norm}%"
+        clauses = [
+            tx.entity_norm.like(pattern),
+            tx.text_norm.like(pattern),
+            tx.reference_norm.like(pattern),
+        ]
+        candidates = substring_candidate_ids(db, q_norm)
+        if candidates is not None:
+            # Trigram prefilter; the LIKE clauses still decide
+            conds.append(tx.id.in_(candidates))
         conds.append(or_(*clauses))
+    if match is not None:
+        if sort_by == "relevance":
+            q_stmt = q_stmt.join(fts, fts.c.rowid == tx.id)
+            conds.append(fts_match(match))
+        else:
+            conds.append(tx.id.in_(fts_matching_ids(match)))
 
     if conds:
         q_stmt = q_stmt.where(and_(*conds))
@@ -160,6 +188,8 @@ def _get_transaction_select(
         q_stmt = q_stmt.order_by(tx.amount.desc(), tx.id.desc())
     elif sort_by == "amount_asc":
         q_stmt = q_stmt.order_by(tx.amount.asc(), tx.id.asc())
+    elif sort_by == "relevance":
+        q_stmt = q_stmt.order_by(fts.c.rank, tx.id.desc())
 
     return q_stmt
 
@@ -187,14 +217,10 @@ def create_transaction_db(db: Session, payload: TransactionCreate) -> Transactio
 
     # 3) Enforce your batch-aware de-dup rule in app logic:
     #    allow duplicates only when (fingerprint, batch_hash) match exactly.
-    existing = db.scalars(
-        select(TransactionORM).where(TransactionORM.fingerprint == fingerprint)
-    ).all()
-    for e in existing:
-        if getattr(e, "batch_hash", None) != payload.batch_hash:
-            raise Conflict(
-                "Duplicate transaction: fingerprint already exists with a different batch_hash."
-            )
+    if _conflicting_fingerprints(db, [fingerprint], payload.batch_hash):
+        raise Conflict(
+            "Duplicate transaction: fingerprint already exists with a different batch_hash."
+        )
     # Otherwise: either none exist, or all have the same batch_hash -> allowed.
 
     # 4) Insert
@@ -207,15 +233,17 @@ def create_transaction_db(db: Session, payload: TransactionCreate) -> Transactio
         reference=payload.reference,
         batch_hash=payload.batch_hash,
         fingerprint=fingerprint,
+        **_search_columns(payload.entity, payload.text, payload.reference),
     )
 
     try:
-        db.add(obj)
-        db.flush()  # assigns obj.id
+        # SAVEPOINT: a failure only discards this row, not the session's other work
+        with db.begin_nested():
+            db.add(obj)
+            db.flush()  # assigns obj.id
     except IntegrityError as ie:
         # We no longer rely on a unique constraint for fingerprint,
         # but keep this as a safeguard for other constraints.
-        db.rollback()
         raise Conflict(
             "Could not create transaction due to a constraint violation."
         ) from ie
@@ -232,6 +260,254 @@ def create_transaction_db(db: Session, payload: TransactionCreate) -> Transactio
     )
 
 
+# ---- Bulk create ------------------------------------------------------------
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit.
+FINGERPRINT_LOOKUP_CHUNK = 500
+
+
+def _other_batch(batch_hash: Optional[str]):
+    """Rows stored under a batch other than `batch_hash` (NULL counts as a batch)."""
+    if batch_hash is None:
+        return TransactionORM.batch_hash.is_not(None)
+    return or_(TransactionORM.batch_hash.is_(None), TransactionORM.batch_hash != batch_hash)
+
+
+def _conflicting_fingerprints(
+    db: Session, fingerprints: Iterable[str], batch_hash: Optional[str]
+) -> Set[str]:
+    """Return the fingerprints already stored under a batch other than `batch_hash`.
+
+    One probe per chunk, answered from ix_transactions_fingerprint_batch_hash alone.
+    """
+    unique = list(dict.fromkeys(fingerprints))
+    other_batch = _other_batch(batch_hash)
+    found: Set[str] = set()
+    for i in range(0, len(unique), FINGERPRINT_LOOKUP_CHUNK):
+        chunk = unique[i : i + FINGERPRINT_LOOKUP_CHUNK]
+        found.update(
+            db.scalars(
+                select(TransactionORM.fingerprint)
+                .where(TransactionORM.fingerprint.in_(chunk), other_batch)
+                .distinct()
+            ).all()
+        )
+    return found
+
+
+def _payload_fingerprint(p: TransactionCreate) -> str:
+    return make_fingerprint(
+        text=p.text,
+        entity=p.entity,
+        account=p.account_id,
+        amount=p.amount,
+        date=p.date,
+        reference=p.reference,
+    )
+
+
+@dataclass(frozen=True)
+class HighWaterMark:
+    """
+    The newest booking day an account has rows on (ignoring one batch), and
+    the fingerprints stored on that day.
+
+    For payloads of that account and batch the de-dup rule needs no probe:
+    rows dated after the mark cannot be stored yet, rows on the mark are
+    duplicates exactly if their fingerprint is in `fingerprints`.
+    """
+
+    account_id: str
+    batch_hash: Optional[str]
+    date: date
+    fingerprints: FrozenSet[str]
+
+    def stored(self, p: TransactionCreate, fingerprint: str) -> Optional[bool]:
+        """Whether the payload is stored under another batch; None if the mark cannot tell."""
+        if p.account_id != self.account_id or p.batch_hash != self.batch_hash or p.date < self.date:
+            return None
+        return p.date == self.date and fingerprint in self.fingerprints
+
+    def matches(self, p: TransactionCreate) -> bool:
+        """Whether the payload is one of the rows stored on the boundary day."""
+        return p.date == self.date and _payload_fingerprint(p) in self.fingerprints
+
+
+def high_water_mark_db(
+    db: Session, account_id: str, batch_hash: Optional[str]
+) -> Optional[HighWaterMark]:
+    """The account's high-water mark for importing `batch_hash`; None if the
+    account has no rows from other batches. Two probes on ix_transactions_account_id_date."""
+    other_batch = _other_batch(batch_hash)
+    last_date = db.scalar(
+        select(TransactionORM.date)
+        .where(TransactionORM.account_id == account_id, other_batch)
+        .order_by(TransactionORM.date.desc())
+        .limit(1)
+    )
+    if last_date is None:
+        return None
+    fingerprints = db.scalars(
+        select(TransactionORM.fingerprint).where(
+            TransactionORM.account_id == account_id,
+            TransactionORM.date == last_date,
+            other_batch,
+        )
+    ).all()
+    return HighWaterMark(
+        account_id=account_id,
+        batch_hash=batch_hash,
+        date=last_date,
+        fingerprints=frozenset(fingerprints),
+    )
+
+
+def classify_transactions_db(
+    db: Session,
+    payloads: Sequence[TransactionCreate],
+    *,
+    fingerprints: Optional[Sequence[str]] = None,
+    high_water: Optional[HighWaterMark] = None,
+) -> List[bool]:
+    """
+    Apply the batch-aware de-dup rule to a batch of payloads without writing.
+
+    Returns one flag per payload: True if it would be inserted, False if it
+    is a cross-batch duplicate. Needs one indexed probe per batch_hash
+    (imports use a single one); payloads earlier in the sequence claim their
+    fingerprint for their batch, so intra-call duplicates follow the same rule.
+    Payloads a `high_water` mark can decide are not probed.
+    """
+    if fingerprints is None:
+        fingerprints = [_payload_fingerprint(p) for p in payloads]
+
+    known: List[Optional[bool]] = (
+        [high_water.stored(p, fp) for p, fp in zip(payloads, fingerprints)]
+        if high_water is not None
+        else [None] * len(payloads)
+    )
+    fps_by_batch: Dict[Optional[str], List[str]] = defaultdict(list)
+    for p, fp, stored in zip(payloads, fingerprints, known):
+        if stored is None:
+            fps_by_batch[p.batch_hash].append(fp)
+    prefilter = get_fingerprint_filter(db) if FINGERPRINT_PREFILTER else None
+    conflicts: Dict[Optional[str], Set[str]] = {}
+    for batch, fps in fps_by_batch.items():
+        if prefilter is not None:
+            # Only fingerprints the filter cannot rule out need the exact probe
+            fps = [fp for fp, maybe in zip(fps, prefilter.maybe_stored(fps)) if maybe]
+        conflicts[batch] = _conflicting_fingerprints(db, fps, batch) if fps else set()
+        if prefilter is not None:
+            prefilter.record_false_positives(len(set(fps)) - len(conflicts[batch]))
+
+    claimed: Dict[str, Optional[str]] = {}
+    flags: List[bool] = []
+    for p, fp, stored in zip(payloads, fingerprints, known):
+        if stored is None:
+            stored = fp in conflicts[p.batch_hash]
+        if stored or claimed.get(fp, p.batch_hash) != p.batch_hash:
+            flags.append(False)
+            continue
+        claimed[fp] = p.batch_hash
+        flags.append(True)
+    return flags
+
+
+def create_transactions_bulk_db(
+    db: Session,
+    payloads: Sequence[TransactionCreate],
+    *,
+    rules_index: Optional[RulesIndex] = None,
+    errors: Optional[List[Tuple[int, str]]] = None,
+    high_water: Optional[HighWaterMark] = None,
+) -> List[bool]:
+    """
+    Set-based counterpart of `create_transaction_db` for imports.
+
+    Applies the same batch-aware de-dup rule, but resolves accounts, looks up
+    existing fingerprints and inserts new rows in batched statements, and
+    categorizes everything from a single RulesIndex.
+
+    Rows are written inside a SAVEPOINT, so a failure never discards the
+    caller's other pending work. Without `errors` a rejected chunk raises
+    Conflict; with it, the chunk is retried row by row (one SAVEPOINT each)
+    and every rejected row is appended as (payload index, reason).
+    `high_water` is passed on to `classify_transactions_db`.
+
+    Returns one flag per payload: True if inserted, False if skipped as a
+    cross-batch duplicate or rejected.
+    """
+    if not payloads:
+        return []
+
+    # 1) Resolve all referenced accounts at once
+    account_ids = {p.account_id for p in payloads}
+    known_accounts = set(
+        db.scalars(
+            select(AccountORM.public_id).where(AccountORM.public_id.in_(account_ids))
+        ).all()
+    )
+    missing = account_ids - known_accounts
+    if missing:
+        raise NotFound(f"Account '{sorted(missing)[0]}' was not found.")
+
+    # 2) Compute all fingerprints up front
+    fingerprints = [_payload_fingerprint(p) for p in payloads]
+
+    # 3) Batched duplicate probe
+    inserted = classify_transactions_db(
+        db, payloads, fingerprints=fingerprints, high_water=high_water
+    )
+
+    rules_index = rules_index or RulesIndex(db)
+    rows: List[dict] = []
+    row_indexes: List[int] = []
+    for i, (p, fp, is_new) in enumerate(zip(payloads, fingerprints, inserted)):
+        if not is_new:
+            continue
+        row_indexes.append(i)
+        match = rules_index.resolve(entity=p.entity, text=p.text)
+        rows.append(
+            {
+                "text": p.text,
+                "entity": p.entity,
+                "account_id": p.account_id,
+                "date": p.date,
+                "amount": p.amount,
+                "reference": p.reference,
+                "batch_hash": p.batch_hash,
+                "fingerprint": fp,
+                "category_id": match.category_id if match else None,
+                **_search_columns(p.entity, p.text, p.reference),
+            }
+        )
+
+    # 4) Insert (executemany)
+    if rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(TransactionORM), rows)
+        except IntegrityError as ie:
+            if errors is None:
+                raise Conflict(
+                    "Could not create transactions due to a constraint violation."
+                ) from ie
+            # Isolate the offending rows; the others are inserted one by one
+            for i, row in zip(row_indexes, rows):
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(TransactionORM), [row])
+                except IntegrityError as row_error:
+                    inserted[i] = False
+                    errors.append((i, str(row_error.orig)))
+        if FINGERPRINT_PREFILTER:
+            get_fingerprint_filter(db).add(
+                row["fingerprint"] for i, row in zip(row_indexes, rows) if inserted[i]
+            )
+
+    return inserted
+
+
 # ---- Read one ---------------------------------------------------------------
 
 
@@ -289,7 +565,10 @@ def update_transaction_db(db: Session, tx_id: int, payload: TransactionUpdate) -
             category_name=row.category.name if row.category else None,
         )
 
-    # 4) Re-resolve and persist category for updated entity/text, then save
+    # 4) Refresh the search columns, re-resolve and persist category for
+    #    updated entity/text, then save
+    for column, value in _search_columns(row.entity, row.text, row.reference).items():
+        setattr(row, column, value)
     match = RulesIndex(db).resolve(entity=row.entity, text=row.text, transaction_id=row.id)
     row.category_id = match.category_id if match else None
 
@@ -309,7 +588,99 @@ def update_transaction_db(db: Session, tx_id: int, payload: TransactionUpdate) -
 
 # ---- List with filters/pagination -------------------------------------------
 
-SortBy = ("date_desc", "date_asc", "amount_desc", "amount_asc")
+SortBy = ("date_desc", "date_asc", "amount_desc", "amount_asc", "relevance")
+
+# Sort column and direction of the orders with cursor pages; ties are broken by
+# id in the same direction
+_SORT_KEYS = {
+    "date_desc": ("date", True),
+    "date_asc": ("date", False),
+    "amount_desc": ("amount", True),
+    "amount_asc": ("amount", False),
+}
+
+
+def _encode_cursor(sort_by: str, row: TransactionORM) -> str:
+    """Opaque position after `row` in the `sort_by` order."""
+    column, _ = _SORT_KEYS[sort_by]
+    key = getattr(row, column)
+    raw = json.dumps([sort_by, str(key) if column == "amount" else key.isoformat(), row.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """(sort key, id) of the last row of the previous page."""
+    column, _ = _SORT_KEYS[sort_by]
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key, last_id = json.loads(raw)
+        key = Decimal(key) if column == "amount" else date.fromisoformat(key)
+        if not isinstance(last_id, int):
+            raise TypeError(last_id)
+    except (ValueError, TypeError, InvalidOperation):
+        raise BadRequest("Invalid cursor.")
+    if cursor_sort != sort_by:
+        raise BadRequest(f"Cursor was issued for sort_by '{cursor_sort}', not '{sort_by}'.")
+    return key, last_id
+
+
+def _after_cursor(sort_by: str, key: Any, last_id: int):
+    """Rows after (key, last_id) in the `sort_by` order.
+
+    The redundant bound on the sort column alone lets SQLite seek the
+    (column, id) index instead of scanning it from the start.
+    """
+    column_name, descending = _SORT_KEYS[sort_by]
+    column = getattr(TransactionORM, column_name)
+    if descending:
+        return and_(column <= key, or_(column < key, TransactionORM.id < last_id))
+    return and_(column >= key, or_(column > key, TransactionORM.id > last_id))
+
+
+# Totals by (database, data version, normalized filters), least recently used first
+_count_cache: "OrderedDict[tuple, int]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def _count_transactions_db(
+    db: Session,
+    q_stmt: Select,
+    *,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    account_id: Optional[str],
+    category: Optional[str],
+    q: Optional[str],
+    search: Optional[str],
+) -> int:
+    """Number of rows of `q_stmt`, cached until the next write (see services.data_version)."""
+    if not TRANSACTION_COUNT_CACHE_SIZE or has_uncommitted_writes(db):
+        return db.scalar(select(func.count()).select_from(q_stmt.subquery())) or 0
+
+    if category is not None and category.lower() == "null":
+        category = "null"
+    key = (
+        str(db.get_bind().url),
+        current_data_version_db(db),
+        date_from or None,
+        date_to or None,
+        account_id or None,
+        category,
+        normalize_search_text(q) or None,
+        fts_query(search.lower()) if search else None,
+    )
+    with _count_cache_lock:
+        total = _count_cache.get(key)
+        if total is not None:
+            _count_cache.move_to_end(key)
+            return total
+
+    total = db.scalar(select(func.count()).select_from(q_stmt.subquery())) or 0
+    with _count_cache_lock:
+        _count_cache[key] = total
+        while len(_count_cache) > TRANSACTION_COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+    return total
 
 
 def list_transactions_db(
@@ -317,15 +688,32 @@ def list_transactions_db(
     *,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
     sort_by: str = "date_desc",
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     account_id: Optional[str] = None,
     category: Optional[str] = None,
     q: Optional[str] = None,  # substring search across entity/text/reference
+    search: Optional[str] = None,  # word search, see services.search
 ) -> PaginatedTransactions:
+    """
+    One page of transactions.
+
+    Pages are addressed either by `offset` or by `cursor`, the `next_cursor`
+    of the previous page. Cursor pages seek to their first row through the
+    sort index, so they cost the same at any depth; offset pages skip all
+    rows before them. The total is counted only if `with_total` is set, and
+    only once per filter combination until the data changes.
+    Relevance-sorted pages (`search` with sort_by=relevance) use offsets only.
+    """
     if sort_by not in SortBy:
         raise BadRequest(f"Unsupported sort_by '{sort_by}'.")
+    if cursor is not None and offset:
+        raise BadRequest("Pass either cursor or offset, not both.")
+    if cursor is not None and sort_by not in _SORT_KEYS:
+        raise BadRequest(f"sort_by '{sort_by}' has no cursor pages; use offset.")
 
     q_stmt = _get_transaction_select(
         db,
@@ -335,11 +723,31 @@ def list_transactions_db(
         account_id=account_id,
         category=category,
         q=q,
+        search=search,
     )
 
-    total = db.scalar(select(func.count()).select_from(q_stmt.subquery())) or 0
-    q_stmt = q_stmt.limit(limit).offset(offset)
-    rows: List[TransactionORM] = db.scalars(q_stmt).all()
+    total: Optional[int] = None
+    if with_total:
+        total = _count_transactions_db(
+            db,
+            q_stmt,
+            date_from=date_from,
+            date_to=date_to,
+            account_id=account_id,
+            category=category,
+            q=q,
+            search=search,
+        )
+    if cursor is not None:
+        q_stmt = q_stmt.where(_after_cursor(sort_by, *_decode_cursor(cursor, sort_by)))
+    elif offset:
+        q_stmt = q_stmt.offset(offset)
+    # One extra row tells whether there is a next page
+    rows: List[TransactionORM] = db.scalars(q_stmt.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit and sort_by in _SORT_KEYS:
+        next_cursor = _encode_cursor(sort_by, rows[limit - 1])
+    rows = rows[:limit]
 
     items: List[Transaction] = [
         _tx_to_schema(
@@ -351,7 +759,9 @@ def list_transactions_db(
         for r in rows
     ]
 
-    return PaginatedTransactions(items=items, total=total, limit=limit, offset=offset)
+    return PaginatedTransactions(
+        items=items, total=total, limit=limit, offset=offset, next_cursor=next_cursor
+    )
 
 
 # ---- Summary by category at scope/depth -------------------------------------
@@ -366,6 +776,9 @@ def summarize_by_category_db(
     date_to: Optional[str] = None,
     account_id: Optional[str] = None,
     q: Optional[str] = None,
+    search: Optional[str] = None,
+    items: int = 0,
+    items_offset: int = 0,
 ) -> List[TransactionSummary]:
     """
     Summarize by category nodes at a given depth within a scope subtree.
@@ -375,7 +788,11 @@ def summarize_by_category_db(
     - scope_name="Expenses", 2  -> grandchildren of Expenses
     - If a resolved transaction category is shallower than the requested depth within the scope,
       it is grouped under its deepest available ancestor (so shallow nodes are not dropped).
-    - You can filter by account/date/q; there is no separate "group by account".
+    - You can filter by account/date/q/search; there is no separate "group by account".
+
+    Sums and counts are computed in SQL (groups from the category closure,
+    see _summary_groups). Transactions are only loaded with `items` > 0:
+    that many per group, newest first, after skipping `items_offset`.
     """
 
     # Determine scope_id
@@ -383,51 +800,78 @@ def summarize_by_category_db(
     if scope_name:
         scope_id = _find_unique_category_by_name(db, scope_name).id
 
-    # Fetch candidate transactions
+    # Sums per category of the matching transactions (an index-only scan
+    # without account/text filters), then rolled up to the groups: categories
+    # outside the scope have no group and are dropped, uncategorized
+    # transactions form the group None
     q_stmt = _get_transaction_select(
-        db, date_from=date_from, date_to=date_to, account_id=account_id, q=q
+        db, date_from=date_from, date_to=date_to, account_id=account_id, q=q, search=search
     )
-    rows: List[TransactionORM] = db.scalars(q_stmt).all()
-
-    # Build category indexes
-    parent_by_id, name_by_id = _build_category_indexes(db)
-
-    # Aggregate
-    sums: Dict[Optional[str], Decimal] = defaultdict(lambda: Decimal("0"))
-    bucket_items: Dict[Optional[str], List[Transaction]] = defaultdict(list)
-    for r in rows:
-        if not r.category_id:
-            group_name = None  # uncategorized
-            cat_name = None
-        else:
-            group_id = _ancestor_at_scope_depth(
-                r.category_id, parent_by_id, scope_id, depth
-            )
-            if group_id is None:
-                # outside scope; skip
-                continue
-            group_name = name_by_id[group_id]
-            cat_name = r.category.name
-
-        # Convert row to API schema with resolved category
-        tx_schema = _tx_to_schema(
-            r,
-            account_name=r.account.name,
-            account_id=r.account.public_id,
-            category_name=cat_name,
+    matching = q_stmt.order_by(None).subquery()
+    per_category = (
+        select(
+            matching.c.category_id,
+            func.sum(matching.c.amount).label("amount_sum"),
+            func.count().label("count"),
+        )
+        .group_by(matching.c.category_id)
+        .subquery()
+    )
+    groups = _summary_groups(scope_id, depth).subquery()
+    group_category = aliased(CategoryORM)
+    group_name = group_category.name.label("group_name")
+    group_rows = db.execute(
+        select(
+            group_name,
+            func.sum(per_category.c.amount_sum),
+            func.sum(per_category.c.count),
+            func.group_concat(per_category.c.category_id),
         )
+        .select_from(per_category)
+        .outerjoin(groups, groups.c.category_id == per_category.c.category_id)
+        .outerjoin(group_category, group_category.id == groups.c.group_id)
+        .where(or_(per_category.c.category_id.is_(None), groups.c.group_id.is_not(None)))
+        .group_by(group_name)
+    ).all()
 
-        # Aggregate
-        sums[group_name] += r.amount
-        bucket_items[group_name].append(tx_schema)
+    # One page of transactions per group, with the same filters
+    bucket_items: Dict[Optional[str], List[Transaction]] = {}
+    if items > 0:
+        matched = sum(row[2] for row in group_rows)
+        for name, _, count, category_ids in group_rows:
+            # A large group is paged fastest by walking the date index until
+            # the page is full; `+ 0` keeps SQLite from sorting the whole
+            # group out of the category index instead
+            category_id = TransactionORM.category_id
+            if (items_offset + items) * matched < count * count:
+                category_id = category_id + 0
+            in_group = (
+                category_id.in_([int(c) for c in category_ids.split(",")])
+                if name is not None
+                else category_id.is_(None)
+            )
+            rows = db.scalars(q_stmt.where(in_group).limit(items).offset(items_offset)).all()
+            bucket_items[name] = [
+                _tx_to_schema(
+                    r,
+                    account_name=r.account.name,
+                    account_id=r.account.public_id,
+                    category_name=r.category.name if r.category else None,
+                )
+                for r in rows
+            ]
 
     # Format output
-    results: List[TransactionSummary] = []
-    for name, txs in bucket_items.items():
-        results.append(
-            TransactionSummary(key=name, amount_sum=sums[name], transactions=txs)
+    results = [
+        TransactionSummary(
+            key=name,
+            amount_sum=amount_sum,
+            count=count,
+            transactions=bucket_items.get(name, []),
         )
+        for name, amount_sum, count, _ in group_rows
+    ]
 
     # Sort by absolute amount desc, then number of transactions
-    results.sort(key=lambda x: (abs(x.amount_sum), len(x.transactions)), reverse=True)
+    results.sort(key=lambda x: (abs(x.amount_sum), x.count), reverse=True)
     return results
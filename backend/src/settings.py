@@ -18,6 +18,89 @@ else:
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{Path(DB_PATH).resolve()}"
 
+# How transactions.amount / accounts.balance are stored:
+# "decimal" = NUMERIC(18, 2) (default), "cents" = signed 64-bit integer cents.
+# Existing databases are converted by Alembic revision 9c3e5a7d21f4 when it runs
+# with the same setting.
+AMOUNT_STORAGE = os.getenv("AMOUNT_STORAGE", "decimal").strip().lower()
+if AMOUNT_STORAGE not in ("decimal", "cents"):
+    raise RuntimeError("AMOUNT_STORAGE must be 'decimal' or 'cents'.")
+
+# SQLite connection tuning, see database.SQLITE_PROFILES:
+# "wal" (default): WAL journal, synchronous=NORMAL, larger cache, mmap,
+#   in-memory temp tables and a busy timeout
+# "durable": like "wal" but fsync on every commit (synchronous=FULL)
+# "bulk": like "wal" with synchronous=OFF, for one-off bulk loads only
+# "default": SQLite's own defaults (rollback journal, synchronous=FULL)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal").strip().lower()
+if SQLITE_PROFILE not in ("wal", "durable", "bulk", "default"):
+    raise RuntimeError("SQLITE_PROFILE must be 'wal', 'durable', 'bulk' or 'default'.")
+SQLITE_CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Pooled connections of the write engine. Write transactions take SQLite's
+# write lock when they begin and wait up to SQLITE_BUSY_TIMEOUT_MS for it, so
+# a small edit gets in between the committed batches of a running import.
+SQLITE_WRITE_CONNECTIONS = max(1, int(os.getenv("SQLITE_WRITE_CONNECTIONS", "4")))
+
+# Rows per committed chunk when importing CSV uploads
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+
+# In-memory fingerprint set that lets imports skip the duplicate check for
+# fingerprints that are definitely not stored yet. Off by default: with the
+# composite dedup index a warm SQLite probe is cheaper than keeping the set in
+# sync; it pays off for large databases whose index is not cached.
+FINGERPRINT_PREFILTER = os.getenv("FINGERPRINT_PREFILTER", "0").strip() == "1"
+
+# Incremental imports: once an upload is seen to overlap an account's last
+# imported booking day, its rows dated before that day are skipped without a
+# duplicate check. Off by default: a row booked late with an older booking
+# date would be counted as a duplicate instead of being imported.
+INCREMENTAL_IMPORT = os.getenv("INCREMENTAL_IMPORT", "0").strip() == "1"
+
+# Trigram index that answers the `q` substring filter of the transaction list
+# and summary without scanning the table (same results). Costs about as much
+# disk as the indexed text, twice over, and slows imports; created or dropped
+# by initialize_database() to match this setting.
+SEARCH_TRIGRAM = os.getenv("SEARCH_TRIGRAM", "0").strip() == "1"
+
+# Transaction list totals remembered per filter combination until the next
+# write (see services.data_version); 0 counts on every request
+TRANSACTION_COUNT_CACHE_SIZE = max(0, int(os.getenv("TRANSACTION_COUNT_CACHE_SIZE", "256")))
+
+# Background import jobs: worker threads (keep small, SQLite has one writer)
+# and where queued uploads are spooled until their job has run
+IMPORT_WORKERS = max(1, int(os.getenv("IMPORT_WORKERS", "1")))
+IMPORT_UPLOAD_DIR = Path(
+    os.getenv("IMPORT_UPLOAD_DIR") or (Path(DB_PATH).parent / "imports")
+).expanduser().resolve()
+
+# Serve the hot read endpoints (transaction list, balance series, sankey)
+# through an aiosqlite AsyncEngine on the event loop instead of threads.
+# Needs the optional `async` dependencies.
+ASYNC_READS = os.getenv("ASYNC_READS", "0").strip() == "1"
+
+# Request handling, see src/executor.py: threads for heavy endpoints,
+# per-endpoint limits on them (e.g. "sankey=2,import_csv=1") and threads
+# for the remaining sync endpoints (Starlette's default is 40)
+HEAVY_EXECUTOR_WORKERS = max(1, int(os.getenv("HEAVY_EXECUTOR_WORKERS", "4")))
+REQUEST_THREADPOOL_SIZE = max(1, int(os.getenv("REQUEST_THREADPOOL_SIZE", "40")))
+
+
+def _parse_limits(raw: str) -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise RuntimeError(f"ENDPOINT_CONCURRENCY entry {item!r} must be name=limit.")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+ENDPOINT_CONCURRENCY = _parse_limits(os.getenv("ENDPOINT_CONCURRENCY", ""))
+
 
 def _load_bytes_from_env(var: str) -> bytes:
     val = os.getenv(var, "")
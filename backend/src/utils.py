@@ -2,7 +2,7 @@ import re
 import hmac
 import datetime as dt
 from hashlib import sha256
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
 
@@ -35,6 +35,23 @@ def make_fingerprint(
     return sha256(raw).hexdigest()
 
 
+CENT = Decimal("0.01")
+
+
+def to_cents(value) -> int:
+    """Signed integer cents for a Decimal-like amount (rounded half-up to 2 places)."""
+    if value is None:
+        return 0
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Two-decimal Decimal for integer cents (e.g. -250000 -> Decimal('-2500.00'))."""
+    return Decimal(cents).scaleb(-2)
+
+
 # ----- Bank Service-level errors ---------------------------------------------------
 
 
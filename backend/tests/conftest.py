@@ -33,7 +33,10 @@ def tmp_db_file():
     try:
         yield path
     finally:
-        os.remove(path)
+        # WAL mode leaves -wal/-shm files next to the database
+        for p in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(p):
+                os.remove(p)
 
 
 @pytest.fixture(scope="session")
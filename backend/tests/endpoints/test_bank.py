@@ -7,7 +7,7 @@ from pathlib import Path
 import io
 import pytest
 
-from src.services.csv_parsers import parse_csv_file
+from src.services.csv_parsers import iter_csv_file, parse_csv_file
 
 
 @pytest.mark.order(40)
@@ -64,3 +64,665 @@ def test_dkb_csv_parsing():
     # Verify all transactions are properly ordered (newest first, as they appear in CSV)
     dates = [t.date for t in transactions]
     assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.order(42)
+def test_dkb_csv_streaming_matches_parse():
+    """Incremental parsing of a binary upload yields the same data as parse_csv_file."""
+    raw = (Path(__file__).parent / "../mock_data/bank/mock_dkb.csv").read_bytes()
+    file_obj = io.BytesIO(raw)
+
+    streamed = list(iter_csv_file(file_obj, "dkb", "TEST HOLDER"))
+    assert len(streamed) == 1
+    transactions = list(streamed[0].transactions)
+
+    # The caller's file is left open and can be parsed again
+    assert not file_obj.closed
+    parsed = parse_csv_file(file_obj, "dkb", "TEST HOLDER")
+    assert streamed[0].account == parsed.accounts[0]
+    assert transactions == parsed.transactions_per_account[0]
+
+
+@pytest.mark.order(43)
+def test_columnar_decoding_matches_scalar_parsers():
+    """Columnar amount/date decoding yields exactly the scalar parsers' values."""
+    from src.services.csv_parsers.decoding import german_amounts_to_cents, german_dates_to_ordinals
+    from src.services.csv_parsers.dkb_parser import DKBParser
+    from src.utils import from_cents
+
+    parser = DKBParser()
+    amounts = ["-2.500,00", "+45,67", "0,00", "-0,00", "1.234.567,89", "12,5",
+               "0", "", "1234,56", " -7,10 ", "1.2345,00", "abc"]
+    for raw, cents in zip(amounts, german_amounts_to_cents(amounts)):
+        if cents is None:
+            continue  # falls back to the scalar parser
+        expected = parser._parse_german_amount(raw)
+        assert from_cents(cents) == expected
+        assert str(from_cents(cents)) == str(expected)  # fingerprints use str()
+
+    dates = ["10.01.25", "10.01.2025", "1.2.68", "1.2.69", "29.02.24", "31.02.24",
+             "10.01.202", "2025-01-10", "10.01.25"]
+    memo = {}
+    for raw, ordinal in zip(dates, german_dates_to_ordinals(dates, memo)):
+        if ordinal is None:
+            continue
+        assert ordinal == parser._parse_german_date(raw).toordinal()
+    assert len(memo) == len(set(dates))
+
+
+@pytest.mark.order(43)
+def test_dkb_negative_zero_row_keeps_scalar_fingerprint(caplog):
+    """A '-0,00' row decodes and fingerprints like the scalar parser; unparseable
+    rows are logged and skipped."""
+    from src.services.csv_parsers.dkb_parser import DKBParser
+    from src.utils import make_fingerprint
+
+    lines = (Path(__file__).parent / "../mock_data/bank/mock_dkb.csv").read_text().splitlines()
+    header_end = next(i for i, line in enumerate(lines) if line.startswith('"Buchungsdatum"')) + 1
+    rows = [
+        '"09.01.2025";"09.01.2025";"";"Gutschrift";"MOCK BANK";"Storno";"";"";"-0,00";"";"";""',
+        '"kein Datum";"";"";"";"MOCK SHOP";"Defekt";"";"";"-1,00";"";"";""',
+    ]
+    raw = "\n".join(lines[:header_end] + rows + lines[header_end:]).encode()
+
+    with caplog.at_level("WARNING", logger="src.services.csv_parsers.dkb_parser"):
+        (streamed,) = iter_csv_file(io.BytesIO(raw), "dkb", "TEST HOLDER")
+        transactions = list(streamed.transactions)
+    assert [r.getMessage() for r in caplog.records] == [
+        f"Could not parse transaction line {header_end + 2}: "
+        "Error parsing transaction: Could not parse date: kein Datum"
+    ]
+
+    zero = next(t for t in transactions if t.text == "Storno")
+    scalar = DKBParser()._parse_german_amount("-0,00")
+    assert str(zero.amount) == str(scalar)
+
+    def fingerprint(amount):
+        return make_fingerprint(zero.text, zero.peer, "ACC", amount, zero.date, None)
+
+    assert fingerprint(zero.amount) == fingerprint(scalar)
+
+
+@pytest.mark.order(44)
+def test_parser_auto_detection_by_signature():
+    """Auto-detection matches parser signatures against the first lines only."""
+    from src.services.csv_parsers.base import CSVParser, ParserSignature
+    from src.services.csv_parsers.registry import ParserRegistry
+
+    class SemicolonBankParser(CSVParser):
+        name = "semicolon_bank"
+        bank_name = "Semicolon Bank"
+        signature = ParserSignature(header_tokens=("Datum", "Betrag", "Empfänger"))
+
+        def can_parse(self, file_content):
+            raise AssertionError("signature parsers are not probed with can_parse")
+
+        def parse(self, file, holder_name=None):
+            raise NotImplementedError
+
+    registry = ParserRegistry()
+    registry.register(SemicolonBankParser())
+
+    tagesgeld = (Path(__file__).parent / "../mock_data/bank/mock_dkb_tagesgeld.csv").read_text()
+    assert registry.auto_detect(tagesgeld).name == "dkb"
+    assert registry.auto_detect('Konto,1\n"Datum","Empfänger","Betrag"\n').name == "semicolon_bank"
+    # Header tokens must be whole cells, and header lines beyond the signature's window miss
+    assert registry.auto_detect("Datum;Betrag;Empfänger-IBAN\n") is None
+    assert registry.auto_detect("x\n" * 10 + "Datum;Betrag;Empfänger\n") is None
+    # The IBAN check on the first line still applies to DKB files
+    assert registry.auto_detect(tagesgeld.replace('"DE02', '"XX02')) is None
+
+
+def _bank_rows():
+    from src.services.bank_models import BankTransaction
+
+    return [
+        BankTransaction(text="Monatsmiete", peer="MOCK LANDLORD", amount=Decimal("-950.00"),
+                        date="01.03.2025", customerreference=None),
+        BankTransaction(text="Einkauf", peer="Edeka", amount=Decimal("-12.30"),
+                        date="02.03.2025", customerreference="REF-1"),
+        # Identical row within the same file: both are kept
+        BankTransaction(text="Einkauf", peer="Edeka", amount=Decimal("-12.30"),
+                        date="02.03.2025", customerreference="REF-1"),
+        # Unparseable date: skipped
+        BankTransaction(text="Broken", peer="Nobody", amount=Decimal("-1.00"),
+                        date="not-a-date", customerreference=None),
+    ]
+
+
+@pytest.mark.order(70)
+def test_import_bank_payload_bulk(client):
+    """Bulk import inserts new rows, categorizes them and skips re-imports."""
+    import src.database as dbmod
+    from src.models import Transaction as TransactionORM
+    from src.services.bank import import_bank_payload
+    from src.services.bank_models import BankAccount
+    from sqlalchemy import select
+
+    account = BankAccount(
+        name="Importkonto", amount=Decimal("100.00"),
+        iban="DE00 1234 5678 9012 3456 78", holder_name="TEST HOLDER",
+    )
+
+    db = dbmod.SessionLocal()
+    try:
+        assert import_bank_payload(db, [account], [_bank_rows()]) == {"Importkonto": 3}
+        db.commit()
+
+        # Re-importing the same rows in a new batch inserts nothing
+        assert import_bank_payload(db, [account], [_bank_rows()]) == {}
+        db.commit()
+
+        rows = db.scalars(
+            select(TransactionORM).where(TransactionORM.text == "Einkauf")
+        ).all()
+        assert len(rows) == 2
+        assert len({r.fingerprint for r in rows}) == 1
+        # Edeka has a default rule in the mock data
+        assert all(r.category_id is not None for r in rows)
+    finally:
+        db.close()
+
+
+@pytest.mark.order(71)
+def test_csv_import_streaming_batches(client, monkeypatch):
+    """The upload is imported in committed chunks; a re-upload inserts nothing."""
+    import src.routers.bank as bank_router
+
+    monkeypatch.setattr(bank_router, "IMPORT_BATCH_SIZE", 2)
+    raw = (Path(__file__).parent / "../mock_data/bank/mock_dkb_tagesgeld.csv").read_bytes()
+
+    def upload():
+        return client.post(
+            "/api/bank/import_csv",
+            files={"file": ("tagesgeld.csv", raw, "text/csv")},
+            data={"holder_name": "TEST HOLDER"},
+        )
+
+    r = upload()
+    assert r.status_code == 200, r.text
+    assert r.json()["inserted"] == {"Tagesgeld": 5}
+
+    r = upload()
+    assert r.status_code == 200, r.text
+    assert r.json()["inserted"] == {}
+
+
+@pytest.mark.order(72)
+def test_csv_import_empty_file(client):
+    r = client.post(
+        "/api/bank/import_csv",
+        files={"file": ("empty.csv", b"", "text/csv")},
+        data={"holder_name": "TEST HOLDER"},
+    )
+    assert r.status_code == 400, r.text
+
+
+@pytest.mark.order(73)
+def test_import_job_progress_and_cancel(client):
+    """A queued import runs in the background and reports row counters."""
+    import time
+
+    # A later export of the same period: new file, same rows
+    raw = (Path(__file__).parent / "../mock_data/bank/mock_dkb_tagesgeld.csv").read_bytes()
+    raw = raw.replace(b"Kontostand vom 31.03.2024", b"Kontostand vom 02.04.2024")
+    r = client.post(
+        "/api/bank/import_jobs",
+        files={"file": ("tagesgeld.csv", raw, "text/csv")},
+        data={"holder_name": "TEST HOLDER"},
+    )
+    assert r.status_code == 202, r.text
+    job_id = r.json()["id"]
+
+    for _ in range(100):
+        job = client.get(f"/api/bank/import_jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.05)
+
+    # Same rows as the synchronous import above: every row is a duplicate
+    assert job["status"] == "completed", job
+    assert job["rows_parsed"] == 5
+    assert job["rows_inserted"] == 0
+    assert job["rows_duplicate"] == 5
+    assert job["rows_failed"] == 0
+
+    assert any(j["id"] == job_id for j in client.get("/api/bank/import_jobs").json())
+    assert client.post(f"/api/bank/import_jobs/{job_id}/cancel").status_code == 409
+    assert client.get("/api/bank/import_jobs/unknown").status_code == 404
+
+
+@pytest.mark.order(74)
+def test_import_csv_files_parallel(client, tmp_path):
+    """Files parsed in a process pool are imported one batch per file."""
+    import src.database as dbmod
+    from src.services.bank import import_csv_files
+
+    raw = (Path(__file__).parent / "../mock_data/bank/mock_dkb_tagesgeld.csv").read_text()
+    raw = raw.replace("DE02120300000000202051", "DE89370400440532013000").replace(
+        "Tagesgeld", "Festgeld", 1
+    )
+    first, overlapping = tmp_path / "2024-03.csv", tmp_path / "2024-04.csv"
+    first.write_text(raw)
+    overlapping.write_text(raw)
+
+    db = dbmod.SessionLocal()
+    try:
+        counts = import_csv_files(
+            db, [str(first), str(overlapping)], "dkb", "TEST HOLDER", max_workers=2
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    # Rows repeated in the second export are skipped as duplicates
+    assert counts == {"Festgeld": 5}
+
+
+@pytest.mark.order(75)
+def test_fingerprint_prefilter_skips_known_rows(client, monkeypatch):
+    """Known rows go through the exact check; new ones are answered by the filter."""
+    from sqlalchemy import select
+
+    import src.database as dbmod
+    import src.services.fingerprint_filter as fingerprint_filter
+    import src.services.transactions as tx_service
+    from src.models import Transaction as TransactionORM
+    from src.services.bank import import_bank_stream
+    from src.services.bank_models import BankAccount, BankTransaction
+    from src.services.csv_parsers import StreamedBankData
+    from src.services.fingerprint_filter import FingerprintFilter
+
+    flt = FingerprintFilter(dbmod.engine)
+    db = dbmod.SessionLocal()
+    try:
+        stored = db.scalars(select(TransactionORM.fingerprint)).all()
+    finally:
+        db.close()
+
+    assert all(flt.maybe_stored(stored))
+    assert flt.maybe_stored(["f" * 64, "0123abcd" * 8]) == [False, False]
+    flt.add(["f" * 64])
+    assert flt.maybe_stored(["f" * 64]) == [True]
+
+    stats = flt.to_schema()
+    assert stats.lookups == len(stored) + 3
+    assert stats.definitely_new == 2
+    assert stats.size == len(set(stored)) + 1
+
+    # The endpoint (read engine) reports the filter that imports (write engine) use
+    monkeypatch.setattr(tx_service, "FINGERPRINT_PREFILTER", True)
+    monkeypatch.setattr(fingerprint_filter, "FINGERPRINT_PREFILTER", True)
+    before = client.get("/api/bank/fingerprint_filter").json()
+    account = BankAccount(
+        name="Filterkonto", amount=Decimal("0.00"),
+        iban="DE44 5001 0517 5407 3249 31", holder_name="TEST HOLDER",
+    )
+    rows = [
+        BankTransaction(text=f"Filter {i}", peer="Shop", amount=Decimal("-1.00"),
+                        date="02.06.2025", customerreference=None)
+        for i in range(3)
+    ]
+    for _ in range(2):  # new rows, then the same rows as duplicates
+        db = dbmod.SessionLocal()
+        try:
+            import_bank_stream(
+                db, [StreamedBankData(account=account, transactions=iter(rows))],
+                incremental=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    r = client.get("/api/bank/fingerprint_filter")
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["enabled"] is True
+    assert body["lookups"] - before["lookups"] == 6
+    assert body["definitely_new"] - before["definitely_new"] == 3
+    assert body["size"] >= len(set(stored)) + 3
+
+
+@pytest.mark.order(76)
+def test_csv_import_dry_run(client):
+    """A dry run classifies rows per account and writes nothing; it reads
+    without taking the single write connection."""
+    from sqlalchemy import event
+
+    import src.database as dbmod
+
+    raw = (Path(__file__).parent / "../mock_data/bank/mock_dkb_tagesgeld.csv").read_text()
+    raw += '"30.03.24";"30.03.24";"Gebucht";"MOCK HOLDER";"Edeka";"Einkauf";"Ausgang";"";"-5,00";"";"";""\n'
+
+    def preview(content):
+        checkouts = []
+
+        def on_checkout(*args):
+            checkouts.append(args)
+
+        event.listen(dbmod.engine, "checkout", on_checkout)
+        try:
+            r = client.post(
+                "/api/bank/import_csv",
+                files={"file": ("tagesgeld.csv", content.encode(), "text/csv")},
+                data={"holder_name": "TEST HOLDER", "dry_run": "true"},
+            )
+        finally:
+            event.remove(dbmod.engine, "checkout", on_checkout)
+        assert r.status_code == 200, r.text
+        assert checkouts == []
+        return r.json()["preview"]["accounts"]
+
+    n_accounts = len(client.get("/api/accounts").json())
+    n_transactions = client.get("/api/transactions", params={"limit": 1}).json()["total"]
+
+    [known] = preview(raw)
+    assert known["account_exists"] is True
+    assert (known["rows_parsed"], known["rows_new"], known["rows_duplicate"]) == (6, 1, 5)
+    assert known["rows_unparseable"] == 0
+    [row] = known["new_rows"]
+    assert row["entity"] == "Edeka" and row["amount"] == "-5.00"
+    assert row["category_name"] is not None
+    assert known["new_by_category"] == {row["category_name"]: 1}
+
+    # Unknown IBAN: the account would be created and every row is new
+    [unknown] = preview(raw.replace("DE02120300000000202051", "DE75512108001245126199"))
+    assert unknown["account_exists"] is False
+    assert unknown["rows_new"] == 6 and unknown["rows_duplicate"] == 0
+
+    assert len(client.get("/api/accounts").json()) == n_accounts
+    assert client.get("/api/transactions", params={"limit": 1}).json()["total"] == n_transactions
+
+
+@pytest.mark.order(77)
+def test_import_isolates_rejected_rows(client):
+    """A row the database rejects is reported; the rest of the import is kept."""
+    from sqlalchemy import text
+
+    import src.database as dbmod
+    from src.services.bank import ImportStats, import_bank_stream
+    from src.services.bank_models import BankAccount, BankTransaction
+    from src.services.csv_parsers import StreamedBankData
+
+    account = BankAccount(
+        name="Fehlerkonto", amount=Decimal("0.00"),
+        iban="DE91 1000 0000 0123 4567 89", holder_name="TEST HOLDER",
+    )
+    rows = [
+        BankTransaction(text="Gut 1", peer="Shop", amount=Decimal("-1.00"),
+                        date="01.04.2025", customerreference=None),
+        BankTransaction(text="Kaputt", peer="REJECT ME", amount=Decimal("-2.00"),
+                        date="02.04.2025", customerreference=None),
+        BankTransaction(text="Gut 2", peer="Shop", amount=Decimal("-3.00"),
+                        date="03.04.2025", customerreference=None),
+        BankTransaction(text="Datum", peer="Shop", amount=Decimal("-4.00"),
+                        date="31.02.2025", customerreference=None),
+    ]
+
+    db = dbmod.SessionLocal()
+    try:
+        db.execute(text(
+            "CREATE TEMP TRIGGER reject_me BEFORE INSERT ON transactions "
+            "WHEN NEW.entity = 'REJECT ME' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+        stats = ImportStats()
+        counts = import_bank_stream(
+            db, [StreamedBankData(account=account, transactions=iter(rows))], stats=stats
+        )
+        db.commit()
+
+        assert counts == {"Fehlerkonto": 2}
+        assert (stats.parsed, stats.inserted, stats.duplicates, stats.failed) == (4, 2, 0, 2)
+        assert [(e.account, e.row) for e in stats.errors] == [("Fehlerkonto", 2), ("Fehlerkonto", 4)]
+        assert "rejected" in stats.errors[0].reason
+        assert "31.02.2025" in stats.errors[1].reason
+    finally:
+        db.execute(text("DROP TRIGGER IF EXISTS reject_me"))
+        db.close()
+
+    # The account created in the same transaction survived the rejected row
+    accounts = {a["name"] for a in client.get("/api/accounts").json()}
+    assert "Fehlerkonto" in accounts
+
+
+@pytest.mark.order(78)
+def test_import_ledger_short_circuits_reimports(client):
+    """Identical and truncated re-uploads are answered from the ledger;
+    an interrupted import resumes without inserting its rows twice."""
+    import io
+
+    from sqlalchemy import func, select
+
+    import src.database as dbmod
+    from src.models import Transaction as TransactionORM
+    from src.services.bank import ImportStats, import_csv_data
+    from src.services.import_ledger import digest_file
+
+    raw = (Path(__file__).parent / "../mock_data/bank/mock_dkb_tagesgeld.csv").read_bytes()
+    raw = raw.replace(b"DE02120300000000202051", b"DE75512108001245126199").replace(
+        b"Tagesgeld", b"Ledgerkonto", 1
+    )
+    lines = raw.splitlines(keepends=True)
+
+    # CRLF copies and trailing blank lines do not change the identity
+    crlf = raw.replace(b"\n", b"\r\n") + b"\r\n"
+    assert digest_file(io.BytesIO(crlf)) == digest_file(io.BytesIO(raw))
+
+    class _Stop(Exception):
+        pass
+
+    def stop_in_second_batch(stats):
+        if stats.parsed == 4:
+            raise _Stop()
+
+    def count_rows(db):
+        return db.scalar(
+            select(func.count()).select_from(TransactionORM).where(
+                TransactionORM.batch_hash == digest_file(io.BytesIO(raw)).content_hash
+            )
+        )
+
+    db = dbmod.SessionLocal()
+    try:
+        # Interrupted after the first batch of 2 rows was committed...
+        with pytest.raises(_Stop):
+            import_csv_data(db, io.BytesIO(raw), "dkb", "TEST HOLDER", batch_size=2,
+                            on_batch=stop_in_second_batch)
+        db.rollback()
+        assert count_rows(db) == 2
+
+        # ...and resumed: only the remaining rows are parsed and inserted
+        stats = ImportStats()
+        counts = import_csv_data(db, io.BytesIO(raw), "dkb", "TEST HOLDER", batch_size=2,
+                                 stats=stats)
+        db.commit()
+        assert counts == {"Ledgerkonto": 3}
+        assert (stats.parsed, stats.inserted) == (3, 3)
+        assert count_rows(db) == 5
+    finally:
+        db.close()
+
+    def upload(content):
+        r = client.post(
+            "/api/bank/import_csv",
+            files={"file": ("ledger.csv", content, "text/csv")},
+            data={"holder_name": "TEST HOLDER"},
+        )
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    for content in (raw, crlf, b"".join(lines[:7])):
+        body = upload(content)
+        assert body["already_imported"] is True
+        assert body["inserted"] == {} and body["rows"]["parsed"] == 0
+
+    # Not a prefix (a row was changed): imported and de-duplicated as usual
+    changed = b"".join(lines[:6]) + lines[6].replace(b"Umbuchung", b"Umbuchung 2")
+    body = upload(changed)
+    assert body["already_imported"] is False
+    assert body["rows"] == {"parsed": 2, "inserted": 1, "duplicates": 1, "failed": 0}
+
+
+@pytest.mark.order(79)
+@pytest.mark.parametrize("incremental", [True, False], ids=["incremental", "default"])
+def test_incremental_import_uses_high_water_mark(client, monkeypatch, incremental):
+    """With INCREMENTAL_IMPORT, overlapping exports only probe rows older than
+    the last imported day until the overlap is seen; older rows are then
+    skipped, a late-booked one included. Without it (the default) every row is
+    de-duplicated by lookup and the late row is imported. Backfills are
+    de-duplicated as usual."""
+    import src.database as dbmod
+    import src.services.bank as bank_service
+    import src.services.transactions as tx_service
+    from src.services.bank import ImportStats, import_bank_stream
+    from src.services.bank_models import BankAccount, BankTransaction
+    from src.services.csv_parsers import StreamedBankData
+
+    monkeypatch.setattr(bank_service, "INCREMENTAL_IMPORT", incremental)
+    name = "Inkrementell" if incremental else "Vollständig"
+    account = BankAccount(
+        name=name, amount=Decimal("0.00"),
+        iban=f"DE27 1002 0500 0003 2874 0{int(incremental)}", holder_name="TEST HOLDER",
+    )
+
+    def row(text, date):
+        return BankTransaction(text=text, peer="Shop", amount=Decimal("-5.00"),
+                               date=date, customerreference=None)
+
+    probes = []
+    real_probe = tx_service._conflicting_fingerprints
+
+    def counting_probe(db, fingerprints, batch_hash):
+        fingerprints = list(fingerprints)
+        probes.append(len(fingerprints))
+        return real_probe(db, fingerprints, batch_hash)
+
+    monkeypatch.setattr(tx_service, "_conflicting_fingerprints", counting_probe)
+
+    def run(rows, **kwargs):
+        stats = ImportStats()
+        db = dbmod.SessionLocal()
+        try:
+            counts = import_bank_stream(
+                db, [StreamedBankData(account=account, transactions=iter(rows))],
+                stats=stats, batch_size=2, **kwargs
+            )
+            db.commit()
+        finally:
+            db.close()
+        return counts, stats
+
+    # Newest first, like a DKB export
+    counts, _ = run([row("C", "03.05.2025"), row("B", "02.05.2025"), row("A", "01.05.2025")])
+    assert counts == {name: 3}
+
+    # Weekly export: one new day, the boundary day, then history, with a row
+    # booked late on 01.05
+    probes.clear()
+    weekly = [row("D", "04.05.2025"), row("C", "03.05.2025"),
+              row("B", "02.05.2025"), row("late", "01.05.2025")]
+    counts, stats = run(weekly)
+    if incremental:
+        # The late row is behind the mark and is skipped without a lookup
+        assert counts == {name: 1}
+        assert (stats.parsed, stats.inserted, stats.duplicates) == (4, 1, 3)
+        assert probes == []
+
+        # Passing incremental=False overrides the setting: the late row is found
+        counts, _ = run(weekly, incremental=False)
+        assert counts == {name: 1}
+    else:
+        assert counts == {name: 2}
+        assert (stats.parsed, stats.inserted, stats.duplicates) == (4, 2, 2)
+        assert probes  # the stored rows were looked up
+
+    # A backfill that never reaches the mark is checked row by row
+    probes.clear()
+    counts, stats = run([row("A", "01.05.2025"), row("old", "15.04.2025")])
+    assert counts == {name: 1}
+    assert (stats.inserted, stats.duplicates) == (1, 1)
+    assert probes  # the known row was looked up (the prefilter may rule out the new one)
+
+
+@pytest.mark.order(80)
+def test_write_while_import_holds_the_writer(client):
+    """A small write during an import waits for the import's current batch,
+    not for the whole import; past the busy timeout it is answered with 503."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sqlalchemy import event
+
+    import src.database as dbmod
+    from src.services.bank import import_bank_stream
+    from src.services.bank_models import BankAccount, BankTransaction
+    from src.services.csv_parsers import StreamedBankData
+
+    account = BankAccount(
+        name="Schreibkonto", amount=Decimal("0.00"),
+        iban="DE00 1111 2222 3333 4444 55", holder_name="TEST HOLDER",
+    )
+    ausgaben = next(
+        c for c in client.get("/api/categories/").json()
+        if c["name"] == "Ausgaben" and c["parent_name"] is None
+    )
+    category = client.post(
+        "/api/categories/", json={"name": "Schreibtest", "parent_id": ausgaben["id"]}
+    ).json()
+
+    def import_holding_first_batch(tag, holding, release):
+        def on_batch(stats):
+            # The batch's rows are written, its transaction holds the write lock
+            if stats.parsed == 2:
+                holding.set()
+                release.wait(timeout=10)
+
+        rows = [
+            BankTransaction(text=f"{tag} {i}", peer="Shop", amount=Decimal("-1.00"),
+                            date=f"0{i + 1}.06.2025", customerreference=None)
+            for i in range(4)
+        ]
+        db = dbmod.SessionLocal()
+        try:
+            counts = import_bank_stream(
+                db, [StreamedBankData(account=account, transactions=iter(rows))],
+                batch_size=2, on_batch=on_batch, incremental=False,
+            )
+            db.commit()
+            return counts
+        finally:
+            db.close()
+
+    def rename(name):
+        return client.patch(f"/api/categories/{category['id']}", json={"name": name})
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        holding, release = threading.Event(), threading.Event()
+        imported = pool.submit(import_holding_first_batch, "Warten", holding, release)
+        assert holding.wait(timeout=5)
+        renamed = pool.submit(rename, "Schreibtest 2")
+        time.sleep(0.1)
+        assert not renamed.done()  # queued for the write lock
+        release.set()
+        assert renamed.result().status_code == 200
+        assert imported.result() == {"Schreibkonto": 4}
+
+        @event.listens_for(dbmod.engine, "checkout")
+        def short_busy_timeout(dbapi_connection, connection_record, connection_proxy):
+            dbapi_connection.execute("PRAGMA busy_timeout=50")
+
+        holding, release = threading.Event(), threading.Event()
+        try:
+            imported = pool.submit(import_holding_first_batch, "Besetzt", holding, release)
+            assert holding.wait(timeout=5)
+            r = rename("Schreibtest 3")
+            assert r.status_code == 503
+            assert r.headers["Retry-After"] == "1"
+        finally:
+            release.set()
+            event.remove(dbmod.engine, "checkout", short_busy_timeout)
+            assert imported.result() == {"Schreibkonto": 4}
+            dbmod.engine.dispose()  # reconnect with the configured busy timeout
+
+    assert client.get(f"/api/categories/{category['id']}").json()["name"] == "Schreibtest 2"
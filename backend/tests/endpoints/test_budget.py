@@ -119,3 +119,33 @@ def test_budget_category_series_special_and_errors(client):
         ).status_code
         == 400
     )
+
+
+@pytest.mark.order(61)
+def test_dashboards_read_while_import_writes(client):
+    """GET endpoints use the read-only engine: they answer while a writer holds
+    the single write connection, and only see committed rows."""
+    import datetime as dt
+
+    import src.database as dbmod
+    from src.models import Transaction as TransactionORM
+
+    before = client.get("/api/budget/sankey").json()["totals"]
+
+    db = dbmod.SessionLocal()
+    try:
+        account_id = client.get("/api/accounts").json()[0]["public_id"]
+        db.add(TransactionORM(
+            account_id=account_id, date=dt.date.today(), amount=Decimal("-999.00"),
+            text="uncommitted", entity="Writer", fingerprint="f" * 64, batch_hash="w" * 64,
+        ))
+        db.flush()  # holds the write connection and the write lock
+
+        r = client.get("/api/budget/sankey")
+        assert r.status_code == 200, r.text
+        assert r.json()["totals"] == before
+        assert client.get("/api/balances/series").status_code == 200
+        assert client.get("/api/transactions", params={"q": "uncommitted"}).json()["total"] == 0
+    finally:
+        db.rollback()
+        db.close()
@@ -2,6 +2,8 @@ import json
 import pytest
 from pathlib import Path
 
+from sqlalchemy import select
+
 
 with open(Path(__file__).parent / "../mock_data/categories.json") as f:
     CATEGORIES = json.load(f)
@@ -160,3 +162,82 @@ def test_delete_cascades_to_subtree_and_rules(client):
     rules = client.get("/api/rules/").json()
     assert not any(r["id"] == rule_id for r in rules), \
         f"rule {rule_id} should have been cascade-deleted, got: {rules}"
+
+
+def _closure_matches_parents():
+    """The category_closure rows equal the pairs found by walking parent_id."""
+    import src.database as dbmod
+    from src.models import Category as CategoryORM, CategoryClosure as CategoryClosureORM
+
+    with dbmod.SessionLocal() as db:
+        parent_by_id = dict(db.execute(select(CategoryORM.id, CategoryORM.parent_id)).all())
+        stored = set(
+            db.execute(
+                select(
+                    CategoryClosureORM.ancestor_id,
+                    CategoryClosureORM.descendant_id,
+                    CategoryClosureORM.depth,
+                )
+            ).all()
+        )
+    expected = set()
+    for cid in parent_by_id:
+        cur, depth = cid, 0
+        while cur is not None:
+            expected.add((cur, cid, depth))
+            cur, depth = parent_by_id[cur], depth + 1
+    return stored == expected
+
+
+@pytest.mark.order(27)
+def test_move_category_keeps_closure_in_sync(client):
+    """Moving a category takes its subtree along; the closure table follows
+    creates, moves and deletes."""
+    ausgaben_id = _find_id(client, "Ausgaben")
+    einnahmen_id = _find_id(client, "Einnahmen")
+    parent_id = client.post(
+        "/api/categories/", json={"name": "MoveRoot", "parent_id": ausgaben_id}
+    ).json()["id"]
+    child_id = client.post(
+        "/api/categories/", json={"name": "MoveChild", "parent_id": parent_id}
+    ).json()["id"]
+    leaf_id = client.post(
+        "/api/categories/", json={"name": "MoveLeaf", "parent_id": child_id}
+    ).json()["id"]
+    assert _closure_matches_parents()
+
+    resp = client.patch(f"/api/categories/{child_id}", json={"parent_id": einnahmen_id})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["parent_name"] == "Einnahmen"
+    assert _closure_matches_parents()
+    tree = client.get(f"/api/categories/tree?parent_id={einnahmen_id}").json()
+    moved = next(n for n in tree if n["id"] == child_id)
+    assert [n["id"] for n in moved["children"]] == [leaf_id]
+    assert client.get(f"/api/categories/tree?parent_id={parent_id}").json() == []
+
+    # Not into its own subtree, not next to a same-named sibling
+    assert client.patch(
+        f"/api/categories/{child_id}", json={"parent_id": leaf_id}
+    ).status_code == 409
+    assert client.patch(
+        f"/api/categories/{child_id}", json={"parent_id": child_id}
+    ).status_code == 409
+    twin_id = client.post(
+        "/api/categories/", json={"name": "MoveChild", "parent_id": parent_id}
+    ).json()["id"]
+    assert client.patch(
+        f"/api/categories/{child_id}", json={"parent_id": parent_id}
+    ).status_code == 409
+    assert client.patch(
+        f"/api/categories/{child_id}", json={"parent_id": 10**9}
+    ).status_code == 404
+    assert client.patch(
+        f"/api/categories/{ausgaben_id}", json={"parent_id": einnahmen_id}
+    ).status_code == 409
+    assert _closure_matches_parents()
+
+    for cid in (parent_id, child_id):
+        assert client.delete(f"/api/categories/{cid}").status_code == 204
+    for cid in (parent_id, child_id, leaf_id, twin_id):
+        assert client.get(f"/api/categories/{cid}").status_code == 404
+    assert _closure_matches_parents()
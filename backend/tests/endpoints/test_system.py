@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.mark.order(62)
+def test_heavy_endpoint_lane_limit(client, monkeypatch):
+    """Sankey calls beyond the lane limit queue up (and show in the metrics);
+    light endpoints keep answering meanwhile."""
+    import src.routers.budget as budget_router
+    from src.executor import DEFAULT_LANE_LIMITS, executor_stats
+    from src.settings import ASYNC_READS
+
+    limit = DEFAULT_LANE_LIMITS["sankey"]
+    real_sankey = budget_router.build_sankey_db
+    release = threading.Event()
+    lock = threading.Lock()
+    running = peak = 0
+
+    def sankey_lane():
+        return {lane.name: lane for lane in executor_stats().lanes}["sankey"]
+
+    def held_sankey(db, **kwargs):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        # With ASYNC_READS the service runs on the loop, where waiting for the
+        # test would block it; the calls only run one at a time there
+        if ASYNC_READS:
+            time.sleep(0.01)
+        else:
+            release.wait(timeout=5)
+        with lock:
+            running -= 1
+        return real_sankey(db, **kwargs)
+
+    monkeypatch.setattr(budget_router, "build_sankey_db", held_sankey)
+    before = sankey_lane()
+
+    with ThreadPoolExecutor(max_workers=limit + 2) as pool:
+        futures = [pool.submit(client.get, "/api/budget/sankey") for _ in range(limit + 2)]
+        if not ASYNC_READS:
+            # Wait until the lane is full and the rest queue, then check that a
+            # light endpoint is still served while the sankey calls are held
+            deadline = time.monotonic() + 5
+            while (sankey_lane().running, sankey_lane().waiting) != (limit, 2):
+                assert time.monotonic() < deadline, sankey_lane()
+                time.sleep(0.005)
+            assert client.get("/api/accounts").status_code == 200
+            lane = sankey_lane()
+            assert (lane.running, lane.waiting) == (limit, 2)
+            assert lane.completed == before.completed
+            release.set()
+        assert all(f.result().status_code == 200 for f in futures)
+
+    assert peak == (1 if ASYNC_READS else limit)
+    stats = executor_stats()
+    sankey = sankey_lane()
+    assert sankey.limit == limit
+    assert sankey.completed - before.completed == limit + 2
+    assert sankey.max_waiting >= 2
+    assert sankey.running == sankey.waiting == 0
+    assert stats.busy == 0
+    # The endpoint reports the same counters
+    reported = {
+        lane["name"]: lane for lane in client.get("/api/system/executor").json()["lanes"]
+    }["sankey"]
+    assert reported["completed"] == sankey.completed
+
+
+@pytest.mark.order(62)
+def test_cancelled_caller_keeps_its_lane_slot(client):
+    """A caller cancelled while its call runs (client disconnect) leaves the
+    call in the lane until the thread is done: the limit still holds."""
+    import asyncio
+
+    from src.executor import executor_stats, run_blocking
+
+    def lane():
+        return {l.name: l for l in executor_stats().lanes}["import_csv"]
+
+    before = lane()
+    assert before.limit == 1
+    release = threading.Event()
+    order = []
+
+    def call(name):
+        order.append(f"{name} start")
+        if name == "first":
+            release.wait(timeout=5)
+        order.append(f"{name} end")
+        return name
+
+    async def scenario():
+        first = asyncio.create_task(run_blocking("import_csv", call, "first"))
+        while not order:
+            await asyncio.sleep(0.001)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # The thread still runs: the slot stays taken and the next call waits
+        second = asyncio.create_task(run_blocking("import_csv", call, "second"))
+        await asyncio.sleep(0.01)
+        state = lane()
+        assert (state.running, state.waiting) == (1, 1)
+        assert state.completed == before.completed
+        release.set()
+        assert await second == "second"
+
+    asyncio.run(scenario())
+    assert order == ["first start", "first end", "second start", "second end"]
+    state = lane()
+    assert (state.running, state.waiting) == (0, 0)
+    assert state.completed == before.completed + 2
+
+
+@pytest.mark.order(63)
+def test_async_read_engine(client):
+    """The aiosqlite engine reads the app database and cannot write to it."""
+    pytest.importorskip("aiosqlite")
+    import asyncio
+
+    from sqlalchemy import func, select, text
+    from sqlalchemy.exc import OperationalError
+
+    import src.database as dbmod
+    from src.models import Category
+
+    async def probe():
+        engine = dbmod.create_async_sqlite_engine(dbmod.SQLALCHEMY_DATABASE_URL)
+        try:
+            async with engine.connect() as conn:
+                count = await conn.scalar(select(func.count()).select_from(Category))
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("CREATE TABLE nope (x INTEGER)"))
+            return count
+        finally:
+            await engine.dispose()
+
+    count = asyncio.run(probe())
+    assert count == len(client.get("/api/categories").json())
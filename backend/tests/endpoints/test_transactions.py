@@ -1,11 +1,26 @@
 import json
 import pytest
 from pathlib import Path
+from decimal import Decimal
 
 with open(Path(__file__).parent / "../mock_data/transactions.json") as f:
     TRANSACTIONS = json.load(f)
 
 
+@pytest.fixture
+def count_cache(monkeypatch):
+    """An empty list-total cache of the default size for this test, whatever
+    earlier tests and TRANSACTION_COUNT_CACHE_SIZE left behind."""
+    from collections import OrderedDict
+
+    import src.services.transactions as tx_service
+
+    cache = OrderedDict()
+    monkeypatch.setattr(tx_service, "_count_cache", cache)
+    monkeypatch.setattr(tx_service, "TRANSACTION_COUNT_CACHE_SIZE", 256)
+    return cache
+
+
 @pytest.mark.order(10)
 @pytest.mark.parametrize(
     "payload", [pytest.param(p, id=p["text"]) for p in TRANSACTIONS]
@@ -119,3 +134,233 @@ def test_get_transaction_summary(client, query, expected_length):
 
     assert response.status_code == 200, response.text
     assert len(response_data) == expected_length
+
+
+@pytest.mark.order(80)
+@pytest.mark.parametrize("sort_by", ["date_desc", "date_asc", "amount_desc", "amount_asc"])
+def test_cursor_pagination(client, sort_by):
+    """Walking next_cursor pages yields the same rows as one offset page."""
+    everything = client.get(
+        "/api/transactions/", params={"sort_by": sort_by, "limit": 500}
+    ).json()
+    assert everything["total"] > 3
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort_by": sort_by, "limit": 3, "with_total": False}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/transactions/", params=params).json()
+        assert page["total"] is None
+        seen += [tx["id"] for tx in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [tx["id"] for tx in everything["items"]]
+
+
+@pytest.mark.order(80)
+def test_cursor_pagination_errors(client):
+    cursor = client.get(
+        "/api/transactions/", params={"sort_by": "date_desc", "limit": 1}
+    ).json()["next_cursor"]
+    assert cursor
+
+    for params in (
+        {"cursor": "not-a-cursor"},
+        {"cursor": cursor, "sort_by": "amount_asc"},
+        {"cursor": cursor, "offset": 5},
+    ):
+        response = client.get("/api/transactions/", params=params)
+        assert response.status_code == 400, params
+
+
+@pytest.mark.order(81)
+def test_list_total_is_cached_until_data_changes(client, count_cache, monkeypatch):
+    """Paging with the same filters counts once; any write invalidates the count."""
+    from sqlalchemy import event
+
+    import src.database as dbmod
+    import src.services.transactions as tx_service
+    from src.settings import ASYNC_READS
+
+    engine = dbmod.async_read_engine.sync_engine if ASYNC_READS else dbmod.read_engine
+    counts = []
+
+    def record(conn, cursor, statement, params, context, executemany):
+        if "count(" in statement.lower():
+            counts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        params = {"limit": 2, "q": "miete"}
+        first = client.get("/api/transactions/", params=params).json()
+        second = client.get(
+            "/api/transactions/", params={**params, "q": "MIETE", "offset": 2}
+        ).json()
+        assert second["total"] == first["total"]
+        assert len(counts) == 1
+
+        account_id = client.get("/api/accounts").json()[0]["public_id"]
+        created = client.post("/api/transactions/", json={
+            "account_id": account_id, "amount": "-1.00", "date": "2024-05-05",
+            "entity": "Count cache", "text": "Miete Garage", "reference": None,
+        })
+        assert created.status_code == 201, created.text
+
+        third = client.get("/api/transactions/", params=params).json()
+        assert third["total"] == first["total"] + 1
+        assert len(counts) == 2
+
+        # Beyond the cache size the least recently used total goes: "miete"
+        # was used after "garage", so "kino" evicts "garage"
+        monkeypatch.setattr(tx_service, "TRANSACTION_COUNT_CACHE_SIZE", 2)
+        for q in ("garage", "miete", "kino", "miete", "garage"):
+            client.get("/api/transactions/", params={**params, "q": q})
+        assert len(counts) == 5 and len(count_cache) == 2
+
+        # Size 0 counts on every request
+        monkeypatch.setattr(tx_service, "TRANSACTION_COUNT_CACHE_SIZE", 0)
+        client.get("/api/transactions/", params=params)
+        client.get("/api/transactions/", params=params)
+        assert len(counts) == 7
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.order(82)
+def test_word_search(client):
+    """`search` matches word beginnings through the FTS index, ranks, and follows edits."""
+    account_id = client.get("/api/accounts").json()[0]["public_id"]
+    for text, reference in (
+        ("Kartenzahlung REWE Markt Köln", None),
+        ("REWE Lieferservice", "Abo REWE REWE"),
+        ("Lastschrift Stadtwerke", "Rewe-Karte"),
+    ):
+        response = client.post("/api/transactions/", json={
+            "account_id": account_id, "amount": "-12.34", "date": "2024-06-01",
+            "entity": "Suche", "text": text, "reference": reference,
+        })
+        assert response.status_code == 201, response.text
+
+    def search(**params):
+        response = client.get("/api/transactions/", params={"limit": 50, **params})
+        assert response.status_code == 200, response.text
+        return [tx["text"] for tx in response.json()["items"]]
+
+    assert sorted(search(search="rewe")) == [
+        "Kartenzahlung REWE Markt Köln", "Lastschrift Stadtwerke", "REWE Lieferservice",
+    ]
+    assert search(search="rew kart") == ["Lastschrift Stadtwerke", "Kartenzahlung REWE Markt Köln"]
+    assert search(search="koln") == ["Kartenzahlung REWE Markt Köln"]
+    assert search(search='"markt" OR') == []  # operators are plain words
+    assert search(search="rewe", sort_by="relevance")[0] == "REWE Lieferservice"
+
+    tx_id = client.get("/api/transactions/", params={"search": "lieferservice"}).json()["items"][0]["id"]
+    assert client.put(f"/api/transactions/{tx_id}", json={"text": "Bringdienst"}).status_code == 200
+    assert search(search="lieferservice") == []
+    assert search(search="bringdienst") == ["Bringdienst"]
+
+    summary = client.get("/api/transactions/summary", params={"search": "stadtwerke"}).json()
+    assert sum(group["count"] for group in summary) == 1
+
+    assert client.get("/api/transactions/", params={"sort_by": "relevance"}).status_code == 400
+    page = client.get(
+        "/api/transactions/", params={"search": "rewe", "sort_by": "relevance", "limit": 1}
+    ).json()
+    assert page["total"] == 3 and page["next_cursor"] is None
+    assert client.get("/api/transactions/", params={
+        "search": "rewe", "sort_by": "relevance", "cursor": "x",
+    }).status_code == 400
+
+
+@pytest.mark.order(83)
+@pytest.mark.usefixtures("count_cache")
+def test_substring_search_is_normalized(client):
+    """`q` ignores case (also beyond ASCII) and runs of whitespace, on the
+    values written by create and update."""
+    account_id = client.get("/api/accounts").json()[0]["public_id"]
+    created = client.post("/api/transactions/", json={
+        "account_id": account_id, "amount": "-5.00", "date": "2024-06-02",
+        "entity": "GROSSMARKT", "text": "Hauptstraße   12\nBÄCKEREI", "reference": None,
+    })
+    assert created.status_code == 201, created.text
+    tx_id = created.json()["id"]
+
+    def ids(q):
+        page = client.get("/api/transactions/", params={"q": q, "limit": 500}).json()
+        return [tx["id"] for tx in page["items"]]
+
+    for q in ("STRASSE 12", "hauptstrasse", "straße 12 bäckerei", "  Bäckerei ", "großmarkt"):
+        assert tx_id in ids(q), q
+    assert tx_id not in ids("strasse  13")
+
+    assert client.put(f"/api/transactions/{tx_id}", json={"text": "Nebenweg  1"}).status_code == 200
+    assert tx_id in ids("NEBENWEG 1")
+    assert tx_id not in ids("hauptstrasse")
+
+
+@pytest.mark.order(84)
+@pytest.mark.usefixtures("count_cache")
+def test_substring_search_with_trigram_index(client, monkeypatch):
+    """With the trigram index, `q` returns exactly what the LIKE scan returns."""
+    from sqlalchemy import text
+
+    import src.database as dbmod
+    import src.services.search as search
+    from src.settings import SEARCH_TRIGRAM
+
+    scan = text(
+        "SELECT id FROM transactions WHERE entity_norm LIKE :p "
+        "OR text_norm LIKE :p OR reference_norm LIKE :p ORDER BY date DESC, id DESC"
+    )
+    monkeypatch.setattr(search, "SEARCH_TRIGRAM", True)
+    with dbmod.engine.begin() as conn:
+        search.ensure_search_index(conn, trigram_index=True)
+    try:
+        with dbmod.ReadSessionLocal() as db:
+            for q in (
+                "ewe", "REWE MARKT", "köln", "KÖLN", "e-k", "re", "%", "a_c", 'x"y', "dienst",
+                "STRASSE", "weg  1",
+            ):
+                expected = db.scalars(
+                    scan, {"p": f"%{search.normalize_search_text(q)}%"}
+                ).all()
+                page = client.get("/api/transactions/", params={"q": q, "limit": 500}).json()
+                assert [tx["id"] for tx in page["items"]] == expected, q
+                assert page["total"] == len(expected), q
+            assert search.substring_candidate_ids(db, "rewe") is not None
+            assert search.substring_candidate_ids(db, "re") is None
+            monkeypatch.setattr(search, "TRIGRAM_MAX_CANDIDATES", 1)
+            assert search.substring_candidate_ids(db, "rewe") is None
+    finally:
+        if not SEARCH_TRIGRAM:
+            with dbmod.engine.begin() as conn:
+                search.ensure_search_index(conn, trigram_index=False)
+
+
+@pytest.mark.order(85)
+@pytest.mark.usefixtures("count_cache")
+@pytest.mark.parametrize(
+    "query",
+    ["depth=1", "depth=3", "scope_name=Ausgaben&depth=1", "scope_name=Ausgaben&depth=2"],
+)
+def test_summary_items_are_paged_per_group(client, query):
+    groups = client.get(f"/api/transactions/summary?{query}").json()
+    assert groups and all(group["transactions"] == [] for group in groups)
+
+    full = client.get(f"/api/transactions/summary?{query}&items=500").json()
+    assert [(g["key"], g["count"]) for g in full] == [(g["key"], g["count"]) for g in groups]
+    for group in full:
+        txs = group["transactions"]
+        assert len(txs) == group["count"]
+        assert sum(Decimal(tx["amount"]) for tx in txs) == Decimal(group["amount_sum"])
+        assert [(tx["date"], tx["id"]) for tx in txs] == sorted(
+            ((tx["date"], tx["id"]) for tx in txs), reverse=True
+        )
+    if "scope_name" not in query:
+        assert sum(g["count"] for g in full) == client.get("/api/transactions/").json()["total"]
+
+    second = client.get(f"/api/transactions/summary?{query}&items=1&items_offset=1").json()
+    expected = {g["key"]: [tx["id"] for tx in g["transactions"][1:2]] for g in full}
+    assert {g["key"]: [tx["id"] for tx in g["transactions"]] for g in second} == expected
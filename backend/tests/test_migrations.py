@@ -0,0 +1,155 @@
+"""
+Alembic revisions — upgrade existing databases to head.
+"""
+
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+BACKEND = Path(__file__).parent.parent
+
+
+def _alembic_config(db_path):
+    from alembic.config import Config
+
+    # Without an ini file, so env.py leaves the test run's logging alone
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    return config
+
+
+def _search_tables(engine):
+    with engine.connect() as conn:
+        return {
+            name: [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({name})")]
+            for (name,) in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE name IN "
+                "('transactions_fts', 'transactions_trigram')"
+            )
+        }
+
+
+def _head_database(engine):
+    """Schema as initialize_database creates it, without seeded rows."""
+    from src.models import Base
+    from src.services.category_closure import ensure_category_closure
+    from src.services.search import ensure_search_index
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        ensure_search_index(conn, trigram_index=False)
+        ensure_category_closure(conn)
+
+
+@pytest.mark.order(1)
+def test_upgrade_from_baseline_with_search_trigram(client, tmp_path, monkeypatch):
+    """Upgrading to head does not depend on SEARCH_TRIGRAM: the FTS revision
+    builds only the word index, and the search-columns revision backfills the
+    columns before it moves an existing trigram index onto them."""
+    from alembic import command
+
+    # (`client` only makes sure src.settings is loaded with the test DB_PATH)
+    import src.services.search as search
+
+    monkeypatch.setenv("SEARCH_TRIGRAM", "1")
+    monkeypatch.setattr(search, "SEARCH_TRIGRAM", True)
+
+    db_path = tmp_path / "migrate.db"
+    config = _alembic_config(db_path)
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    try:
+        # A head database taken back to the baseline, with one transaction
+        _head_database(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO transactions (account_id, date, amount, entity, text, "
+                "entity_norm, fingerprint) VALUES ('acc', '2025-01-10', '-12.50', "
+                "'REWE  Markt', 'Einkauf Straße', '', 'fp')"
+            )
+        command.stamp(config, "head")
+        command.downgrade(config, "4112f706bcdb")
+        assert _search_tables(engine) == {}
+
+        command.upgrade(config, "a6c2e8f04b17")
+        assert _search_tables(engine) == {"transactions_fts": ["entity", "text", "reference"]}
+
+        # A trigram index over the original columns, as SEARCH_TRIGRAM=1
+        # created it at startup before the search columns existed
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE transactions_trigram USING fts5(entity, text, "
+                "reference, content='transactions', content_rowid='id', tokenize='trigram')"
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO transactions_trigram(transactions_trigram) VALUES ('rebuild')"
+            )
+
+        command.upgrade(config, "head")
+        assert _search_tables(engine) == {
+            "transactions_fts": ["entity", "text", "reference"],
+            "transactions_trigram": ["entity_norm", "text_norm", "reference_norm"],
+        }
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql(
+                "SELECT entity_norm, text_norm FROM transactions"
+            ).one() == ("rewe markt", "einkauf strasse")
+            assert conn.exec_driver_sql(
+                "SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH 'rewe*'"
+            ).all() == [(1,)]
+            assert conn.exec_driver_sql(
+                "SELECT rowid FROM transactions_trigram "
+                "WHERE transactions_trigram MATCH '\"we mar\"'"
+            ).all() == [(1,)]
+
+        # The revisions' triggers keep both indexes in sync with new rows
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO transactions (account_id, date, amount, entity, entity_norm, "
+                "fingerprint) VALUES ('acc', '2025-01-11', '-3.00', 'Bäckerei', 'bäckerei', 'fp2')"
+            )
+            assert conn.exec_driver_sql(
+                "SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH 'backerei'"
+            ).all() == [(2,)]
+            assert conn.exec_driver_sql(
+                "SELECT rowid FROM transactions_trigram "
+                "WHERE transactions_trigram MATCH '\"äcker\"'"
+            ).all() == [(2,)]
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.order(1)
+def test_category_closure_revision(client, tmp_path):
+    """The closure revision fills the table from parent_id and its triggers
+    keep it in sync."""
+    from alembic import command
+
+    db_path = tmp_path / "migrate.db"
+    config = _alembic_config(db_path)
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    try:
+        _head_database(engine)
+        command.stamp(config, "head")
+        command.downgrade(config, "d5f1a9c7e362")
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO categories (id, name, parent_id) VALUES "
+                "(1, 'Ausgaben', NULL), (2, 'Wohnen', 1), (3, 'Miete', 2)"
+            )
+
+        command.upgrade(config, "head")
+        pairs = "SELECT ancestor_id, descendant_id, depth FROM category_closure ORDER BY 1, 2"
+        with engine.begin() as conn:
+            assert conn.exec_driver_sql(pairs).all() == [
+                (1, 1, 0), (1, 2, 1), (1, 3, 2), (2, 2, 0), (2, 3, 1), (3, 3, 0),
+            ]
+            conn.exec_driver_sql("INSERT INTO categories (id, name, parent_id) VALUES (4, 'Strom', 2)")
+            conn.exec_driver_sql("UPDATE categories SET parent_id = 1 WHERE id = 3")
+            assert conn.exec_driver_sql(pairs).all() == [
+                (1, 1, 0), (1, 2, 1), (1, 3, 1), (1, 4, 2),
+                (2, 2, 0), (2, 4, 1), (3, 3, 0), (4, 4, 0),
+            ]
+    finally:
+        engine.dispose()